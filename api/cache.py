@@ -0,0 +1,109 @@
+"""
+In-process result cache for the Dog Breeds API read endpoints
+Query results are kept per (endpoint, parameters) for up to CACHE_TTL
+seconds, least recently used first out beyond CACHE_MAX_ENTRIES, and
+dropped as soon as Postgres sends NOTIFY breed_data_changed (see
+database/schema.sql). Data only changes when a DAG run loads, so nearly all
+dashboard polling is answered from memory.
+"""
+
+import logging
+import os
+import time
+from collections import OrderedDict
+
+from listener import listener
+
+logger = logging.getLogger(__name__)
+
+# Channel the schema's notify_breed_data_changed() triggers send on
+CHANGES_CHANNEL = 'breed_data_changed'
+
+# 0 disables the cache
+CACHE_TTL = float(os.getenv('DOG_BREEDS_API_CACHE_TTL', '300'))
+CACHE_MAX_ENTRIES = int(os.getenv('DOG_BREEDS_API_CACHE_MAX_ENTRIES', '1024'))
+
+
+class ResultCache:
+    """TTL + LRU cache of query results, invalidated by database notifications
+
+    Entries are only served while the shared LISTEN connection is up; without
+    it a change could go unnoticed, so every lookup misses until it reconnects.
+    """
+
+    def __init__(self, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        # Bumped on every invalidation; results of queries that started
+        # before it are not stored
+        self.generation = 0
+        self.listening = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.ttl > 0 and self.listening
+
+    def get(self, key):
+        """Cached value for `key`, or None"""
+        if not self.enabled:
+            return None
+        entry = self.entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key, value, generation):
+        """Store `value` unless the data changed since `generation` was read"""
+        if not self.enabled or generation != self.generation:
+            return
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self):
+        """Drop every entry"""
+        self.generation += 1
+        self.invalidations += 1
+        self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'listening': self.listening,
+            'size': len(self.entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+    async def on_change(self, payload):
+        """breed_data_changed handler: `payload` (a table) changed"""
+        logger.debug(f"{payload} changed, invalidating result cache")
+        self.invalidate()
+
+    async def on_listening(self, listening):
+        """Listener connection handler; changes made while it was down were missed"""
+        self.listening = listening
+        self.invalidate()
+
+
+cache = ResultCache()
+listener.on_notify(CHANGES_CHANNEL, cache.on_change)
+listener.on_connection(cache.on_listening)
@@ -0,0 +1,79 @@
+"""
+Arrow IPC and Parquet encoding of dog_breeds rows for /api/breeds/export
+Rows from the export cursor become one typed Arrow record batch per fetch;
+the writer's output is drained after every batch so a response chunk never
+holds more than one batch. The schema is shared with the export DAG and CLI
+(dags/dog_breeds/columnar_schema.py), so both write the same files.
+"""
+
+import sys
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+try:
+    # Copied next to the API modules in the image (see api/Dockerfile)
+    from columnar_schema import ARROW_SCHEMA, COLUMNAR_SELECT, record_batch
+except ModuleNotFoundError:
+    # Running from a checkout: use the DAG package's module directly
+    sys.path.append(str(Path(__file__).resolve().parent.parent / "dags" / "dog_breeds"))
+    from columnar_schema import ARROW_SCHEMA, COLUMNAR_SELECT, record_batch
+
+# Select list of the export query for the Arrow and Parquet formats
+COLUMNAR_SELECT_SQL = ', '.join(COLUMNAR_SELECT)
+
+MEDIA_TYPES = {
+    'arrow': 'application/vnd.apache.arrow.stream',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+class DrainableSink:
+    """Write-only file object whose written bytes are taken out by drain()"""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class ColumnarEncoder:
+    """Encodes batches of rows as one Arrow IPC stream or Parquet file ('arrow' or 'parquet')"""
+
+    def __init__(self, export_format):
+        self.sink = DrainableSink()
+        if export_format == 'parquet':
+            self.writer = pq.ParquetWriter(self.sink, ARROW_SCHEMA, compression='zstd')
+        else:
+            self.writer = pa.ipc.new_stream(self.sink, ARROW_SCHEMA)
+
+    def encode(self, rows):
+        """Bytes of the next batch (the stream header or file magic comes with the first)"""
+        self.writer.write_batch(record_batch(rows))
+        return self.sink.drain()
+
+    def close(self):
+        """Bytes ending the stream (end-of-stream marker or Parquet footer)"""
+        self.writer.close()
+        return self.sink.drain()
@@ -0,0 +1,91 @@
+"""
+Async PostgreSQL access for the Dog Breeds API
+One connection pool per API process, opened at startup and closed on
+shutdown, so requests reuse warm connections instead of paying a connect
+handshake each, and queries run without blocking the event loop
+"""
+
+import logging
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# Database configuration
+DB_CONFIG = {
+    'host': os.getenv('DOG_BREEDS_DB_HOST', 'dog-breeds-db.dog-breeds.svc.cluster.local'),
+    'port': os.getenv('DOG_BREEDS_DB_PORT', '5432'),
+    'database': os.getenv('DOG_BREEDS_DB_NAME', 'dog_breeds_db'),
+    'user': os.getenv('DOG_BREEDS_DB_USER', 'airflow'),
+    'password': os.getenv('DOG_BREEDS_DB_PASSWORD', 'airflow'),
+}
+
+# Pool sizing (per API process)
+POOL_MIN_SIZE = int(os.getenv('DOG_BREEDS_DB_POOL_MIN_SIZE', '2'))
+POOL_MAX_SIZE = int(os.getenv('DOG_BREEDS_DB_POOL_MAX_SIZE', '10'))
+# Seconds a request waits for a free connection before failing with a 503
+POOL_TIMEOUT = float(os.getenv('DOG_BREEDS_DB_POOL_TIMEOUT', '10'))
+# Seconds an idle connection above min size is kept before it is closed
+POOL_MAX_IDLE = float(os.getenv('DOG_BREEDS_DB_POOL_MAX_IDLE', '300'))
+
+pool = None
+
+
+def conninfo():
+    """libpq connection string for DB_CONFIG"""
+    return make_conninfo(
+        host=DB_CONFIG['host'],
+        port=DB_CONFIG['port'],
+        dbname=DB_CONFIG['database'],
+        user=DB_CONFIG['user'],
+        password=DB_CONFIG['password'],
+        application_name='dog-breeds-api',
+    )
+
+
+async def open_pool():
+    """Create and open the connection pool (app startup)"""
+    global pool
+    pool = AsyncConnectionPool(
+        conninfo(),
+        min_size=POOL_MIN_SIZE,
+        max_size=POOL_MAX_SIZE,
+        timeout=POOL_TIMEOUT,
+        max_idle=POOL_MAX_IDLE,
+        # Read-only queries: autocommit keeps pooled connections out of open transactions
+        kwargs={'autocommit': True, 'row_factory': dict_row},
+        name='dog-breeds-api',
+        open=False,
+    )
+    # Don't wait for min_size connections: the API starts (and reports
+    # unhealthy) even while the database is down
+    await pool.open(wait=False)
+    logger.info(
+        f"Database pool for {DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']} "
+        f"(min {POOL_MIN_SIZE}, max {POOL_MAX_SIZE})"
+    )
+
+
+async def close_pool():
+    """Close the connection pool (app shutdown)"""
+    if pool is not None:
+        await pool.close()
+
+
+@asynccontextmanager
+async def get_db_connection():
+    """Borrow a pooled connection; 503 if none is available within POOL_TIMEOUT"""
+    try:
+        conn = await pool.getconn()
+    except Exception as e:
+        logger.error(f"Failed to get a database connection: {e}")
+        raise HTTPException(status_code=503, detail="Database connection failed")
+    try:
+        yield conn
+    finally:
+        await pool.putconn(conn)
@@ -0,0 +1,61 @@
+"""
+Conditional GET support for the Dog Breeds API read endpoints
+ETags are derived from breed_data_version, a counter the database bumps on
+every write to the data the API serves (see database/schema.sql). The
+current version is kept in memory and dropped on NOTIFY breed_data_changed,
+so answering an unchanged poll with a 304 costs no query at all.
+"""
+
+from cache import CHANGES_CHANNEL
+from db import get_db_connection
+from listener import listener
+
+VERSION_SQL = "SELECT version FROM breed_data_version"
+
+
+class DataVersion:
+    """In-memory copy of breed_data_version, trusted only while the listener is up"""
+
+    def __init__(self):
+        self.version = None
+        # Bumped on every change; a version read before it is not kept
+        self.generation = 0
+        self.listening = False
+
+    async def get(self):
+        """Current data version, read from the database when not known"""
+        if self.listening and self.version is not None:
+            return self.version
+        generation = self.generation
+        async with get_db_connection() as conn:
+            cursor = conn.cursor()
+            await cursor.execute(VERSION_SQL)
+            row = await cursor.fetchone()
+        version = row['version'] if row else 0
+        if self.listening and generation == self.generation:
+            self.version = version
+        return version
+
+    async def on_change(self, payload):
+        """breed_data_changed handler"""
+        self.generation += 1
+        self.version = None
+
+    async def on_listening(self, listening):
+        """Listener connection handler; changes made while it was down were missed"""
+        self.listening = listening
+        self.generation += 1
+        self.version = None
+
+
+def etag_matches(if_none_match, etag):
+    """Whether an If-None-Match header value matches `etag` (weak comparison, RFC 9110)"""
+    if if_none_match.strip() == '*':
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(','))
+    return any(candidate.removeprefix('W/') == etag for candidate in candidates)
+
+
+data_version = DataVersion()
+listener.on_notify(CHANGES_CHANNEL, data_version.on_change)
+listener.on_connection(data_version.on_listening)
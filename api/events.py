@@ -0,0 +1,125 @@
+"""
+Fan-out of new breed records to Server-Sent Events subscribers
+The shared database listener hands each committed load to the broadcaster
+once per API process; every open /api/breeds/stream connection gets its own
+bounded queue, so one slow client never holds up the others. Loads are
+fetched and published by the broadcaster's own task, so the listener's
+dispatch (and the cache invalidation behind it) never waits on that query.
+"""
+
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Channel the schema's notify_breed_observations_added() trigger sends on,
+# with the ids of the ingest runs that were loaded
+RECORDS_CHANNEL = 'breed_observations_added'
+
+# Events buffered per subscriber before it is disconnected (EventSource
+# reconnects and the dashboard reloads the list)
+SUBSCRIBER_QUEUE_SIZE = int(os.getenv('DOG_BREEDS_API_STREAM_QUEUE_SIZE', '1000'))
+# Loads waiting to be fetched and published; when the publishing task falls
+# this far behind, the streams are ended and clients reload instead
+PENDING_LOADS = int(os.getenv('DOG_BREEDS_API_STREAM_PENDING_LOADS', '100'))
+# Seconds between keep-alive comments on idle streams, below proxy read timeouts
+KEEPALIVE_SECONDS = float(os.getenv('DOG_BREEDS_API_STREAM_KEEPALIVE', '15'))
+
+
+class Subscriber:
+    """One stream connection: its queue and optional dag_id filter"""
+
+    def __init__(self, dag_id=None):
+        self.dag_id = dag_id
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.closed = False
+
+    def close(self):
+        """Drop whatever is buffered and end the stream"""
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class BreedBroadcaster:
+    """Publishes new breed records (JSON-ready dicts) to every subscriber"""
+
+    def __init__(self):
+        self.subscribers = set()
+        self.published = 0
+        self.dropped_subscribers = 0
+        # Ingest run ids of committed loads, in commit order
+        self.pending = asyncio.Queue(maxsize=PENDING_LOADS)
+        self._task = None
+
+    def subscribe(self, dag_id=None):
+        subscriber = Subscriber(dag_id)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self.subscribers.discard(subscriber)
+
+    def publish(self, breeds):
+        """Queue `breeds` for the subscribers whose dag_id filter they match"""
+        for subscriber in list(self.subscribers):
+            for breed in breeds:
+                if subscriber.dag_id and breed['dag_id'] != subscriber.dag_id:
+                    continue
+                try:
+                    subscriber.queue.put_nowait(breed)
+                except asyncio.QueueFull:
+                    logger.warning("Stream subscriber is not keeping up, disconnecting it")
+                    self.unsubscribe(subscriber)
+                    self.dropped_subscribers += 1
+                    subscriber.close()
+                    break
+        self.published += len(breeds)
+
+    def close_all(self):
+        """End every stream (app shutdown, or the listener lost its connection)"""
+        # Reconnecting clients reload their list, which covers the pending loads
+        while not self.pending.empty():
+            self.pending.get_nowait()
+        for subscriber in list(self.subscribers):
+            self.unsubscribe(subscriber)
+            subscriber.close()
+
+    def enqueue(self, run_ids):
+        """Queue a committed load for publishing, without waiting"""
+        try:
+            self.pending.put_nowait(run_ids)
+        except asyncio.QueueFull:
+            logger.warning(f"{PENDING_LOADS} loads are waiting to be published, ending the streams")
+            self.close_all()
+
+    async def run(self, fetch):
+        """Publish the pending loads in order; `await fetch(run_ids)` returns their records"""
+        while True:
+            run_ids = await self.pending.get()
+            if not self.subscribers:
+                continue
+            try:
+                self.publish(await fetch(run_ids))
+            except Exception as e:
+                logger.error(f"Publishing ingest runs {run_ids} failed: {e}", exc_info=True)
+
+    async def start(self, fetch):
+        """Start publishing in the background (app startup)"""
+        self._task = asyncio.create_task(self.run(fetch))
+
+    async def stop(self):
+        """End every stream and stop publishing (app shutdown)"""
+        self.close_all()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+broadcaster = BreedBroadcaster()
@@ -0,0 +1,90 @@
+"""
+Background database check behind the API's readiness and health endpoints
+One task per API process runs SELECT 1 on a pooled connection every
+READY_CHECK_INTERVAL seconds and keeps the result, so /readyz and /health
+answer from memory: probes add no queries or connections of their own, and
+a slow database shows up as "not ready" instead of a hanging probe.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+import db
+
+logger = logging.getLogger(__name__)
+
+# Seconds between database checks
+READY_CHECK_INTERVAL = float(os.getenv('DOG_BREEDS_API_READY_CHECK_INTERVAL', '5'))
+# Seconds a check may take (waiting for a pooled connection included)
+READY_CHECK_TIMEOUT = float(os.getenv('DOG_BREEDS_API_READY_CHECK_TIMEOUT', '3'))
+# A successful check older than this no longer counts (the check task is stuck)
+READY_MAX_AGE = READY_CHECK_INTERVAL * 3 + READY_CHECK_TIMEOUT
+
+
+class DatabaseCheck:
+    """Result of the latest background SELECT 1"""
+
+    def __init__(self):
+        self.ok = False
+        self.checked_at = None
+        self.latency_ms = None
+        self.error = None
+        # time.monotonic() of the last successful check
+        self._last_ok = None
+        self._task = None
+
+    async def check(self):
+        """Run one check and record its outcome"""
+        start = time.monotonic()
+        try:
+            async with asyncio.timeout(READY_CHECK_TIMEOUT):
+                async with db.get_db_connection() as conn:
+                    await conn.execute("SELECT 1")
+        except Exception as e:
+            if self.ok or self.checked_at is None:
+                logger.warning(f"Database check failed: {e!r}")
+            self.ok = False
+            self.error = str(e) or type(e).__name__
+        else:
+            if not self.ok:
+                logger.info("Database check passed")
+            self.ok = True
+            self.error = None
+            self._last_ok = time.monotonic()
+        self.latency_ms = round((time.monotonic() - start) * 1000, 1)
+        self.checked_at = datetime.now(timezone.utc)
+
+    @property
+    def ready(self):
+        """Whether the latest check passed and is recent"""
+        return self.ok and self._last_ok is not None and time.monotonic() - self._last_ok <= READY_MAX_AGE
+
+    def pool_stats(self):
+        """Connection pool counters (size, available, waiting requests, ...)"""
+        return db.pool.get_stats() if db.pool is not None else {}
+
+    async def run(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(READY_CHECK_INTERVAL)
+
+    async def start(self):
+        """Start checking in the background (app startup)"""
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Stop checking and report not ready (app shutdown)"""
+        self.ok = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+database_check = DatabaseCheck()
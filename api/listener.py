@@ -0,0 +1,90 @@
+"""
+Shared Postgres LISTEN connection for the Dog Breeds API
+One connection per API process LISTENs on every channel a component
+registered a handler for and dispatches the notifications, so the result
+cache and the breed stream don't each hold a database connection.
+"""
+
+import asyncio
+import logging
+
+import psycopg
+
+from db import conninfo
+
+logger = logging.getLogger(__name__)
+
+# Seconds between attempts to (re)connect
+LISTEN_RETRY_SECONDS = 5
+
+
+class DatabaseListener:
+    """Dispatches NOTIFY payloads to async handlers, reconnecting on errors
+
+    Connection handlers are called with True once LISTEN is in place and with
+    False when the connection is lost: notifications sent in between are
+    missed, so handlers that rely on them must not trust their state.
+    """
+
+    def __init__(self):
+        self.handlers = {}
+        self.connection_handlers = []
+        self.listening = False
+        self._task = None
+
+    def on_notify(self, channel, handler):
+        """Call `await handler(payload)` for every notification on `channel`"""
+        self.handlers.setdefault(channel, []).append(handler)
+
+    def on_connection(self, handler):
+        """Call `await handler(listening)` when the connection goes up or down"""
+        self.connection_handlers.append(handler)
+
+    async def _set_listening(self, listening):
+        self.listening = listening
+        for handler in self.connection_handlers:
+            await handler(listening)
+
+    async def _dispatch(self, notify):
+        for handler in self.handlers.get(notify.channel, []):
+            try:
+                await handler(notify.payload)
+            except Exception as e:
+                logger.error(f"Handler for {notify.channel} failed: {e}", exc_info=True)
+
+    async def run(self):
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(conninfo(), autocommit=True) as conn:
+                    for channel in self.handlers:
+                        await conn.execute(f"LISTEN {channel}")
+                    await self._set_listening(True)
+                    logger.info(f"Listening on {', '.join(self.handlers)}")
+                    async for notify in conn.notifies():
+                        await self._dispatch(notify)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Database listener disconnected: {e}")
+            finally:
+                if self.listening:
+                    await self._set_listening(False)
+            await asyncio.sleep(LISTEN_RETRY_SECONDS)
+
+    async def start(self):
+        """Start listening in the background (app startup)"""
+        if self.handlers:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Stop listening (app shutdown)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+listener = DatabaseListener()
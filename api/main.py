@@ -3,37 +3,133 @@ FastAPI server for Dog Breeds Dashboard
 Provides REST API to query dog breed data from PostgreSQL
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, Header, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import List, Literal, Optional
 import os
+import asyncio
+import base64
+import json
 import logging
 from datetime import datetime
 from pydantic import BaseModel, Field
 
+from cache import cache
+from columnar import COLUMNAR_SELECT_SQL, MEDIA_TYPES as COLUMNAR_MEDIA_TYPES, ColumnarEncoder
+from db import DB_CONFIG, close_pool, get_db_connection, open_pool
+from etags import data_version, etag_matches
+from health import database_check
+from events import KEEPALIVE_SECONDS, RECORDS_CHANNEL, broadcaster
+from listener import listener
+from psycopg.rows import tuple_row
+from serialization import (
+    EXECUTION_DATE,
+    EXTRA_COLUMN,
+    ID,
+    REPRESENTATION_VERSION,
+    breed_dict,
+    breed_response,
+    breeds_response,
+    encode,
+    encode_csv,
+    encode_ndjson,
+)
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Database configuration
-DB_CONFIG = {
-    'host': os.getenv('DOG_BREEDS_DB_HOST', 'dog-breeds-db.dog-breeds.svc.cluster.local'),
-    'port': os.getenv('DOG_BREEDS_DB_PORT', '5432'),
-    'database': os.getenv('DOG_BREEDS_DB_NAME', 'dog_breeds_db'),
-    'user': os.getenv('DOG_BREEDS_DB_USER', 'airflow'),
-    'password': os.getenv('DOG_BREEDS_DB_PASSWORD', 'airflow'),
+# Breeds are stored normalized: one breed_observations row per breed per DAG
+# run, joined to the run's Airflow metadata and the breed's content
+BREED_TABLES = """
+    breed_observations o
+    JOIN ingest_runs r ON r.id = o.ingest_run_id
+    JOIN breeds b ON b.id = o.breed_id
+"""
+# Fetched as tuples in serialization.BREED_FIELDS order; the compatibility
+# aliases (life_span, run_id, start_date, state) are added when encoding
+BREED_COLUMNS = """
+    o.id::text AS id,
+    b.breed_name,
+    b.description,
+    b.life_expectancy,
+    r.dag_id,
+    r.dag_run_id,
+    r.task_id,
+    o.execution_date,
+    r.created_at
+"""
+
+# Ranked search returns each matching breed once, as its latest
+# observation; `matches` is a CTE of (id, rank) rows over breeds
+RANKED_BREED_TABLES = """
+    matches m
+    CROSS JOIN LATERAL (
+        SELECT * FROM breed_observations latest
+        WHERE latest.breed_id = m.id
+        ORDER BY latest.execution_date DESC
+        LIMIT 1
+    ) o
+    JOIN ingest_runs r ON r.id = o.ingest_run_id
+    JOIN breeds b ON b.id = m.id
+"""
+
+# /api/breeds page order. Every key is a breed_observations column, so
+# idx_breed_observations_keyset serves it and keyset pages can seek
+# straight to their cursor; ingest_run_id is the run's insertion order,
+# so it orders like the run's created_at
+BREED_PAGE_ORDER = "o.execution_date DESC, o.ingest_run_id DESC, o.id DESC"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# breed_stats_rollup row with the totals over all DAGs
+STATS_ALL_DAGS = '*'
+
+# How long browsers wait before reconnecting a dropped breed stream
+STREAM_RETRY_MS = 5000
+
+# Bulk export: columns of the dog_breeds view, rows per server-side cursor
+# fetch (and per response chunk), and exports allowed to run at once per
+# process (each holds a pooled connection until it finishes)
+EXPORT_COLUMNS = (
+    "id", "breed_name", "description", "life_expectancy", "life_min", "life_max",
+    "dag_id", "dag_run_id", "task_id", "execution_date", "asset_uri", "api_id",
+    "content_hash", "created_at", "updated_at", "full_data",
+)
+EXPORT_BATCH_SIZE = int(os.getenv('DOG_BREEDS_API_EXPORT_BATCH_SIZE', '2000'))
+EXPORT_MAX_CONCURRENT = int(os.getenv('DOG_BREEDS_API_EXPORT_MAX_CONCURRENT', '2'))
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    **COLUMNAR_MEDIA_TYPES,
 }
+# Arrow IPC streams (as opposed to Arrow files) are .arrows
+EXPORT_EXTENSIONS = {"arrow": "arrows"}
 
 # CORS configuration
 ALLOWED_ORIGINS = os.getenv('ALLOWED_ORIGINS', '*').split(',')
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the database pool and listener at startup and close them on shutdown"""
+    await open_pool()
+    await database_check.start()
+    await broadcaster.start(fetch_new_breeds)
+    await listener.start()
+    yield
+    await database_check.stop()
+    await broadcaster.stop()
+    await listener.stop()
+    await close_pool()
+
 # Create FastAPI app
 app = FastAPI(
     title="Dog Breeds API",
     description="API for querying dog breed data fetched by Airflow",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -43,6 +139,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 # Pydantic models for API responses
@@ -60,6 +157,7 @@ class DogBreed(BaseModel):
     start_date: Optional[datetime] = None  # Alias for compatibility
     created_at: datetime
     state: Optional[str] = "success"  # Default for compatibility
+    rank: Optional[float] = None  # Relevance, set by ranked search modes
 
     class Config:
         from_attributes = True
@@ -74,15 +172,66 @@ class HealthCheck(BaseModel):
     database: str
     timestamp: datetime
 
-# Database connection helper
-def get_db_connection():
-    """Create and return a database connection"""
+class Readiness(BaseModel):
+    status: str
+    database: str
+    checked_at: Optional[datetime] = None
+    check_latency_ms: Optional[float] = None
+    error: Optional[str] = None
+    pool: dict
+
+class CacheStats(BaseModel):
+    enabled: bool
+    listening: bool
+    size: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    invalidations: int
+
+# Keyset pagination cursors: opaque URL-safe tokens holding the sort key
+# (execution_date, ingest_run_id, id) of the last row of a page
+def encode_cursor(execution_date, ingest_run_id, observation_id):
+    """Build the cursor pointing after the row with this sort key"""
+    key = [execution_date.isoformat(), ingest_run_id, observation_id]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Parse a cursor from encode_cursor; raises a 400 if it is malformed"""
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        return conn
-    except Exception as e:
-        logger.error(f"Failed to connect to database: {e}")
-        raise HTTPException(status_code=503, detail="Database connection failed")
+        padded = cursor + '=' * (-len(cursor) % 4)
+        execution_date, ingest_run_id, observation_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(execution_date), int(ingest_run_id), str(observation_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+async def cached_fetch(query, params, one=False, row_factory=None):
+    """Run a read query (fetchall, or fetchone if `one`) through the result cache;
+    rows are dicts unless another psycopg `row_factory` is given"""
+    key = (query, params, one, row_factory)
+    rows = cache.get(key)
+    if rows is None:
+        # Read before querying, so a result that raced a change is not stored
+        generation = cache.generation
+        async with get_db_connection() as conn:
+            cursor = conn.cursor(row_factory=row_factory)
+            await cursor.execute(query, params)
+            rows = await (cursor.fetchone() if one else cursor.fetchall())
+        cache.set(key, rows, generation)
+    return rows
+
+async def check_etag(response, if_none_match):
+    """Set the ETag of the current data version and representation on `response`;
+    returns a 304 response to send instead if the client's If-None-Match already matches it"""
+    etag = f'"{app.version}-r{REPRESENTATION_VERSION}-{await data_version.get()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
 
 # API Routes
 
@@ -94,228 +243,394 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "health": "/health",
+            "liveness": "/livez",
+            "readiness": "/readyz",
             "breeds": "/api/breeds",
             "recent_breeds": "/api/breeds/recent",
             "stats": "/api/breeds/stats",
+            "stream": "/api/breeds/stream",
+            "export": "/api/breeds/export",
+            "cache_stats": "/api/cache/stats",
         }
     }
 
 @app.get("/health", response_model=HealthCheck)
 async def health_check():
-    """Health check endpoint"""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1")
-        cursor.close()
-        conn.close()
-        
-        return HealthCheck(
-            status="healthy",
-            database="connected",
-            timestamp=datetime.utcnow()
-        )
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        return HealthCheck(
-            status="unhealthy",
-            database="disconnected",
-            timestamp=datetime.utcnow()
-        )
+    """Health check endpoint (latest background database check, no query)"""
+    return HealthCheck(
+        status="healthy" if database_check.ready else "unhealthy",
+        database="connected" if database_check.ready else "disconnected",
+        timestamp=datetime.utcnow()
+    )
+
+@app.get("/livez")
+async def liveness():
+    """Liveness probe: the process serves requests; never touches the database"""
+    return {"status": "alive"}
+
+@app.get("/readyz", response_model=Readiness, responses={503: {"model": Readiness}})
+async def readiness():
+    """Readiness probe: 503 until the background database check passes, or once it goes stale"""
+    ready = Readiness(
+        status="ready" if database_check.ready else "not ready",
+        database="connected" if database_check.ready else "disconnected",
+        checked_at=database_check.checked_at,
+        check_latency_ms=database_check.latency_ms,
+        error=database_check.error,
+        pool=database_check.pool_stats(),
+    )
+    if not database_check.ready:
+        return JSONResponse(status_code=503, content=ready.model_dump(mode="json"))
+    return ready
+
+@app.get("/api/cache/stats", response_model=CacheStats)
+async def get_cache_stats():
+    """Result cache hit rate and size (per API process)"""
+    return CacheStats(**cache.stats())
 
 @app.get("/api/breeds", response_model=List[DogBreed])
 async def get_breeds(
+    response: Response,
     limit: int = Query(default=10, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
-    dag_id: Optional[str] = Query(default=None)
+    page_cursor: Optional[str] = Query(
+        default=None,
+        alias="cursor",
+        description="X-Next-Cursor header of the previous page (keyset pagination)",
+    ),
+    dag_id: Optional[str] = Query(default=None),
+    if_none_match: Optional[str] = Header(default=None),
 ):
-    """Get dog breeds with pagination"""
+    """
+    Get dog breeds with pagination
+    Pages by `offset`, or by `cursor` (from the previous page's X-Next-Cursor
+    header), which costs the same however deep the page is
+    """
+    if page_cursor is not None and offset:
+        raise HTTPException(status_code=400, detail="Use either cursor or offset, not both")
+    after = decode_cursor(page_cursor) if page_cursor is not None else None
+    
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        not_modified = await check_etag(response, if_none_match)
+        if not_modified:
+            return not_modified
         
+        conditions = []
+        params = []
+        if after:
+            conditions.append("(o.execution_date, o.ingest_run_id, o.id) < (%s, %s, %s::uuid)")
+            params.extend(after)
         if dag_id:
-            query = """
-                SELECT 
-                    id::text,
-                    breed_name,
-                    description,
-                    life_expectancy,
-                    life_expectancy as life_span,
-                    dag_id,
-                    dag_run_id,
-                    dag_run_id as run_id,
-                    task_id,
-                    execution_date,
-                    execution_date as start_date,
-                    created_at,
-                    'success' as state
-                FROM dog_breeds
-                WHERE dag_id = %s
-                ORDER BY execution_date DESC, created_at DESC
-                LIMIT %s OFFSET %s
-            """
-            cursor.execute(query, (dag_id, limit, offset))
-        else:
-            query = """
-                SELECT 
-                    id::text,
-                    breed_name,
-                    description,
-                    life_expectancy,
-                    life_expectancy as life_span,
-                    dag_id,
-                    dag_run_id,
-                    dag_run_id as run_id,
-                    task_id,
-                    execution_date,
-                    execution_date as start_date,
-                    created_at,
-                    'success' as state
-                FROM dog_breeds
-                ORDER BY execution_date DESC, created_at DESC
-                LIMIT %s OFFSET %s
-            """
-            cursor.execute(query, (limit, offset))
+            conditions.append("r.dag_id = %s")
+            params.append(dag_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
         
-        breeds = cursor.fetchall()
+        query = f"""
+            SELECT {BREED_COLUMNS}, o.ingest_run_id
+            FROM {BREED_TABLES}
+            {where}
+            ORDER BY {BREED_PAGE_ORDER}
+            LIMIT %s OFFSET %s
+        """
+        breeds = await cached_fetch(query, (*params, limit, offset), row_factory=tuple_row)
         
-        cursor.close()
-        conn.close()
+        # A full page may have more rows after it
+        if len(breeds) == limit:
+            last = breeds[-1]
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last[EXECUTION_DATE], last[EXTRA_COLUMN], last[ID])
         
         # Return empty list if no breeds found (not an error)
-        if not breeds:
-            return []
-        
-        return [DogBreed(**breed) for breed in breeds]
+        return breeds_response(breeds, response)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching breeds: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch breeds: {str(e)}")
 
 @app.get("/api/breeds/recent", response_model=List[DogBreed])
 async def get_recent_breeds(
+    response: Response,
     limit: int = Query(default=20, ge=1, le=100),
-    dag_id: str = Query(default="dog_breed_fetcher")
+    dag_id: str = Query(default="dog_breed_fetcher"),
+    if_none_match: Optional[str] = Header(default=None),
 ):
     """Get recent dog breeds (compatible with old API)"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        not_modified = await check_etag(response, if_none_match)
+        if not_modified:
+            return not_modified
         
-        query = """
-            SELECT 
-                id::text,
-                breed_name,
-                description,
-                life_expectancy,
-                life_expectancy as life_span,
-                dag_id,
-                dag_run_id,
-                dag_run_id as run_id,
-                task_id,
-                execution_date,
-                execution_date as start_date,
-                created_at,
-                'success' as state
-            FROM dog_breeds
-            WHERE dag_id = %s
-            ORDER BY execution_date DESC, created_at DESC
+        query = f"""
+            SELECT {BREED_COLUMNS}
+            FROM {BREED_TABLES}
+            WHERE r.dag_id = %s
+            ORDER BY o.execution_date DESC, r.created_at DESC
             LIMIT %s
         """
         
-        cursor.execute(query, (dag_id, limit))
-        breeds = cursor.fetchall()
-        
-        cursor.close()
-        conn.close()
+        breeds = await cached_fetch(query, (dag_id, limit), row_factory=tuple_row)
         
         # Return empty list if no breeds found (not an error)
         if not breeds:
             logger.info(f"No breeds found for dag_id: {dag_id}")
-            return []
         
-        return [DogBreed(**breed) for breed in breeds]
+        return breeds_response(breeds, response)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching recent breeds: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch recent breeds: {str(e)}")
 
 @app.get("/api/breeds/stats", response_model=BreedStats)
 async def get_breed_stats(
-    dag_id: Optional[str] = Query(default=None)
+    response: Response,
+    dag_id: Optional[str] = Query(default=None),
+    if_none_match: Optional[str] = Header(default=None),
 ):
     """Get statistics about dog breeds"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        not_modified = await check_etag(response, if_none_match)
+        if not_modified:
+            return not_modified
         
-        if dag_id:
-            query = """
-                SELECT 
-                    COUNT(*) as total_breeds,
-                    COUNT(DISTINCT breed_name) as unique_breeds,
-                    MAX(execution_date) as latest_execution
-                FROM dog_breeds
-                WHERE dag_id = %s
-            """
-            cursor.execute(query, (dag_id,))
-        else:
-            query = """
-                SELECT 
-                    COUNT(*) as total_breeds,
-                    COUNT(DISTINCT breed_name) as unique_breeds,
-                    MAX(execution_date) as latest_execution
-                FROM dog_breeds
-            """
-            cursor.execute(query)
-        stats = cursor.fetchone()
+        # Read from the rollup kept current by the breed_observations insert
+        # trigger; dag_id '*' holds the totals over all DAGs
+        query = """
+            SELECT total_breeds, unique_breeds, latest_execution
+            FROM breed_stats_rollup
+            WHERE dag_id = %s
+        """
+        stats = await cached_fetch(query, (dag_id or STATS_ALL_DAGS,), one=True)
         
-        cursor.close()
-        conn.close()
+        # No rollup row means no observations (yet) for this dag_id
+        if not stats:
+            return BreedStats(total_breeds=0, unique_breeds=0)
         
         return BreedStats(**stats)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching stats: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch stats: {str(e)}")
 
+class ExportSlots:
+    """Cap on concurrent exports per process, taken without waiting"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.active = 0
+
+    def try_acquire(self):
+        """Take a slot; False when all are in use"""
+        if self.active >= self.limit:
+            return False
+        self.active += 1
+        return True
+
+    def release(self):
+        self.active -= 1
+
+export_slots = ExportSlots(EXPORT_MAX_CONCURRENT)
+
+async def export_chunks(cursor, export_format):
+    """Encoded export chunks, one per EXPORT_BATCH_SIZE rows of the export's server-side cursor"""
+    columnar = ColumnarEncoder(export_format) if export_format in COLUMNAR_MEDIA_TYPES else None
+    if export_format == "csv":
+        yield encode_csv([], header=EXPORT_COLUMNS)
+    while True:
+        rows = await cursor.fetchmany(EXPORT_BATCH_SIZE)
+        if not rows:
+            break
+        if columnar:
+            yield columnar.encode(rows)
+        elif export_format == "csv":
+            yield encode_csv(rows)
+        else:
+            yield encode_ndjson(EXPORT_COLUMNS, rows)
+    if columnar:
+        yield columnar.close()
+
+@app.get("/api/breeds/export")
+async def export_breeds(
+    export_format: Literal["ndjson", "csv", "arrow", "parquet"] = Query(default="ndjson", alias="format"),
+    dag_id: Optional[str] = Query(default=None),
+    since: Optional[datetime] = Query(default=None, description="Earliest execution_date (inclusive)"),
+    until: Optional[datetime] = Query(default=None, description="Latest execution_date (exclusive)"),
+):
+    """
+    Export all matching dog_breeds rows as NDJSON, CSV, an Arrow IPC stream or Parquet
+    Streamed in chunks from a server-side cursor, oldest first, so any
+    number of rows is exported in constant memory
+    """
+    conditions = []
+    params = []
+    if dag_id:
+        conditions.append("dag_id = %s")
+        params.append(dag_id)
+    if since:
+        conditions.append("execution_date >= %s")
+        params.append(since)
+    if until:
+        conditions.append("execution_date < %s")
+        params.append(until)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    
+    query = f"""
+        SELECT {COLUMNAR_SELECT_SQL if export_format in COLUMNAR_MEDIA_TYPES else ', '.join(EXPORT_COLUMNS)}
+        FROM dog_breeds
+        {where}
+        ORDER BY execution_date
+    """
+    
+    if not export_slots.try_acquire():
+        raise HTTPException(status_code=429, detail="Too many exports in progress, retry later")
+    # The slot, pooled connection and transaction are held until close_export(),
+    # which runs once the response ends, however it ends (client gone included)
+    resources = AsyncExitStack()
+    resources.callback(export_slots.release)
+    chunks = None
+    
+    async def close_export():
+        if chunks is not None:
+            try:
+                await chunks.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing export stream: {e}")
+        try:
+            await resources.aclose()
+        except Exception as e:
+            # The pool discards a connection left mid-query
+            logger.warning(f"Error releasing export connection: {e}")
+    
+    try:
+        conn = await resources.enter_async_context(get_db_connection())
+        # Named cursors live in a transaction, which also gives the whole
+        # export one consistent snapshot; it only reads, so it is rolled back
+        await resources.enter_async_context(conn.transaction(force_rollback=True))
+        cursor = conn.cursor(name="breed_export", row_factory=tuple_row)
+        await cursor.execute(query, tuple(params))
+        chunks = export_chunks(cursor, export_format)
+        # Encode the first batch before answering, so database errors
+        # still get an error status instead of a cut-off 200
+        try:
+            first_chunk = await chunks.__anext__()
+        except StopAsyncIteration:
+            first_chunk = b""
+    except BaseException as e:
+        await close_export()
+        if isinstance(e, Exception) and not isinstance(e, HTTPException):
+            logger.error(f"Error exporting breeds: {e}", exc_info=True)
+            raise HTTPException(status_code=500, detail=f"Failed to export breeds: {str(e)}")
+        raise
+    
+    async def body():
+        yield first_chunk
+        try:
+            async for chunk in chunks:
+                yield chunk
+        except Exception as e:
+            # Too late for an error status; the client sees a truncated export
+            logger.error(f"Export failed after streaming started: {e}", exc_info=True)
+            raise
+    
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="dog_breeds.{EXPORT_EXTENSIONS.get(export_format, export_format)}"'},
+        background=BackgroundTask(close_export),
+    )
+
+# Breed stream: the shared listener reports each committed load once per
+# process; the broadcaster's task fetches its records once and fans them out
+# to every subscriber
+async def publish_new_breeds(payload):
+    """breed_observations_added handler: queue the loaded runs for the stream"""
+    if not broadcaster.subscribers:
+        return
+    broadcaster.enqueue([int(run_id) for run_id in payload.split(',')])
+
+async def fetch_new_breeds(run_ids):
+    """DogBreed dicts of the records the given ingest runs loaded, oldest first"""
+    query = f"""
+        SELECT {BREED_COLUMNS}
+        FROM {BREED_TABLES}
+        WHERE o.ingest_run_id = ANY(%s)
+        ORDER BY o.execution_date, o.ingest_run_id, o.id
+    """
+    async with get_db_connection() as conn:
+        cursor = conn.cursor(row_factory=tuple_row)
+        await cursor.execute(query, (run_ids,))
+        breeds = await cursor.fetchall()
+    return [breed_dict(breed) for breed in breeds]
+
+async def restart_streams(listening):
+    """Listener connection handler: loads committed while it was down were not
+    pushed, so end the streams; clients reconnect and reload their list"""
+    broadcaster.close_all()
+
+listener.on_notify(RECORDS_CHANNEL, publish_new_breeds)
+listener.on_connection(restart_streams)
+
+@app.get("/api/breeds/stream")
+async def stream_breeds(
+    dag_id: Optional[str] = Query(default=None)
+):
+    """
+    Stream new dog breeds as Server-Sent Events
+    Sends a `breed` event (a DogBreed as JSON, oldest first) for every record
+    as soon as the DAG run that loaded it commits
+    """
+    subscriber = broadcaster.subscribe(dag_id)
+    
+    async def events():
+        try:
+            yield f"retry: {STREAM_RETRY_MS}\n\n"
+            while True:
+                try:
+                    breed = await asyncio.wait_for(subscriber.queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if breed is None:
+                    break
+                yield f"event: breed\nid: {breed['id']}\ndata: {encode(breed).decode()}\n\n"
+        finally:
+            broadcaster.unsubscribe(subscriber)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # No caching or proxy buffering, so events reach the browser right away
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.get("/api/breeds/{breed_id}", response_model=DogBreed)
-async def get_breed_by_id(breed_id: str):
+async def get_breed_by_id(
+    breed_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+):
     """Get a specific breed by ID"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        not_modified = await check_etag(response, if_none_match)
+        if not_modified:
+            return not_modified
         
-        query = """
-            SELECT 
-                id::text,
-                breed_name,
-                description,
-                life_expectancy,
-                life_expectancy as life_span,
-                dag_id,
-                dag_run_id,
-                dag_run_id as run_id,
-                task_id,
-                execution_date,
-                execution_date as start_date,
-                created_at,
-                'success' as state
-            FROM dog_breeds
-            WHERE id = %s::uuid
+        query = f"""
+            SELECT {BREED_COLUMNS}
+            FROM {BREED_TABLES}
+            WHERE o.id = %s::uuid
         """
         
-        cursor.execute(query, (breed_id,))
-        breed = cursor.fetchone()
-        
-        cursor.close()
-        conn.close()
+        breed = await cached_fetch(query, (breed_id,), one=True, row_factory=tuple_row)
         
         if not breed:
             raise HTTPException(status_code=404, detail="Breed not found")
         
-        return DogBreed(**breed)
+        return breed_response(breed, response)
         
     except HTTPException:
         raise
@@ -326,42 +641,62 @@ async def get_breed_by_id(breed_id: str):
 @app.get("/api/breeds/search/{breed_name}", response_model=List[DogBreed])
 async def search_breeds(
     breed_name: str,
-    limit: int = Query(default=10, ge=1, le=100)
+    limit: int = Query(default=10, ge=1, le=100),
+    mode: Literal["substring", "fulltext", "fuzzy"] = Query(default="substring"),
 ):
-    """Search breeds by name"""
+    """
+    Search breeds
+    - substring: breed names containing the text, most recent observations first
+    - fulltext: words in the name or description (web search syntax), one
+      result per breed ranked by relevance, name matches first
+    - fuzzy: breed names with a word similar to the text (typo tolerant),
+      one result per breed ranked by similarity
+    """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        query = """
-            SELECT 
-                id::text,
-                breed_name,
-                description,
-                life_expectancy,
-                life_expectancy as life_span,
-                dag_id,
-                dag_run_id,
-                dag_run_id as run_id,
-                task_id,
-                execution_date,
-                execution_date as start_date,
-                created_at,
-                'success' as state
-            FROM dog_breeds
-            WHERE breed_name ILIKE %s
-            ORDER BY execution_date DESC, created_at DESC
-            LIMIT %s
-        """
-        
-        cursor.execute(query, (f"%{breed_name}%", limit))
-        breeds = cursor.fetchall()
+        async with get_db_connection() as conn:
+            cursor = conn.cursor(row_factory=tuple_row)
         
-        cursor.close()
-        conn.close()
+            if mode == "fulltext":
+                query = f"""
+                    WITH matches AS (
+                        SELECT b.id, ts_rank_cd(b.search_vector, search_query) AS rank
+                        FROM breeds b, websearch_to_tsquery('english', %s) search_query
+                        WHERE b.search_vector @@ search_query
+                    )
+                    SELECT {BREED_COLUMNS}, m.rank
+                    FROM {RANKED_BREED_TABLES}
+                    ORDER BY m.rank DESC, o.execution_date DESC
+                    LIMIT %s
+                """
+                await cursor.execute(query, (breed_name, limit))
+            elif mode == "fuzzy":
+                query = f"""
+                    WITH matches AS (
+                        SELECT b.id, word_similarity(%s, b.breed_name) AS rank
+                        FROM breeds b
+                        WHERE %s <%% b.breed_name
+                    )
+                    SELECT {BREED_COLUMNS}, m.rank
+                    FROM {RANKED_BREED_TABLES}
+                    ORDER BY m.rank DESC, o.execution_date DESC
+                    LIMIT %s
+                """
+                await cursor.execute(query, (breed_name, breed_name, limit))
+            else:
+                query = f"""
+                    SELECT {BREED_COLUMNS}
+                    FROM {BREED_TABLES}
+                    WHERE b.breed_name ILIKE %s
+                    ORDER BY o.execution_date DESC, r.created_at DESC
+                    LIMIT %s
+                """
+                await cursor.execute(query, (f"%{breed_name}%", limit))
+            breeds = await cursor.fetchall()
         
-        return [DogBreed(**breed) for breed in breeds]
+        return breeds_response(breeds, rank=mode != "substring")
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error searching breeds: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to search breeds: {str(e)}")
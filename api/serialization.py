@@ -0,0 +1,105 @@
+"""
+Fast JSON encoding of breed records for the Dog Breeds API
+Breed queries fetch plain tuples and are encoded here with orjson, in the
+shape of the DogBreed model, instead of building a Pydantic model per row
+and having FastAPI validate and serialize it again. The compatibility
+aliases (life_span, run_id, start_date, state) are filled in here rather
+than selected twice in SQL.
+"""
+
+import csv
+import io
+from datetime import datetime
+
+import orjson
+from fastapi import Response
+
+# Columns of BREED_COLUMNS in api/main.py, in order; queries may select one
+# extra column after them (EXTRA_COLUMN: rank, or the page cursor's run id)
+BREED_FIELDS = (
+    'id',
+    'breed_name',
+    'description',
+    'life_expectancy',
+    'dag_id',
+    'dag_run_id',
+    'task_id',
+    'execution_date',
+    'created_at',
+)
+ID = BREED_FIELDS.index('id')
+EXECUTION_DATE = BREED_FIELDS.index('execution_date')
+EXTRA_COLUMN = len(BREED_FIELDS)
+
+# UTC timestamps as ...Z, like Pydantic
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+# Version of the bytes these functions produce, part of every ETag (see
+# check_etag in api/main.py). Bump it whenever a response body changes for
+# the same data (fields, number or timestamp formatting, encoder options),
+# so clients revalidating with an old tag get the new body instead of a 304
+REPRESENTATION_VERSION = 2
+
+
+def breed_dict(row, rank=False):
+    """DogBreed-shaped dict of a BREED_FIELDS row (rank from EXTRA_COLUMN if `rank`)"""
+    return {
+        'id': row[0],
+        'breed_name': row[1],
+        'description': row[2],
+        'life_expectancy': row[3],
+        'life_span': row[3],
+        'dag_id': row[4],
+        'dag_run_id': row[5],
+        'run_id': row[5],
+        'task_id': row[6],
+        'execution_date': row[7],
+        'start_date': row[7],
+        'created_at': row[8],
+        'state': 'success',
+        'rank': row[EXTRA_COLUMN] if rank else None,
+    }
+
+
+def encode(value):
+    """JSON bytes of dicts/lists built by breed_dict"""
+    return orjson.dumps(value, option=ORJSON_OPTIONS)
+
+
+def breeds_response(rows, response=None, rank=False):
+    """JSON array response of BREED_FIELDS rows, with the headers set on `response`"""
+    body = encode([breed_dict(row, rank) for row in rows])
+    return Response(body, media_type="application/json", headers=dict(response.headers) if response else None)
+
+
+def breed_response(row, response=None):
+    """JSON object response of one BREED_FIELDS row, with the headers set on `response`"""
+    return Response(encode(breed_dict(row)), media_type="application/json", headers=dict(response.headers) if response else None)
+
+
+# Bulk export (/api/breeds/export): one encoded chunk per fetched batch
+
+def encode_ndjson(columns, rows):
+    """One JSON object per row and line"""
+    return b"".join(encode(dict(zip(columns, row))) + b"\n" for row in rows)
+
+
+def csv_value(value):
+    """CSV cell: ISO timestamps, JSON for JSONB values, empty for NULL"""
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode()
+    return value
+
+
+def encode_csv(rows, header=None):
+    """CSV lines of `rows`, preceded by the `header` row if given"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(header)
+    writer.writerows([csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
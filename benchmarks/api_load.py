@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Load test the Dog Breeds API: throughput and latency percentiles under concurrency
+
+Runs --concurrency client threads for --duration seconds against each
+--api-url, each thread cycling through the read endpoints the dashboard
+uses, and prints requests/s with p50/p99 latency overall and per endpoint.
+Pass two URLs (e.g. the previous build on another port) to compare them
+side by side. With --conditional, clients revalidate with If-None-Match
+like the dashboard does and 304s are counted. Exits non-zero if any
+request fails.
+
+Usage:
+    python benchmarks/api_load.py --api-url http://localhost:30800 --concurrency 32 --duration 20
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+
+import requests
+
+ENDPOINTS = (
+    ('/api/breeds', {'limit': 20}),
+    ('/api/breeds/recent', {'limit': 10}),
+    ('/api/breeds/stats', {}),
+    ('/api/breeds/search/terrier', {'limit': 10}),
+    ('/health', {}),
+)
+
+
+def percentile(timings, pct):
+    """Nearest-rank percentile of a non-empty list of seconds"""
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run_load(api_url, concurrency, duration, conditional=False):
+    """{path: [seconds, ...]} of successful requests, the list of failures and the 304 count"""
+    base = api_url.rstrip('/')
+    timings = {path: [] for path, _ in ENDPOINTS}
+    failures = []
+    not_modified = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(offset):
+        session = requests.Session()
+        local = {path: [] for path, _ in ENDPOINTS}
+        local_failures = []
+        etags = {}
+        local_not_modified = 0
+        i = offset
+        while time.perf_counter() < deadline:
+            path, params = ENDPOINTS[i % len(ENDPOINTS)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                headers = {'If-None-Match': etags[path]} if conditional and path in etags else {}
+                response = session.get(f"{base}{path}", params=params, headers=headers, timeout=30)
+                elapsed = time.perf_counter() - start
+                if response.status_code == 304 and headers:
+                    local[path].append(elapsed)
+                    local_not_modified += 1
+                elif response.status_code != 200 or (path == '/health' and response.json()['status'] != 'healthy'):
+                    local_failures.append(f"{path}: HTTP {response.status_code} {response.text[:100]}")
+                else:
+                    local[path].append(elapsed)
+                    if 'ETag' in response.headers:
+                        etags[path] = response.headers['ETag']
+            except requests.RequestException as e:
+                local_failures.append(f"{path}: {e}")
+        with lock:
+            for path, values in local.items():
+                timings[path].extend(values)
+            failures.extend(local_failures)
+            not_modified.append(local_not_modified)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return timings, failures, sum(not_modified)
+
+
+def report(api_url, timings, failures, not_modified, duration):
+    every = [t for values in timings.values() for t in values]
+    print(f"--- {api_url}")
+    print(f"{'endpoint':<28}  {'requests':>8}  {'req/s':>8}  {'p50':>9}  {'p99':>9}")
+    rows = [(path, values) for path, values in timings.items()] + [('all', every)]
+    for path, values in rows:
+        if not values:
+            print(f"{path:<28}  {0:>8}")
+            continue
+        print(
+            f"{path:<28}  {len(values):>8}  {len(values) / duration:>8.1f}  "
+            f"{statistics.median(values) * 1000:>7.1f}ms  {percentile(values, 99) * 1000:>7.1f}ms"
+        )
+    print(f"failed requests: {len(failures)}, 304 Not Modified: {not_modified}")
+    return every
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--api-url', nargs='+', default=['http://localhost:30800'])
+    parser.add_argument('--concurrency', type=int, default=32, help="client threads")
+    parser.add_argument('--duration', type=float, default=20.0, help="seconds per API")
+    parser.add_argument('--conditional', action='store_true', help="revalidate with If-None-Match")
+    args = parser.parse_args()
+
+    summary = []
+    failed = False
+    for api_url in args.api_url:
+        timings, failures, not_modified = run_load(api_url, args.concurrency, args.duration, args.conditional)
+        every = report(api_url, timings, failures, not_modified, args.duration)
+        for failure in failures[:5]:
+            print(f"    {failure}")
+        failed = failed or bool(failures) or not every
+        if every:
+            summary.append((api_url, len(every) / args.duration, percentile(every, 99) * 1000))
+
+    if len(summary) > 1:
+        print("--- summary")
+        for api_url, throughput, p99 in summary:
+            print(f"{api_url:<40}  {throughput:>8.1f} req/s  p99 {p99:>7.1f}ms")
+
+    if failed:
+        print("FAIL: some requests failed")
+        sys.exit(1)
+    print("OK: all requests succeeded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark sequential vs. concurrent page fetching against a local stub server
+
+The stub serves a JSON:API-style paginated /breeds endpoint (links.next and
+meta.pagination.last, like dogapi.dog) and sleeps `--latency` seconds per
+request to simulate upstream round-trip time.
+
+Usage:
+    python benchmarks/async_fetcher.py --pages 30 --latency 0.2 --concurrency 8
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dags"))
+
+from dog_breeds.async_fetcher import ConcurrentPageFetcher  # noqa: E402
+from dog_breeds.http_client import RetryingSession  # noqa: E402
+
+RECORDS_PER_PAGE = 10
+
+
+def make_handler(pages, latency):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            page = int(parse_qs(parsed.query).get('page[number]', ['1'])[0])
+            time.sleep(latency)
+
+            base = f"http://{self.headers['Host']}{parsed.path}"
+            body = json.dumps({
+                'data': [
+                    {'id': f"{page}-{i}", 'type': 'breed', 'attributes': {'name': f"Breed {page}-{i}"}}
+                    for i in range(RECORDS_PER_PAGE)
+                ],
+                'meta': {'pagination': {'current': page, 'last': pages, 'records': pages * RECORDS_PER_PAGE}},
+                'links': {
+                    'next': f"{base}?page[number]={page + 1}" if page < pages else None,
+                    'last': f"{base}?page[number]={pages}",
+                },
+            }).encode('utf-8')
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return StubHandler
+
+
+def fetch_sequential(url):
+    """Follow links.next one page at a time, like the sequential DAG path"""
+    session = RetryingSession()
+    records = 0
+    while url:
+        data = session.get(url).json()
+        records += len(data['data'])
+        url = data['links'].get('next')
+    return records
+
+
+def fetch_concurrent(url, concurrency):
+    fetcher = ConcurrentPageFetcher(url, concurrency=concurrency, max_pages=10_000)
+    return sum(1 for _ in fetcher.iter_records())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=30)
+    parser.add_argument('--latency', type=float, default=0.2, help="simulated per-request latency in seconds")
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(args.pages, args.latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/breeds"
+
+    try:
+        start = time.perf_counter()
+        sequential_records = fetch_sequential(url)
+        sequential_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        concurrent_records = fetch_concurrent(url, args.concurrency)
+        concurrent_seconds = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    assert sequential_records == concurrent_records == args.pages * RECORDS_PER_PAGE
+
+    print(f"pages={args.pages} latency={args.latency}s records={concurrent_records}")
+    print(f"sequential:              {sequential_seconds:6.2f}s")
+    print(f"concurrent (limit {args.concurrency:>2}):  {concurrent_seconds:6.2f}s")
+    print(f"speedup:                 {sequential_seconds / concurrent_seconds:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
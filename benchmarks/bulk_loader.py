@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark the COPY-based bulk loader against row-by-row inserts
+
+Connects with the same DOG_BREEDS_DB_* environment variables as the DAG
+(e.g. via the NodePort on localhost:30432). Every measurement runs inside
+a transaction that is rolled back, so no benchmark rows are left behind.
+
+Usage:
+    DOG_BREEDS_DB_HOST=localhost DOG_BREEDS_DB_PORT=30432 \\
+        python benchmarks/bulk_loader.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import psycopg2
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dags"))
+
+from dog_breeds.loader import BREED_COLUMNS, RUN_COLUMNS, load_breeds  # noqa: E402
+
+DB_CONFIG = {
+    'host': os.getenv('DOG_BREEDS_DB_HOST', 'localhost'),
+    'port': os.getenv('DOG_BREEDS_DB_PORT', '30432'),
+    'database': os.getenv('DOG_BREEDS_DB_NAME', 'dog_breeds_db'),
+    'user': os.getenv('DOG_BREEDS_DB_USER', 'airflow'),
+    'password': os.getenv('DOG_BREEDS_DB_PASSWORD', 'airflow'),
+}
+
+# The per-row statements the DAG would need without the bulk loader
+ROW_BREED_SQL = f"""
+    INSERT INTO breeds ({', '.join(BREED_COLUMNS)})
+    VALUES ({', '.join(['%s'] * len(BREED_COLUMNS))})
+    ON CONFLICT (api_id)
+    DO UPDATE SET
+        breed_name = EXCLUDED.breed_name,
+        description = EXCLUDED.description,
+        life_expectancy = EXCLUDED.life_expectancy,
+        life_min = EXCLUDED.life_min,
+        life_max = EXCLUDED.life_max,
+        full_data = EXCLUDED.full_data,
+        content_hash = EXCLUDED.content_hash,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE breeds.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+"""
+
+ROW_RUN_SQL = f"""
+    INSERT INTO ingest_runs ({', '.join(RUN_COLUMNS)})
+    VALUES ({', '.join(['%s'] * len(RUN_COLUMNS))})
+    ON CONFLICT (dag_run_id) DO NOTHING
+"""
+
+ROW_OBSERVATION_SQL = """
+    INSERT INTO breed_observations (ingest_run_id, breed_id, execution_date)
+    SELECT runs.id, breeds.id, runs.execution_date
+    FROM ingest_runs runs, breeds
+    WHERE runs.dag_run_id = %s AND breeds.api_id = %s
+    ON CONFLICT (ingest_run_id, breed_id, execution_date) DO NOTHING
+"""
+
+
+def make_records(count, run_id):
+    """Generate synthetic breed records shaped like the DAG's output"""
+    execution_date = datetime.now(timezone.utc)
+    for i in range(count):
+        yield {
+            'api_id': f"benchmark-{i}",
+            'breed_name': f"Benchmark Breed {i}",
+            'description': f"Synthetic breed #{i} used for loader benchmarks",
+            'life_expectancy': "10-14 years",
+            'life_min': 10,
+            'life_max': 14,
+            'dag_id': 'loader_benchmark',
+            'dag_run_id': run_id,
+            'task_id': 'benchmark',
+            'execution_date': execution_date,
+            'asset_uri': f"dog_breed://loader_benchmark/{run_id}",
+            'full_data': {'id': str(i), 'type': 'breed', 'attributes': {'name': f"Benchmark Breed {i}"}},
+            'content_hash': f"{i:064x}",
+        }
+
+
+def insert_row_by_row(conn, records):
+    with conn.cursor() as cursor:
+        for record in records:
+            values = [
+                json.dumps(record[column]) if column == 'full_data' else record[column]
+                for column in BREED_COLUMNS
+            ]
+            cursor.execute(ROW_BREED_SQL, values)
+            cursor.execute(ROW_RUN_SQL, [record[column] for column in RUN_COLUMNS])
+            cursor.execute(ROW_OBSERVATION_SQL, (record['dag_run_id'], record['api_id']))
+
+
+def timed(conn, label, size, fn):
+    run_id = f"benchmark__{label}__{size}__{time.time_ns()}"
+    start = time.perf_counter()
+    try:
+        fn(conn, make_records(size, run_id))
+        return time.perf_counter() - start
+    finally:
+        conn.rollback()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    print(f"Database: {DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}")
+    print(f"{'rows':>8}  {'row-by-row':>12}  {'COPY+merge':>12}  {'speedup':>8}")
+    try:
+        for size in args.sizes:
+            row_seconds = timed(conn, 'rows', size, insert_row_by_row)
+            bulk_seconds = timed(conn, 'copy', size, load_breeds)
+            print(f"{size:>8}  {row_seconds:>11.2f}s  {bulk_seconds:>11.2f}s  {row_seconds / bulk_seconds:>7.1f}x")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Time loading the breed history into an Arrow table: JSON pages vs. columnar export
+
+Against a running API, loads every dog_breeds row (optionally one --dag-id)
+three ways and reports seconds and rows/s of each:
+- json: /api/breeds cursor pages of 100, then pa.Table.from_pylist (what the
+  analytics jobs do today, minus the DataFrame step)
+- arrow: /api/breeds/export?format=arrow read with pa.ipc.open_stream
+- parquet: /api/breeds/export?format=parquet read with pq.read_table
+Exits non-zero if the three disagree on the row ids or the Arrow export is
+not --min-speedup times faster than the JSON pages.
+
+Needs pyarrow and requests, and the API with some data:
+    python benchmarks/columnar_export.py --api-url http://localhost:30800
+"""
+
+import argparse
+import io
+import sys
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import requests
+
+
+def load_json_pages(session, api_url, dag_id):
+    """Every /api/breeds row, following X-Next-Cursor, as an Arrow table"""
+    params = {'limit': 100, **({'dag_id': dag_id} if dag_id else {})}
+    rows = []
+    while True:
+        response = session.get(f"{api_url}/api/breeds", params=params, timeout=60)
+        response.raise_for_status()
+        rows.extend(response.json())
+        next_cursor = response.headers.get('X-Next-Cursor')
+        if not next_cursor:
+            return pa.Table.from_pylist(rows)
+        params['cursor'] = next_cursor
+
+
+def load_export(session, api_url, dag_id, export_format):
+    """The /api/breeds/export download in `export_format`, as an Arrow table"""
+    params = {'format': export_format, **({'dag_id': dag_id} if dag_id else {})}
+    response = session.get(f"{api_url}/api/breeds/export", params=params, timeout=600, stream=True)
+    response.raise_for_status()
+    if export_format == 'arrow':
+        return pa.ipc.open_stream(response.raw).read_all()
+    return pq.read_table(io.BytesIO(response.content))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--api-url', default='http://localhost:30800')
+    parser.add_argument('--dag-id', default=None)
+    parser.add_argument('--min-speedup', type=float, default=3.0)
+    args = parser.parse_args()
+
+    api_url = args.api_url.rstrip('/')
+    session = requests.Session()
+    loaders = (
+        ('json', lambda: load_json_pages(session, api_url, args.dag_id)),
+        ('arrow', lambda: load_export(session, api_url, args.dag_id, 'arrow')),
+        ('parquet', lambda: load_export(session, api_url, args.dag_id, 'parquet')),
+    )
+
+    print(f"{'source':<8}  {'rows':>8}  {'seconds':>8}  {'rows/s':>9}")
+    seconds, ids = {}, {}
+    for name, load in loaders:
+        start = time.perf_counter()
+        table = load()
+        seconds[name] = time.perf_counter() - start
+        ids[name] = set(table.column('id').to_pylist())
+        print(f"{name:<8}  {table.num_rows:>8}  {seconds[name]:>8.2f}  {table.num_rows / seconds[name]:>9,.0f}")
+
+    failures = []
+    if not ids['json'] == ids['arrow'] == ids['parquet']:
+        failures.append("the JSON pages and the exports return different rows")
+    speedup = seconds['json'] / seconds['arrow']
+    print(f"arrow speedup over JSON pages: {speedup:.1f}x")
+    if speedup < args.min_speedup:
+        failures.append(f"arrow export is only {speedup:.1f}x faster (expected {args.min_speedup}x)")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: the columnar export loads the same rows faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Measure DAG file parse time and import cost
+
+Each DAG file is parsed in a fresh interpreter that has already imported
+Airflow (as the DAG processor has), so the numbers only cover what the DAG
+file itself adds. Reports the median parse time over --runs, the top-level
+modules the file pulls in, and the slowest imports from `-X importtime`.
+Exits non-zero if a file exceeds --max-ms or imports a module from
+--forbid at parse time (those belong inside the task callables).
+
+Needs an environment with Airflow installed (e.g. inside the scheduler pod):
+    python benchmarks/dag_parse.py
+    python benchmarks/dag_parse.py dags/dog_breed_dag.py --runs 10 --max-ms 200
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+DAGS_DIR = Path(__file__).resolve().parent.parent / "dags"
+
+# Modules the DAG files must not import at parse time
+HEAVY_MODULES = ('requests', 'psycopg2', 'httpx', 'pyarrow', 'orjson', 'pandas')
+
+IMPORT_MARKER = '--- dag file import starts ---'
+
+# Runs in the child interpreter: preload Airflow like the DAG processor,
+# then time the import of one DAG file
+PARSE_SCRIPT = f"""
+import importlib.util, json, sys, time
+import airflow
+from airflow import DAG
+from airflow.sdk import Asset, Param
+from airflow.providers.standard.operators.python import PythonOperator
+
+path, dags_dir = sys.argv[1], sys.argv[2]
+sys.path.insert(0, dags_dir)
+before = set(sys.modules)
+sys.stderr.write({IMPORT_MARKER!r} + '\\n')
+sys.stderr.flush()
+
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location('benchmarked_dag_file', path)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+seconds = time.perf_counter() - start
+
+print(json.dumps({{
+    'seconds': seconds,
+    'dags': sorted(dag.dag_id for dag in vars(module).values() if isinstance(dag, DAG)),
+    'new_modules': sorted({{name.split('.')[0] for name in set(sys.modules) - before}}),
+}}))
+"""
+
+
+def parse_once(path):
+    """Parse one DAG file in a fresh interpreter; returns (result dict, importtime lines)"""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PARSE_SCRIPT, str(path), str(DAGS_DIR)],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Parsing {path} failed:\n{completed.stderr[-2000:]}")
+
+    stderr = completed.stderr.split(IMPORT_MARKER, 1)[-1]
+    imports = []
+    for line in stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imports.append((int(cumulative), name.rstrip()))
+    return json.loads(completed.stdout.strip().splitlines()[-1]), imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='*', type=Path, help="DAG files (default: dags/*.py)")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, default=500, help="fail if the median parse time is above this")
+    parser.add_argument('--top', type=int, default=10, help="number of slowest imports to show")
+    parser.add_argument('--forbid', nargs='*', default=list(HEAVY_MODULES))
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(DAGS_DIR.glob('*.py'))
+    failures = []
+    for path in paths:
+        results = [parse_once(path) for _ in range(args.runs)]
+        median_ms = statistics.median(result['seconds'] for result, _ in results) * 1000
+        result, imports = results[0]
+
+        print(f"{path.name}: {median_ms:.1f} ms median over {args.runs} runs, DAGs {result['dags']}")
+        print(f"  new top-level modules: {', '.join(result['new_modules']) or '-'}")
+        # Top-level entries of the first (cold) run; nested imports are indented
+        top_level = sorted(((us, name.strip()) for us, name in imports if not name.startswith('   ')), reverse=True)
+        for cumulative_us, name in top_level[:args.top]:
+            print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+        if median_ms > args.max_ms:
+            failures.append(f"{path.name} parses in {median_ms:.1f} ms (limit {args.max_ms:.0f} ms)")
+        heavy = sorted(set(result['new_modules']) & set(args.forbid))
+        if heavy:
+            failures.append(f"{path.name} imports {', '.join(heavy)} at parse time")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: DAG files parse within budget without heavy imports")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Prove that /api/breeds/export streams in constant memory
+
+Calls the export endpoint in-process over ASGI (the API's own connection
+pool, no network) for the oldest --sizes rows of dog_breeds, bounded with
+`until`, and discards each chunk as it arrives. Reports rows/s and the
+tracemalloc peak of every export; for comparison it also measures fetching
+the same rows at once and encoding them as one body. Exits non-zero if the
+export peak grows with the row count.
+
+Needs the API dependencies (api/requirements.txt) and a database with
+breed rows (e.g. after benchmarks/stats_rollup.py --keep or a few DAG runs):
+    DOG_BREEDS_DB_HOST=localhost DOG_BREEDS_DB_PORT=30432 python benchmarks/export_memory.py
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "api"))
+
+from psycopg.rows import tuple_row  # noqa: E402
+
+import main  # noqa: E402
+from db import close_pool, get_db_connection, open_pool  # noqa: E402
+from serialization import encode_ndjson  # noqa: E402
+
+BOUND_SQL = "SELECT execution_date FROM dog_breeds ORDER BY execution_date OFFSET %s LIMIT 1"
+EXPORT_SQL = f"SELECT {', '.join(main.EXPORT_COLUMNS)} FROM dog_breeds WHERE execution_date < %s ORDER BY execution_date"
+
+
+async def until_bound(size):
+    """execution_date just past the oldest `size` rows (None if there are fewer)"""
+    async with get_db_connection() as conn:
+        cursor = conn.cursor(row_factory=tuple_row)
+        await cursor.execute(BOUND_SQL, (size,))
+        row = await cursor.fetchone()
+    return row[0] if row else None
+
+
+async def export(until, export_format):
+    """Stream one export through the ASGI app; returns (status, rows, bytes)"""
+    query_string = f"format={export_format}&until={until.isoformat()}".replace('+', '%2B')
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': '/api/breeds/export', 'raw_path': b'/api/breeds/export', 'root_path': '',
+        'query_string': query_string.encode(), 'headers': [], 'server': ('benchmark', 80), 'client': ('benchmark', 1),
+    }
+    result = {'status': None, 'lines': 0, 'bytes': 0}
+    requested = asyncio.Event()
+
+    async def receive():
+        # StreamingResponse keeps listening for a disconnect: answer once, then block
+        if requested.is_set():
+            await asyncio.Event().wait()
+        requested.set()
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            result['status'] = message['status']
+        elif message['type'] == 'http.response.body':
+            body = message.get('body', b'')
+            result['lines'] += body.count(b'\n')
+            result['bytes'] += len(body)
+
+    await main.app(scope, receive, send)
+    rows = result['lines'] - (1 if export_format == 'csv' else 0)
+    return result['status'], rows, result['bytes']
+
+
+async def buffered(until):
+    """The same rows fetched at once and encoded as a single body"""
+    async with get_db_connection() as conn:
+        cursor = conn.cursor(row_factory=tuple_row)
+        await cursor.execute(EXPORT_SQL, (until,))
+        rows = await cursor.fetchall()
+    return len(encode_ndjson(main.EXPORT_COLUMNS, rows))
+
+
+async def traced(coroutine):
+    tracemalloc.start()
+    try:
+        result = await coroutine
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+async def run(args):
+    await open_pool()
+    failures = []
+    peaks = []
+    try:
+        print(f"{'rows':>8}  {'format':>6}  {'body':>10}  {'rows/s':>9}  {'stream peak':>12}  {'buffered peak':>14}")
+        for size in args.sizes:
+            until = await until_bound(size)
+            if until is None:
+                print(f"{size:>8}  skipped: dog_breeds has fewer rows")
+                continue
+            for export_format in args.formats:
+                start = time.perf_counter()
+                status, rows, size_bytes = await export(until, export_format)
+                elapsed = time.perf_counter() - start
+                (_, traced_rows, _), peak = await traced(export(until, export_format))
+                if status != 200 or rows != traced_rows:
+                    failures.append(f"{export_format} export of {size} rows: status {status}, {rows} vs {traced_rows} rows")
+                peaks.append(peak)
+                buffered_column = '-'
+                if export_format == 'ndjson' and not args.skip_buffered:
+                    _, buffered_peak = await traced(buffered(until))
+                    buffered_column = f"{buffered_peak / 1024:,.0f} KB"
+                print(
+                    f"{rows:>8}  {export_format:>6}  {size_bytes / 1024:>7,.0f} KB  {rows / elapsed:>9,.0f}"
+                    f"  {peak / 1024:>9,.0f} KB  {buffered_column:>14}"
+                )
+    finally:
+        await close_pool()
+
+    if len(peaks) < 2:
+        failures.append("not enough rows in dog_breeds to compare export sizes")
+    # Flat: the largest export may not need noticeably more than the smallest,
+    # which already holds one full batch
+    elif max(peaks) > 2 * min(peaks):
+        failures.append("export peak grows with the row count")
+    return failures
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5000, 20000, 50000], help="rows per export")
+    parser.add_argument('--formats', nargs='+', choices=['ndjson', 'csv'], default=['ndjson', 'csv'])
+    parser.add_argument('--skip-buffered', action='store_true', help="skip the fetch-all comparison")
+    args = parser.parse_args()
+
+    failures = asyncio.run(run(args))
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: export memory is bounded by the batch size, not the row count")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Measure /api/breeds page latency by depth: offset vs. keyset cursor pages
+
+Walks the running API with cursor pages (following X-Next-Cursor) and, at
+each --depths row offset reached, times the same page requested with
+`offset` and with the cursor (median of --repeat). Both pages must return
+the same rows. Exits non-zero if the deepest cursor page is more than
+--tolerance times slower than the first.
+
+Needs the API and some data (e.g. the sharded DAG or a few hundred runs):
+    python benchmarks/pagination.py --api-url http://localhost:30800 --depths 0 1000 10000 50000
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+import requests
+
+
+def timed_page(session, url, params, repeat):
+    """Median seconds for one page request, and the last response"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = session.get(url, params=params, timeout=60)
+        timings.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return statistics.median(timings), response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--api-url', default='http://localhost:30800')
+    parser.add_argument('--depths', type=int, nargs='+', default=[0, 1000, 10000, 50000])
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--dag-id', default=None)
+    parser.add_argument('--tolerance', type=float, default=3.0, help="max slowdown of the deepest cursor page")
+    args = parser.parse_args()
+
+    url = f"{args.api_url.rstrip('/')}/api/breeds"
+    base_params = {'limit': args.limit, **({'dag_id': args.dag_id} if args.dag_id else {})}
+    session = requests.Session()
+
+    print(f"{'depth':>8}  {'offset page':>12}  {'cursor page':>12}")
+    cursor_timings = []
+    failures = []
+    next_cursor, depth = None, 0
+    for target in sorted(args.depths):
+        # Follow cursors (untimed) until the next page starts at `target`
+        while depth < target:
+            cursor_params = {**base_params, **({'cursor': next_cursor} if next_cursor else {})}
+            response = session.get(url, params=cursor_params, timeout=60)
+            response.raise_for_status()
+            next_cursor = response.headers.get('X-Next-Cursor')
+            depth += args.limit
+            if not next_cursor:
+                break
+        if depth != target or (depth and not next_cursor):
+            print(f"Stopping: depth {target} is not reachable in pages of {args.limit} (reached {depth})")
+            break
+
+        offset_seconds, offset_page = timed_page(session, url, {**base_params, 'offset': depth}, args.repeat)
+        cursor_params = {**base_params, **({'cursor': next_cursor} if next_cursor else {})}
+        cursor_seconds, cursor_page = timed_page(session, url, cursor_params, args.repeat)
+        cursor_timings.append(cursor_seconds)
+        print(f"{depth:>8}  {offset_seconds * 1000:>10.1f}ms  {cursor_seconds * 1000:>10.1f}ms")
+
+        if [row['id'] for row in offset_page.json()] != [row['id'] for row in cursor_page.json()]:
+            failures.append(f"offset and cursor pages differ at depth {depth}")
+
+    if len(cursor_timings) > 1 and cursor_timings[-1] > cursor_timings[0] * args.tolerance:
+        failures.append(
+            f"cursor page latency grew from {cursor_timings[0] * 1000:.1f}ms to {cursor_timings[-1] * 1000:.1f}ms"
+        )
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: cursor pages match offset pages and their latency stays flat")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Check that every /api/breeds/search mode is served by an index
+
+Seeds --breeds synthetic breeds (inside a transaction that is rolled back)
+so the planner sees a realistically sized catalog, then EXPLAINs the breed
+matching step of each search mode and the latest-observation lookup used by
+the ranked modes. Prints each plan with its timing and exits non-zero if an
+expected index is not used.
+
+Usage:
+    DOG_BREEDS_DB_HOST=localhost DOG_BREEDS_DB_PORT=30432 \\
+        python benchmarks/search_explain.py --breeds 20000
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+
+import psycopg2
+
+DB_CONFIG = {
+    'host': os.getenv('DOG_BREEDS_DB_HOST', 'localhost'),
+    'port': os.getenv('DOG_BREEDS_DB_PORT', '30432'),
+    'database': os.getenv('DOG_BREEDS_DB_NAME', 'dog_breeds_db'),
+    'user': os.getenv('DOG_BREEDS_DB_USER', 'airflow'),
+    'password': os.getenv('DOG_BREEDS_DB_PASSWORD', 'airflow'),
+}
+
+WORDS = (
+    'shepherd', 'terrier', 'retriever', 'hound', 'spaniel', 'mastiff', 'collie', 'pointer',
+    'setter', 'schnauzer', 'poodle', 'bulldog', 'husky', 'malamute', 'corgi', 'beagle',
+)
+
+# Names are a common word plus a per-breed token (first 10 hex digits of
+# md5(n)), so each check below can pick a selective term like a real search
+SEED_SQL = """
+    INSERT INTO breeds (api_id, breed_name, description)
+    SELECT
+        'search-explain-' || g,
+        initcap((%(words)s::text[])[1 + g %% %(word_count)s]) || ' ' || left(md5(g::text), 10),
+        'A ' || (%(words)s::text[])[1 + (g / 3) %% %(word_count)s] || ' type bred for herding and guarding, '
+            || left(md5(g::text), 10)
+    FROM generate_series(1, %(breeds)s) g
+"""
+
+# Per-breed token of breed number 4242, and a typo of it (one character changed)
+TOKEN = hashlib.md5(b'4242').hexdigest()[:10]
+TYPO = TOKEN[:5] + ('x' if TOKEN[5] != 'x' else 'y') + TOKEN[6:]
+
+# (label, query, parameters, index that must appear in the plan); the
+# matching predicates are the ones the search modes in api/main.py use
+CHECKS = (
+    (
+        'substring (ILIKE)',
+        "SELECT b.id FROM breeds b WHERE b.breed_name ILIKE %s",
+        (f'%{TOKEN[2:8]}%',),
+        'idx_breeds_breed_name_trgm',
+    ),
+    (
+        'fulltext',
+        """
+            SELECT b.id, ts_rank_cd(b.search_vector, search_query) AS rank
+            FROM breeds b, websearch_to_tsquery('english', %s) search_query
+            WHERE b.search_vector @@ search_query
+        """,
+        (f'herding {TOKEN}',),
+        'idx_breeds_search_vector',
+    ),
+    (
+        'fuzzy (word similarity)',
+        "SELECT b.id, word_similarity(%s, b.breed_name) AS rank FROM breeds b WHERE %s <%% b.breed_name",
+        (TYPO, TYPO),
+        'idx_breeds_breed_name_trgm',
+    ),
+    (
+        'latest observation of a breed',
+        """
+            SELECT * FROM breed_observations latest
+            WHERE latest.breed_id = %s
+            ORDER BY latest.execution_date DESC
+            LIMIT 1
+        """,
+        (1,),
+        'breed_id_execution_date_idx',
+    ),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--breeds', type=int, default=20000, help="synthetic breeds added before EXPLAIN")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    failures = []
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(SEED_SQL, {'words': list(WORDS), 'word_count': len(WORDS), 'breeds': args.breeds})
+            cursor.execute("ANALYZE breeds")
+
+            for label, query, params, index in CHECKS:
+                cursor.execute(f"EXPLAIN (ANALYZE, COSTS OFF) {query}", params)
+                plan = [row[0] for row in cursor.fetchall()]
+                print(f"--- {label}")
+                print("\n".join(f"    {line}" for line in plan))
+                # Partition indexes are named after the parent index's columns
+                if not any(index in line for line in plan):
+                    failures.append(f"{label} does not use {index}")
+    finally:
+        conn.rollback()
+        conn.close()
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: every search mode is served by an index")
+
+
+if __name__ == "__main__":
+    main()
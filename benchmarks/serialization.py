@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Per-request CPU time of a breed list response: Pydantic models vs. orjson tuples
+
+Serves --rows synthetic breed rows through two FastAPI routes called
+in-process over ASGI (no network, no database):
+- model: dict rows with the SQL alias columns -> DogBreed(**row) per row ->
+  response_model validation and serialization (the original list endpoints)
+- fast: tuple rows -> api/serialization.breeds_response (the current ones)
+and reports the mean CPU time per request of each. Exits non-zero if the
+two bodies differ or the fast path is not --min-speedup times faster.
+
+Needs the API dependencies (api/requirements.txt):
+    python benchmarks/serialization.py --rows 100 --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "api"))
+
+from fastapi import FastAPI  # noqa: E402
+
+from main import DogBreed  # noqa: E402
+from serialization import breeds_response  # noqa: E402
+
+DESCRIPTION = (
+    "A medium-sized herding dog known for its intelligence, agility and boundless energy. "
+    "Bred to work livestock over long days, it needs daily exercise and mental stimulation."
+)
+
+
+def make_rows(count):
+    """(tuple rows in BREED_FIELDS order, the same rows as dicts with the old alias columns)"""
+    start = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    tuples, dicts = [], []
+    for i in range(count):
+        execution_date = start - timedelta(hours=i)
+        row = (
+            str(uuid.uuid4()),
+            f"Benchmark Breed {i}",
+            DESCRIPTION,
+            "12 - 15 years",
+            'dog_breed_fetcher',
+            f"scheduled__{execution_date.isoformat()}",
+            'fetch_dog_breed',
+            execution_date,
+            execution_date + timedelta(seconds=3),
+        )
+        tuples.append(row)
+        dicts.append({
+            'id': row[0],
+            'breed_name': row[1],
+            'description': row[2],
+            'life_expectancy': row[3],
+            'life_span': row[3],
+            'dag_id': row[4],
+            'dag_run_id': row[5],
+            'run_id': row[5],
+            'task_id': row[6],
+            'execution_date': row[7],
+            'start_date': row[7],
+            'created_at': row[8],
+            'state': 'success',
+        })
+    return tuples, dicts
+
+
+def make_app(tuples, dicts):
+    app = FastAPI()
+
+    @app.get("/model", response_model=List[DogBreed])
+    async def model_path():
+        return [DogBreed(**breed) for breed in dicts]
+
+    @app.get("/fast", response_model=List[DogBreed])
+    async def fast_path():
+        return breeds_response(tuples)
+
+    return app
+
+
+async def call(app, path):
+    """Run one GET through the ASGI app; returns the response body"""
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'root_path': '',
+        'query_string': b'', 'headers': [], 'server': ('benchmark', 80), 'client': ('benchmark', 1),
+    }
+    chunks = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.body':
+            chunks.append(message.get('body', b''))
+
+    await app(scope, receive, send)
+    return b''.join(chunks)
+
+
+async def cpu_per_request(app, path, requests):
+    """Mean CPU seconds per request over `requests` calls (after a warm-up)"""
+    for _ in range(50):
+        await call(app, path)
+    start = time.process_time()
+    for _ in range(requests):
+        await call(app, path)
+    return (time.process_time() - start) / requests
+
+
+async def run(args):
+    tuples, dicts = make_rows(args.rows)
+    app = make_app(tuples, dicts)
+
+    model_body = await call(app, "/model")
+    fast_body = await call(app, "/fast")
+    failures = []
+    if json.loads(model_body) != json.loads(fast_body):
+        failures.append("fast and model responses differ")
+
+    model_cpu = await cpu_per_request(app, "/model", args.requests)
+    fast_cpu = await cpu_per_request(app, "/fast", args.requests)
+    speedup = model_cpu / fast_cpu
+    print(f"{args.rows} rows per response, {args.requests} requests per path")
+    print(f"{'path':<8}  {'CPU/request':>12}  {'body':>9}")
+    print(f"{'model':<8}  {model_cpu * 1e6:>10.0f}us  {len(model_body):>7}B")
+    print(f"{'fast':<8}  {fast_cpu * 1e6:>10.0f}us  {len(fast_body):>7}B")
+    print(f"speedup: {speedup:.1f}x")
+    if speedup < args.min_speedup:
+        failures.append(f"fast path is only {speedup:.1f}x faster (expected {args.min_speedup}x)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100, help="breed rows per response")
+    parser.add_argument('--requests', type=int, default=2000, help="timed requests per path")
+    parser.add_argument('--min-speedup', type=float, default=2.0)
+    args = parser.parse_args()
+
+    failures = asyncio.run(run(args))
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: the fast path returns the same JSON for less CPU")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Check that one poisoned spool entry cannot block ingestion
+
+Spools --records good breed records plus one the database always rejects
+(a breed_name longer than the column allows) and then simulates DAG runs:
+each flushes the spool with flush_spool and loads a record of its own.
+Every run must load its own record, the good spooled records must be
+written by the first run, and the poisoned entry must be quarantined once
+it reaches SPOOL_MAX_ATTEMPTS. Reports the flush time of a clean batch vs.
+one that falls back to record-by-record loading. Commits are deferred and
+everything is rolled back at the end. Exits non-zero on any failed check.
+
+Usage:
+    DOG_BREEDS_DB_HOST=localhost DOG_BREEDS_DB_PORT=30432 python benchmarks/spool_poison.py
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import psycopg2
+import psycopg2.extensions
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dags"))
+
+from dog_breeds.loader import load_breeds  # noqa: E402
+from dog_breeds.spool import SPOOL_MAX_ATTEMPTS, WriteBehindSpool, flush_spool  # noqa: E402
+
+DB_CONFIG = {
+    'host': os.getenv('DOG_BREEDS_DB_HOST', 'localhost'),
+    'port': os.getenv('DOG_BREEDS_DB_PORT', '30432'),
+    'database': os.getenv('DOG_BREEDS_DB_NAME', 'dog_breeds_db'),
+    'user': os.getenv('DOG_BREEDS_DB_USER', 'airflow'),
+    'password': os.getenv('DOG_BREEDS_DB_PASSWORD', 'airflow'),
+}
+
+DAG_ID = 'spool_poison_benchmark'
+OBSERVATIONS_SQL = """
+    SELECT COUNT(*) FROM breed_observations o
+    JOIN ingest_runs r ON r.id = o.ingest_run_id
+    WHERE r.dag_run_id = %s
+"""
+
+
+class DeferredCommitConnection(psycopg2.extensions.connection):
+    """Keeps the whole benchmark in one transaction: commit() is a no-op, rolled back at the end"""
+
+    def commit(self):
+        pass
+
+
+def record(run_id, i, breed_name=None):
+    return {
+        'api_id': f"spool-poison-{run_id}-{i}",
+        'breed_name': breed_name or f"Spool Poison Breed {i}",
+        'description': None,
+        'life_expectancy': None,
+        'life_min': None,
+        'life_max': None,
+        'dag_id': DAG_ID,
+        'dag_run_id': run_id,
+        'task_id': 'benchmark',
+        'execution_date': datetime.now(timezone.utc),
+        'asset_uri': None,
+        'full_data': {'id': str(i)},
+        'content_hash': f"{i:064x}",
+    }
+
+
+def observations(conn, run_id):
+    with conn.cursor() as cursor:
+        cursor.execute(OBSERVATIONS_SQL, (run_id,))
+        return cursor.fetchone()[0]
+
+
+def timed_flush(conn, spool):
+    start = time.perf_counter()
+    stats = flush_spool(conn, spool)
+    return stats, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=200, help="good records spooled next to the poisoned one")
+    args = parser.parse_args()
+
+    failures = []
+    conn = psycopg2.connect(**DB_CONFIG, connection_factory=DeferredCommitConnection)
+    with tempfile.TemporaryDirectory() as spool_dir:
+        try:
+            spool = WriteBehindSpool(os.path.join(spool_dir, 'spool.sqlite3'))
+
+            # Baseline: a clean spool flushes in one bulk load
+            clean_run = f"spool_poison__clean__{time.time_ns()}"
+            spool.append([record(clean_run, i) for i in range(args.records)])
+            _, clean_seconds = timed_flush(conn, spool)
+
+            spooled_run = f"spool_poison__spooled__{time.time_ns()}"
+            poisoned = record(spooled_run, args.records, breed_name='x' * 300)
+            spool.append([record(spooled_run, i) for i in range(args.records)] + [poisoned], error='benchmark')
+
+            print(f"{'run':>4}  {'flushed':>8}  {'rejected':>8}  {'quarantined':>11}  {'pending':>7}  {'flush':>9}  own record")
+            for run in range(1, SPOOL_MAX_ATTEMPTS + 1):
+                stats, seconds = timed_flush(conn, spool)
+                if stats is None:
+                    break
+                own_run = f"spool_poison__run{run}__{time.time_ns()}"
+                load_breeds(conn, [record(own_run, 0)])
+                own_loaded = observations(conn, own_run) == 1
+                print(
+                    f"{run:>4}  {stats['rows_staged']:>8}  {stats['rows_failed']:>8}  {stats['rows_quarantined']:>11}"
+                    f"  {spool.pending():>7}  {seconds * 1000:>7.1f}ms  {'loaded' if own_loaded else 'MISSING'}"
+                )
+                if run == 1:
+                    poisoned_seconds = seconds
+                    if observations(conn, spooled_run) != args.records:
+                        failures.append("the good spooled records were not written by the first flush")
+                if not own_loaded:
+                    failures.append(f"run {run} did not load its own record")
+
+            if spool.pending() or spool.quarantined() != 1:
+                failures.append(
+                    f"expected the poisoned entry in quarantine, got {spool.pending()} pending, {spool.quarantined()} quarantined"
+                )
+            print(f"clean flush of {args.records} records: {clean_seconds * 1000:.1f}ms, "
+                  f"with a poisoned entry: {poisoned_seconds * 1000:.1f}ms")
+        finally:
+            conn.rollback()
+            conn.close()
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: a poisoned spool entry is retried, then quarantined, without blocking other records")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Compare /api/breeds/stats read cost: full recount vs. breed_stats_rollup
+
+Grows breed_observations through the bulk loader (so the insert trigger
+maintains the rollup as the DAG would) and, at each --sizes step, times the
+original COUNT/COUNT DISTINCT/MAX query and the rollup lookup, for all DAGs
+and for one dag_id, then checks the rollup against a recount. Everything
+runs in one transaction that is rolled back. Exits non-zero if the rollup
+drifts or its read time is not flat as the table grows.
+
+Usage:
+    DOG_BREEDS_DB_HOST=localhost DOG_BREEDS_DB_PORT=30432 \\
+        python benchmarks/stats_rollup.py --sizes 10000 100000 300000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import psycopg2
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dags"))
+
+from dog_breeds.loader import load_breeds  # noqa: E402
+
+DB_CONFIG = {
+    'host': os.getenv('DOG_BREEDS_DB_HOST', 'localhost'),
+    'port': os.getenv('DOG_BREEDS_DB_PORT', '30432'),
+    'database': os.getenv('DOG_BREEDS_DB_NAME', 'dog_breeds_db'),
+    'user': os.getenv('DOG_BREEDS_DB_USER', 'airflow'),
+    'password': os.getenv('DOG_BREEDS_DB_PASSWORD', 'airflow'),
+}
+
+DAG_IDS = ('stats_benchmark_a', 'stats_benchmark_b')
+
+# The queries the stats endpoint ran before the rollup
+RECOUNT_ALL_SQL = """
+    SELECT COUNT(*), COUNT(DISTINCT breed_id), MAX(execution_date)
+    FROM breed_observations
+"""
+RECOUNT_DAG_SQL = """
+    SELECT COUNT(*), COUNT(DISTINCT o.breed_id), MAX(o.execution_date)
+    FROM breed_observations o
+    JOIN ingest_runs r ON r.id = o.ingest_run_id
+    WHERE r.dag_id = %s
+"""
+ROLLUP_SQL = "SELECT total_breeds, unique_breeds, latest_execution FROM breed_stats_rollup WHERE dag_id = %s"
+
+
+def run_records(run, breeds):
+    """One DAG run's worth of loader records; runs alternate between DAG_IDS"""
+    dag_id = DAG_IDS[run % len(DAG_IDS)]
+    run_id = f"stats_benchmark__{run}__{time.time_ns()}"
+    execution_date = datetime.now(timezone.utc) - timedelta(minutes=run)
+    for i in range(breeds):
+        yield {
+            'api_id': f"stats-benchmark-{i}",
+            'breed_name': f"Stats Benchmark Breed {i}",
+            'description': None,
+            'life_expectancy': None,
+            'life_min': None,
+            'life_max': None,
+            'dag_id': dag_id,
+            'dag_run_id': run_id,
+            'task_id': 'benchmark',
+            'execution_date': execution_date,
+            'asset_uri': None,
+            'full_data': {'id': str(i)},
+            'content_hash': f"{i:064x}",
+        }
+
+
+def median_ms(cursor, sql, params, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cursor.execute(sql, params)
+        cursor.fetchall()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 300000], help="observation rows added")
+    parser.add_argument('--breeds', type=int, default=300, help="breeds per run (rows per load)")
+    parser.add_argument('--repeat', type=int, default=20, help="timed reads per query and size")
+    parser.add_argument('--tolerance', type=float, default=3.0, help="max growth factor of the rollup read time")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    print(f"Database: {DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}")
+    print(f"{'rows':>8}  {'recount all':>12}  {'rollup all':>11}  {'recount dag':>12}  {'rollup dag':>11}")
+    rollup_timings = []
+    failures = []
+    try:
+        with conn.cursor() as cursor:
+            rows = run = 0
+            for size in sorted(args.sizes):
+                while rows < size:
+                    load_breeds(conn, run_records(run, args.breeds))
+                    rows += args.breeds
+                    run += 1
+                cursor.execute("ANALYZE breed_observations")
+
+                recount_all = median_ms(cursor, RECOUNT_ALL_SQL, None, args.repeat)
+                rollup_all = median_ms(cursor, ROLLUP_SQL, ('*',), args.repeat)
+                recount_dag = median_ms(cursor, RECOUNT_DAG_SQL, (DAG_IDS[0],), args.repeat)
+                rollup_dag = median_ms(cursor, ROLLUP_SQL, (DAG_IDS[0],), args.repeat)
+                rollup_timings.append(max(rollup_all, rollup_dag))
+                print(
+                    f"{rows:>8}  {recount_all:>10.2f}ms  {rollup_all:>9.2f}ms  "
+                    f"{recount_dag:>10.2f}ms  {rollup_dag:>9.2f}ms"
+                )
+
+                cursor.execute("SELECT dag_id FROM breed_stats_rollup_drift()")
+                drifted = [row[0] for row in cursor.fetchall()]
+                if drifted:
+                    failures.append(f"rollup drifted at {rows} rows for {', '.join(drifted)}")
+    finally:
+        conn.rollback()
+        conn.close()
+
+    # Sub-millisecond reads are dominated by round-trip jitter, hence the floor
+    baseline = max(rollup_timings[0], 0.5)
+    if rollup_timings[-1] > baseline * args.tolerance:
+        failures.append(f"rollup read grew from {rollup_timings[0]:.2f}ms to {rollup_timings[-1]:.2f}ms")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: rollup matches a recount and its read time stays flat")
+
+
+if __name__ == "__main__":
+    main()
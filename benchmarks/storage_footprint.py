@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Compare storage per DAG run: original dog_breeds table vs. normalized tables
+
+Loads the same catalog for --runs DAG runs into the original denormalized
+layout (a full copy of every breed per run) and through the bulk loader into
+breeds + ingest_runs + breed_observations, then reports table + index size per run.
+Runs inside a transaction that is rolled back; the legacy layout is created
+as a temporary table, so nothing is left behind.
+
+Usage:
+    DOG_BREEDS_DB_HOST=localhost DOG_BREEDS_DB_PORT=30432 \\
+        python benchmarks/storage_footprint.py --breeds 300 --runs 50
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dags"))
+
+from dog_breeds.breeds import build_breed_record  # noqa: E402
+from dog_breeds.loader import load_breeds  # noqa: E402
+
+DB_CONFIG = {
+    'host': os.getenv('DOG_BREEDS_DB_HOST', 'localhost'),
+    'port': os.getenv('DOG_BREEDS_DB_PORT', '30432'),
+    'database': os.getenv('DOG_BREEDS_DB_NAME', 'dog_breeds_db'),
+    'user': os.getenv('DOG_BREEDS_DB_USER', 'airflow'),
+    'password': os.getenv('DOG_BREEDS_DB_PASSWORD', 'airflow'),
+}
+
+# The original one-row-per-breed-per-run table with its indexes
+LEGACY_DDL = """
+    CREATE TEMP TABLE legacy_dog_breeds (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        breed_name VARCHAR(255) NOT NULL,
+        description TEXT,
+        life_expectancy VARCHAR(100),
+        life_min INTEGER,
+        life_max INTEGER,
+        dag_id VARCHAR(255) NOT NULL,
+        dag_run_id VARCHAR(255) NOT NULL,
+        task_id VARCHAR(255) NOT NULL,
+        execution_date TIMESTAMP WITH TIME ZONE NOT NULL,
+        asset_uri VARCHAR(500),
+        full_data JSONB,
+        content_hash VARCHAR(64),
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (dag_run_id, breed_name)
+    ) ON COMMIT DROP;
+    CREATE INDEX ON legacy_dog_breeds(dag_id);
+    CREATE INDEX ON legacy_dog_breeds(execution_date DESC);
+    CREATE INDEX ON legacy_dog_breeds(breed_name);
+    CREATE INDEX ON legacy_dog_breeds(created_at DESC);
+    CREATE INDEX ON legacy_dog_breeds(asset_uri) WHERE asset_uri IS NOT NULL;
+"""
+
+LEGACY_COLUMNS = (
+    'breed_name', 'description', 'life_expectancy', 'life_min', 'life_max', 'dag_id',
+    'dag_run_id', 'task_id', 'execution_date', 'asset_uri', 'full_data', 'content_hash',
+)
+
+# Summed over the partitions of a partitioned table, which has no storage itself
+SIZE_SQL = """
+    SELECT COALESCE(SUM(pg_total_relation_size(relid)), pg_total_relation_size(%(table)s::regclass))
+    FROM pg_partition_tree(%(table)s::regclass)
+"""
+
+
+def api_breed(i):
+    """A breed object shaped like a dogapi.dog v2 breed"""
+    return {
+        'id': f"{i:08x}-5f3c-4a6b-9e1d-{i:012x}",
+        'type': 'breed',
+        'attributes': {
+            'name': f"Storage Breed {i}",
+            'description': (
+                "A medium-sized working dog with a dense double coat, known for its loyalty, "
+                "intelligence and endurance. Originally bred for herding and guarding livestock, "
+                "it needs daily exercise and consistent training, and it does well with active families. "
+            ),
+            'life': {'max': 14, 'min': 12},
+            'male_weight': {'max': 30, 'min': 25},
+            'female_weight': {'max': 25, 'min': 20},
+            'hypoallergenic': i % 3 == 0,
+        },
+        'relationships': {'group': {'data': {'id': 'f56dc4b1-ba1a-4454-8ce2-bd5d41404a0c', 'type': 'group'}}},
+    }
+
+
+def run_metadata(run):
+    run_id = f"scheduled__2024-01-01T{run:02d}:00:00+00:00"
+    return {
+        'dag_id': 'dog_breed_fetcher',
+        'dag_run_id': run_id,
+        'task_id': 'fetch_dog_breed',
+        'execution_date': datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(hours=run),
+        'asset_uri': f"dog_breed://dog_breed_fetcher/{run_id}",
+    }
+
+
+def legacy_row(record):
+    """Row as the DAG stored it before normalization: full_data carried the run metadata"""
+    full_data = {
+        **record['full_data'],
+        'asset_uri': record['asset_uri'],
+        'airflow_metadata': {
+            'dag_id': record['dag_id'],
+            'dag_run_id': record['dag_run_id'],
+            'task_id': record['task_id'],
+            'execution_date': record['execution_date'].isoformat(),
+        },
+    }
+    return tuple(json.dumps(full_data) if column == 'full_data' else record[column] for column in LEGACY_COLUMNS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--breeds', type=int, default=300, help="breeds per run (the catalog size)")
+    parser.add_argument('--runs', type=int, default=50)
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(SIZE_SQL, {'table': 'breeds'})
+            breeds_before = cursor.fetchone()[0]
+            cursor.execute(SIZE_SQL, {'table': 'ingest_runs'})
+            runs_before = cursor.fetchone()[0]
+            cursor.execute(SIZE_SQL, {'table': 'breed_observations'})
+            observations_before = cursor.fetchone()[0]
+            cursor.execute(LEGACY_DDL)
+
+            catalog = [api_breed(i) for i in range(args.breeds)]
+            for run in range(args.runs):
+                records = [build_breed_record(breed, run_metadata(run)) for breed in catalog]
+                execute_values(
+                    cursor,
+                    f"INSERT INTO legacy_dog_breeds ({', '.join(LEGACY_COLUMNS)}) VALUES %s",
+                    [legacy_row(record) for record in records],
+                )
+                load_breeds(conn, records)
+
+            cursor.execute(SIZE_SQL, {'table': 'legacy_dog_breeds'})
+            legacy_bytes = cursor.fetchone()[0]
+            cursor.execute(SIZE_SQL, {'table': 'breeds'})
+            breeds_bytes = cursor.fetchone()[0] - breeds_before
+            cursor.execute(SIZE_SQL, {'table': 'ingest_runs'})
+            per_run_bytes = cursor.fetchone()[0] - runs_before
+            cursor.execute(SIZE_SQL, {'table': 'breed_observations'})
+            per_run_bytes += cursor.fetchone()[0] - observations_before
+    finally:
+        conn.rollback()
+        conn.close()
+
+    normalized_bytes = breeds_bytes + per_run_bytes
+    print(f"{args.runs} runs x {args.breeds} breeds (table + indexes)")
+    print(f"  dog_breeds (original):  {legacy_bytes / 1024:>10,.0f} KB  {legacy_bytes / args.runs / 1024:>8,.1f} KB/run")
+    print(f"  breeds:                 {breeds_bytes / 1024:>10,.0f} KB  (written once)")
+    print(f"  runs + observations:    {per_run_bytes / 1024:>10,.0f} KB  {per_run_bytes / args.runs / 1024:>8,.1f} KB/run")
+    print(f"  per-run reduction:      {legacy_bytes / max(per_run_bytes, 1):.1f}x, overall {legacy_bytes / max(normalized_bytes, 1):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Prove that streaming JSON parsing keeps peak memory flat
+
+Generates breeds documents of increasing size as a lazy stream of byte
+chunks (the document is never held in memory as a whole) and measures the
+tracemalloc peak while StreamingJsonArray consumes them. For comparison it
+also measures json.loads on the materialized document. Exits non-zero if
+the streaming peak exceeds --limit-kb or grows with the payload size.
+
+Usage:
+    python benchmarks/streaming_parse.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dags"))
+
+from dog_breeds.streaming_json import READ_CHUNK_BYTES, StreamingJsonArray  # noqa: E402
+
+
+def breed(i):
+    return {
+        'id': f"{i:08d}-0000-0000-0000-000000000000",
+        'type': 'breed',
+        'attributes': {
+            'name': f"Breed {i}",
+            'description': "A synthetic breed used to measure parser memory. " * 4,
+            'life': {'min': 10, 'max': 14},
+            'hypoallergenic': i % 2 == 0,
+        },
+    }
+
+
+def iter_document_chunks(count, chunk_size=READ_CHUNK_BYTES):
+    """Yield a dogapi-style breeds document in byte chunks without building it"""
+    pending = b'{"data":['
+    for i in range(count):
+        pending += (b',' if i else b'') + json.dumps(breed(i)).encode('utf-8')
+        while len(pending) >= chunk_size:
+            yield pending[:chunk_size]
+            pending = pending[chunk_size:]
+    pending += b'],"meta":{"pagination":{"current":1,"last":1}},"links":{"next":null}}'
+    while pending:
+        yield pending[:chunk_size]
+        pending = pending[chunk_size:]
+
+
+def measure(fn):
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def stream_count(count):
+    parser = StreamingJsonArray(iter_document_chunks(count))
+    parsed = sum(1 for _ in parser)
+    assert parser.metadata['links'] == {'next': None}
+    return parsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--limit-kb', type=int, default=1024, help="max allowed streaming peak")
+    parser.add_argument('--skip-json-loads', action='store_true', help="skip the json.loads comparison")
+    args = parser.parse_args()
+
+    print(f"{'breeds':>8}  {'payload':>10}  {'stream peak':>12}  {'json.loads peak':>16}")
+    stream_peaks = []
+    for size in args.sizes:
+        parsed, stream_peak = measure(lambda: stream_count(size))
+        assert parsed == size, f"parsed {parsed} of {size} breeds"
+        stream_peaks.append(stream_peak)
+
+        payload = b''.join(iter_document_chunks(size))
+        loads_column = '-'
+        if not args.skip_json_loads:
+            _, loads_peak = measure(lambda payload=payload: len(json.loads(payload)['data']))
+            loads_column = f"{loads_peak / 1024:,.0f} KB"
+        print(f"{size:>8}  {len(payload) / 1024:>7,.0f} KB  {stream_peak / 1024:>9,.0f} KB  {loads_column:>16}")
+        del payload
+
+    failures = []
+    if max(stream_peaks) > args.limit_kb * 1024:
+        failures.append(f"streaming peak {max(stream_peaks) / 1024:,.0f} KB exceeds {args.limit_kb} KB")
+    # Flat means the largest payload may not need noticeably more memory than the smallest;
+    # payloads below a few read chunks never fill the buffer, so use that as the floor
+    baseline = max(min(stream_peaks), 4 * READ_CHUNK_BYTES)
+    if max(stream_peaks) > 2 * baseline:
+        failures.append("streaming peak grows with payload size")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: streaming parser memory is bounded and independent of payload size")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,44 +2,36 @@
 Airflow DAG to fetch a random dog breed from the Dog API
 API Documentation: https://dogapi.dog/docs/api-v2
 Stores breed data in external PostgreSQL database
+
+Ingest modes (set via the `ingest_mode` DAG param):
+- random: pick one random breed from the first page (default)
+- full_catalog: follow the API pagination links and load every breed
+
+In random mode the fetch is deferred: the API request runs in the Airflow
+triggerer and the task only occupies a worker to transform and load
 """
 
 from datetime import datetime, timedelta
 from airflow import DAG
 from airflow.providers.standard.operators.python import PythonOperator
-from airflow.sdk import Asset
-from airflow.utils.log.logging_mixin import LoggingMixin
-import requests
+from airflow.sdk import Asset, Param
 import json
 import random
 import logging
-import psycopg2
-from psycopg2.extras import RealDictCursor
-import os
+import time
+
+# Only lightweight modules are imported at parse time; the scheduler re-parses
+# this file continuously, so requests/psycopg2/httpx are imported inside the
+# task callables (see benchmarks/dag_parse.py)
+from dog_breeds.breeds import BREEDS_API_URL
+from dog_breeds.operators import DeferrableApiFetchOperator
 
 # Set up logging - use Airflow's task logger for better UI compatibility
 # Note: In Airflow tasks, we'll get the logger from the context
 logger = logging.getLogger(__name__)
 
-# Database connection configuration
-# In Kubernetes, this will connect to the dog-breeds-db service
-DB_CONFIG = {
-    'host': os.getenv('DOG_BREEDS_DB_HOST', 'dog-breeds-db.dog-breeds.svc.cluster.local'),
-    'port': os.getenv('DOG_BREEDS_DB_PORT', '5432'),
-    'database': os.getenv('DOG_BREEDS_DB_NAME', 'dog_breeds_db'),
-    'user': os.getenv('DOG_BREEDS_DB_USER', 'airflow'),
-    'password': os.getenv('DOG_BREEDS_DB_PASSWORD', 'airflow'),
-}
-
-def get_db_connection():
-    """Create and return a database connection"""
-    try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        logger.info(f"✅ Connected to database: {DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}")
-        return conn
-    except Exception as e:
-        logger.error(f"❌ Failed to connect to database: {e}")
-        raise
+INGEST_MODE_RANDOM = 'random'
+INGEST_MODE_FULL_CATALOG = 'full_catalog'
 
 # Default arguments for the DAG
 default_args = {
@@ -60,73 +52,101 @@ dag = DAG(
     start_date=datetime(2024, 1, 1),
     catchup=False,
     tags=['dog', 'api', 'example'],
+    params={
+        'ingest_mode': Param(
+            INGEST_MODE_RANDOM,
+            type='string',
+            enum=[INGEST_MODE_RANDOM, INGEST_MODE_FULL_CATALOG],
+            description='random: store one random breed per run; full_catalog: store every breed from all API pages',
+        ),
+        'streaming': Param(
+            False,
+            type='boolean',
+            description='Parse API responses incrementally and stream breeds into the loader (flat memory use)',
+        ),
+        'deferrable': Param(
+            True,
+            type='boolean',
+            description='random mode: wait for the Dog API in the triggerer instead of holding a worker slot',
+        ),
+        'fetch_concurrency': Param(
+            1,
+            type='integer',
+            minimum=1,
+            maximum=32,
+            description='full_catalog only: number of API pages fetched concurrently (1 = sequential with HTTP cache)',
+        ),
+    },
 )
 
-def fetch_random_dog_breed(**context):
+def fetch_random_dog_breed(document=None, fetch_stats=None, **context):
     """
     Fetch a random dog breed from the Dog API and store it in the database
     API: https://dogapi.dog/docs/api-v2
+    
+    When the fetch was deferred to the triggerer, the API `document` and its
+    `fetch_stats` are passed in and only the transform and load run here
     """
+    import requests
+    
+    from dog_breeds.breeds import build_breed_record, extract_breed_info, extract_breeds, get_run_metadata
+    from dog_breeds.db import DB_CONFIG, get_db_connection
+    from dog_breeds.http_cache import HttpCache
+    from dog_breeds.http_client import get_session
+    from dog_breeds.loader import load_breeds
+    from dog_breeds.spool import WriteBehindSpool, flush_spool
+    from dog_breeds.streaming_json import StreamingJsonArray
+    
     # Get Airflow task logger for better log visibility
     task_logger = logging.getLogger("airflow.task")
     
     try:
         # Dog API endpoint for breeds
-        api_url = "https://dogapi.dog/api/v2/breeds"
-        
-        logger.info(f"Fetching dog breeds from: {api_url}")
+        api_url = BREEDS_API_URL
         
-        # Make GET request to the API
-        response = requests.get(api_url, timeout=10)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        
-        # Parse JSON response
-        data = response.json()
-        
-        # The API returns a structure with 'data' containing breeds
-        if isinstance(data, dict) and 'data' in data:
-            breeds = data['data']
-        elif isinstance(data, list):
-            breeds = data
+        if document is not None:
+            # Already fetched by the triggerer (DeferrableApiFetchOperator)
+            logger.info(f"Using dog breeds fetched by the triggerer from: {api_url}")
+            data = document
+            breeds = extract_breeds(data)
         else:
-            breeds = [data]
+            logger.info(f"Fetching dog breeds from: {api_url}")
+            
+            # Make GET request to the API through the shared pooled/retrying session,
+            # revalidating the on-disk cached copy
+            session = get_session()
+            session.latency.reset()
+            http_cache = HttpCache(session=session)
+            
+            if context.get('params', {}).get('streaming'):
+                # Reservoir sampling over the streamed breeds: uniform pick without
+                # holding the decoded document in memory
+                data = None
+                breeds = []
+                for seen, breed in enumerate(StreamingJsonArray(http_cache.iter_chunks(api_url)), start=1):
+                    if random.randrange(seen) == 0:
+                        breeds = [breed]
+            else:
+                data = http_cache.get_json(api_url)
+                breeds = extract_breeds(data)
+            
+            fetch_stats = {
+                'http_cache': http_cache.stats.as_dict(),
+                'http_requests': session.latency.summary(),
+            }
         
         if breeds and len(breeds) > 0:
             # Pick a random breed from the list
             random_breed = random.choice(breeds)
             
             # Extract breed information (structure may vary)
-            breed_info = {}
-            
-            # Handle different possible response structures
-            if isinstance(random_breed, dict):
-                if 'attributes' in random_breed:
-                    attrs = random_breed['attributes']
-                    breed_info = {
-                        'breed_name': attrs.get('name', 'Unknown'),
-                        'description': attrs.get('description', 'No description available'),
-                        'life_min': attrs.get('life', {}).get('min', None) if isinstance(attrs.get('life'), dict) else None,
-                        'life_max': attrs.get('life', {}).get('max', None) if isinstance(attrs.get('life'), dict) else None,
-                    }
-                else:
-                    # Direct attributes
-                    breed_info = {
-                        'breed_name': random_breed.get('name', random_breed.get('breed', 'Unknown')),
-                        'description': random_breed.get('description', 'No description available'),
-                        'life_min': random_breed.get('life_min', None),
-                        'life_max': random_breed.get('life_max', None),
-                    }
+            breed_info = extract_breed_info(random_breed)
             
-            breed_name = breed_info.get('breed_name', 'Unknown')
-            description = breed_info.get('description', 'No description available')
-            life_min = breed_info.get('life_min')
-            life_max = breed_info.get('life_max')
-            
-            # Format life expectancy string
-            if life_min and life_max:
-                life_expectancy = f"{life_min}-{life_max} years"
-            else:
-                life_expectancy = 'N/A'
+            breed_name = breed_info['breed_name']
+            description = breed_info['description']
+            life_min = breed_info['life_min']
+            life_max = breed_info['life_max']
+            life_expectancy = breed_info['life_expectancy']
             
             result = {
                 'breed_name': breed_name,
@@ -134,7 +154,8 @@ def fetch_random_dog_breed(**context):
                 'life_expectancy': life_expectancy,
                 'life_min': life_min,
                 'life_max': life_max,
-                'full_data': random_breed
+                'full_data': random_breed,
+                **fetch_stats,
             }
             
             logger.info(f"🐶 Random Dog Breed: {breed_name}")
@@ -146,88 +167,52 @@ def fetch_random_dog_breed(**context):
             logger.info("=" * 80)
             logger.info("STARTING DATABASE INSERT OPERATION")
             logger.info("=" * 80)
+            run_metadata = get_run_metadata(context)
+            asset_uri = run_metadata['asset_uri']
+            record = build_breed_record(random_breed, run_metadata)
+            spool = WriteBehindSpool()
+            conn = None
             try:
                 logger.info(f"Attempting to connect to database...")
                 logger.info(f"DB Config: host={DB_CONFIG['host']}, port={DB_CONFIG['port']}, db={DB_CONFIG['database']}, user={DB_CONFIG['user']}")
                 
                 conn = get_db_connection()
-                cursor = conn.cursor()
-                
-                # Get DAG run context
-                dag_run = context['dag_run']
-                ti = context['ti']
-                
-                # Handle execution_date - use logical_date or current time if None
-                execution_date = context.get('execution_date') or context.get('logical_date') or dag_run.logical_date or datetime.utcnow()
-                if execution_date and isinstance(execution_date, str):
-                    execution_date = datetime.fromisoformat(execution_date.replace('Z', '+00:00'))
                 
-                logger.info(f"Inserting breed: {breed_name} for DAG run: {dag_run.run_id}")
-                logger.info(f"Execution date: {execution_date}")
-                logger.info(f"DAG ID: {ti.dag_id}, Task ID: {ti.task_id}")
+                # Replay records earlier runs could not write before this run's own write
+                spool_stats = flush_spool(conn, spool)
+                if spool_stats:
+                    result['spool_flushed'] = spool_stats['rows_staged']
+                    result['spool_failed'] = spool_stats['rows_failed']
+                    result['spool_quarantined'] = spool_stats['rows_quarantined']
                 
-                # Generate asset URI before insert
-                asset_uri = f"dog_breed://{ti.dag_id}/{dag_run.run_id}"
+                logger.info(f"Inserting breed: {breed_name} for DAG run: {run_metadata['dag_run_id']}")
+                logger.info(f"Execution date: {run_metadata['execution_date']}")
+                logger.info(f"DAG ID: {run_metadata['dag_id']}, Task ID: {run_metadata['task_id']}")
                 
-                # Prepare full_data with asset information
-                full_data_with_asset = random_breed.copy() if isinstance(random_breed, dict) else {}
-                full_data_with_asset['asset_uri'] = asset_uri
-                full_data_with_asset['airflow_metadata'] = {
-                    'dag_id': ti.dag_id,
-                    'dag_run_id': dag_run.run_id,
-                    'task_id': ti.task_id,
-                    'execution_date': execution_date.isoformat() if hasattr(execution_date, 'isoformat') else str(execution_date)
-                }
+                # Same write path as the full catalog: staged COPY + content-hash aware merge
+                load_stats = load_breeds(conn, [record])
                 
-                insert_query = """
-                    INSERT INTO dog_breeds (
-                        breed_name, description, life_expectancy, life_min, life_max,
-                        dag_id, dag_run_id, task_id, execution_date, asset_uri, full_data
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        """
+                        SELECT o.id FROM breed_observations o
+                        JOIN ingest_runs r ON r.id = o.ingest_run_id
+                        JOIN breeds b ON b.id = o.breed_id
+                        WHERE r.dag_run_id = %s AND b.api_id = %s
+                        """,
+                        (run_metadata['dag_run_id'], record['api_id'])
                     )
-                    ON CONFLICT (dag_run_id, breed_name) 
-                    DO UPDATE SET
-                        description = EXCLUDED.description,
-                        life_expectancy = EXCLUDED.life_expectancy,
-                        life_min = EXCLUDED.life_min,
-                        life_max = EXCLUDED.life_max,
-                        asset_uri = EXCLUDED.asset_uri,
-                        full_data = EXCLUDED.full_data,
-                        updated_at = CURRENT_TIMESTAMP
-                    RETURNING id;
-                """
-                
-                logger.info(f"Executing INSERT query with values:")
-                logger.info(f"  breed_name={breed_name}")
-                logger.info(f"  dag_id={ti.dag_id}")
-                logger.info(f"  dag_run_id={dag_run.run_id}")
-                logger.info(f"  task_id={ti.task_id}")
-                logger.info(f"  execution_date={execution_date}")
-                
-                cursor.execute(insert_query, (
-                    breed_name,
-                    description,
-                    life_expectancy,
-                    life_min,
-                    life_max,
-                    ti.dag_id,
-                    dag_run.run_id,
-                    ti.task_id,
-                    execution_date,
-                    asset_uri,
-                    json.dumps(full_data_with_asset)
-                ))
-                
-                breed_id = cursor.fetchone()[0]
+                    breed_id = cursor.fetchone()[0]
                 conn.commit()
                 
                 logger.info("=" * 80)
                 logger.info(f"✅ SUCCESSFULLY STORED BREED IN DATABASE!")
                 logger.info(f"   Breed ID: {breed_id}")
+                logger.info(f"   Observations Recorded: {load_stats['rows_inserted']}")
+                logger.info(f"   Breeds Inserted/Updated/Skipped: {load_stats['breeds_inserted']}/{load_stats['breeds_updated']}/{load_stats['breeds_skipped']}")
                 logger.info(f"   Asset URI: {asset_uri}")
                 logger.info(f"   Database: {DB_CONFIG['host']}/{DB_CONFIG['database']}")
-                logger.info(f"   Table: dog_breeds")
+                logger.info("   Tables: breeds, ingest_runs, breed_observations")
                 logger.info("=" * 80)
                 
                 # Store breed_id and asset info in result for asset event
@@ -237,11 +222,14 @@ def fetch_random_dog_breed(**context):
                 result['database_connection'] = {
                     'host': DB_CONFIG['host'],
                     'database': DB_CONFIG['database'],
-                    'table': 'dog_breeds',
+                    'table': 'breed_observations',
                     'record_id': str(breed_id)
                 }
+                result['observations_recorded'] = load_stats['rows_inserted']
+                result['breeds_inserted'] = load_stats['breeds_inserted']
+                result['breeds_updated'] = load_stats['breeds_updated']
+                result['breeds_skipped'] = load_stats['breeds_skipped']
                 
-                cursor.close()
                 conn.close()
                 
             except Exception as db_error:
@@ -251,7 +239,15 @@ def fetch_random_dog_breed(**context):
                 logger.error("=" * 80)
                 import traceback
                 logger.error(traceback.format_exc())
-                # Continue even if database write fails
+                if conn is not None:
+                    conn.close()
+                # Continue even if database write fails: the record is kept in the
+                # local spool and written by the next run
+                try:
+                    spool.append([record], error=db_error)
+                    result['spooled'] = True
+                except Exception as spool_error:
+                    logger.error(f"❌ Failed to spool breed record, it will not be retried: {spool_error}")
             
             # Log the full breed data (can be viewed in Airflow UI)
             logger.debug(f"Full breed data:\n{json.dumps(random_breed, indent=2)}")
@@ -272,7 +268,8 @@ def fetch_random_dog_breed(**context):
             return result
         else:
             logger.warning("No breeds found in API response")
-            logger.debug(f"Response data: {json.dumps(data, indent=2)}")
+            if data is not None:
+                logger.debug(f"Response data: {json.dumps(data, indent=2)}")
             return None
             
     except requests.exceptions.RequestException as e:
@@ -286,6 +283,154 @@ def fetch_random_dog_breed(**context):
         logger.error(traceback.format_exc())
         raise
 
+def fetch_all_dog_breeds(**context):
+    """
+    Fetch the full breed catalog (all API pages) and store every breed
+    in the database in a single transaction
+    
+    With fetch_concurrency > 1 the pages are fetched concurrently and the
+    records are streamed into the bulk loader as pages arrive; otherwise
+    pages are fetched sequentially through the HTTP cache, and with
+    streaming enabled each page is parsed incrementally into the loader
+    """
+    from dog_breeds.async_fetcher import ConcurrentPageFetcher
+    from dog_breeds.breeds import MAX_CATALOG_PAGES, StreamingBreedCatalog, build_breed_record, fetch_breed_catalog, get_run_metadata
+    from dog_breeds.db import get_db_connection
+    from dog_breeds.http_cache import HttpCache
+    from dog_breeds.http_client import get_session
+    from dog_breeds.loader import load_breeds
+    from dog_breeds.spool import flush_spool
+    
+    start_time = time.monotonic()
+    fetch_concurrency = int(context.get('params', {}).get('fetch_concurrency', 1))
+    streaming = bool(context.get('params', {}).get('streaming', False))
+    run_metadata = get_run_metadata(context)
+    
+    conn = get_db_connection()
+    try:
+        # Replay records earlier runs could not write (committed on its own;
+        # a failed flush is logged and does not stop the catalog load)
+        spool_stats = flush_spool(conn)
+        
+        if fetch_concurrency > 1:
+            fetcher = ConcurrentPageFetcher(BREEDS_API_URL, concurrency=fetch_concurrency, max_pages=MAX_CATALOG_PAGES)
+            records = (build_breed_record(breed, run_metadata) for breed in fetcher.iter_records())
+            # COPY into a staging table + one set-based merge, committed as one transaction
+            load_stats = load_breeds(conn, records)
+            fetch_stats = fetcher.stats()
+        elif streaming:
+            session = get_session()
+            session.latency.reset()
+            http_cache = HttpCache(session=session)
+            catalog = StreamingBreedCatalog(http_cache)
+            load_stats = load_breeds(conn, (build_breed_record(breed, run_metadata) for breed in catalog))
+            fetch_stats = {
+                'pages_fetched': catalog.pages_fetched,
+                'records_fetched': catalog.breeds_fetched,
+                'concurrency': 1,
+                'streaming': True,
+                'http_cache': http_cache.stats.as_dict(),
+                'http_requests': session.latency.summary(),
+            }
+        else:
+            session = get_session()
+            session.latency.reset()
+            http_cache = HttpCache(session=session)
+            breeds, pages_fetched = fetch_breed_catalog(http_cache)
+            logger.info(f"Fetched {len(breeds)} breeds from {pages_fetched} pages in {time.monotonic() - start_time:.2f}s")
+            load_stats = load_breeds(conn, (build_breed_record(breed, run_metadata) for breed in breeds))
+            fetch_stats = {
+                'pages_fetched': pages_fetched,
+                'records_fetched': len(breeds),
+                'concurrency': 1,
+                'http_cache': http_cache.stats.as_dict(),
+                'http_requests': session.latency.summary(),
+            }
+        
+        if load_stats['rows_staged'] == 0:
+            conn.rollback()
+            logger.warning("No breeds found in API response")
+            return None
+        conn.commit()
+    except Exception as db_error:
+        conn.rollback()
+        logger.error(f"❌ Failed to store breed catalog, transaction rolled back: {db_error}")
+        raise
+    finally:
+        conn.close()
+    
+    rows_written = load_stats['rows_merged']
+    elapsed_seconds = time.monotonic() - start_time
+    
+    logger.info("=" * 80)
+    logger.info("✅ SUCCESSFULLY STORED BREED CATALOG IN DATABASE!")
+    logger.info(f"   Breeds written: {rows_written}")
+    logger.info(f"   Observations Recorded: {load_stats['rows_inserted']}")
+    logger.info(f"   Breeds Inserted/Updated/Skipped: {load_stats['breeds_inserted']}/{load_stats['breeds_updated']}/{load_stats['breeds_skipped']}")
+    logger.info(f"   Pages fetched: {fetch_stats['pages_fetched']} (concurrency {fetch_stats['concurrency']})")
+    logger.info(f"   Elapsed: {elapsed_seconds:.2f}s")
+    logger.info(f"   HTTP requests: {fetch_stats['http_requests']}")
+    if 'http_cache' in fetch_stats:
+        logger.info(f"   HTTP cache: {fetch_stats['http_cache']}")
+    logger.info(f"   Asset URI: {run_metadata['asset_uri']}")
+    logger.info("=" * 80)
+    
+    return {
+        'ingest_mode': INGEST_MODE_FULL_CATALOG,
+        'breeds_fetched': fetch_stats['records_fetched'],
+        'rows_written': rows_written,
+        'observations_recorded': load_stats['rows_inserted'],
+        'breeds_inserted': load_stats['breeds_inserted'],
+        'breeds_updated': load_stats['breeds_updated'],
+        'breeds_skipped': load_stats['breeds_skipped'],
+        'load_seconds': load_stats['elapsed_seconds'],
+        'elapsed_seconds': round(elapsed_seconds, 3),
+        'asset_uri': run_metadata['asset_uri'],
+        'spool_flushed': spool_stats['rows_staged'] if spool_stats else 0,
+        'spool_failed': spool_stats['rows_failed'] if spool_stats else 0,
+        'spool_quarantined': spool_stats['rows_quarantined'] if spool_stats else 0,
+        **fetch_stats,
+    }
+
+def fetch_dog_breeds(**context):
+    """Dispatch to the ingest function selected by the `ingest_mode` DAG param"""
+    ingest_mode = context.get('params', {}).get('ingest_mode', INGEST_MODE_RANDOM)
+    logger.info(f"Ingest mode: {ingest_mode}")
+    
+    if ingest_mode == INGEST_MODE_FULL_CATALOG:
+        result = fetch_all_dog_breeds(**context)
+    else:
+        result = fetch_random_dog_breed(**context)
+    
+    # Database details are attached to the asset event at run time rather than
+    # to the Asset definition, so parsing this file never reads DB settings
+    outlet_events = context.get('outlet_events')
+    if result and outlet_events is not None:
+        from dog_breeds.db import DB_CONFIG
+        outlet_events[dog_breed_asset].extra = {
+            'asset_uri': result.get('asset_uri'),
+            'database': {
+                'host': DB_CONFIG['host'],
+                'port': DB_CONFIG['port'],
+                'database': DB_CONFIG['database'],
+                'table': 'breed_observations',
+                'connection_string': f"postgresql://{DB_CONFIG['user']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}",
+            },
+        }
+    return result
+
+def should_defer_fetch(context):
+    """
+    Only the single-page random mode hands its API wait to the triggerer;
+    full catalog and streaming runs fetch on the worker
+    """
+    params = context.get('params', {})
+    return (
+        params.get('deferrable', True)
+        and params.get('ingest_mode', INGEST_MODE_RANDOM) == INGEST_MODE_RANDOM
+        and not params.get('streaming', False)
+    )
+
 def print_breed_summary(**context):
     """
     Print a summary of the fetched breed
@@ -298,7 +443,31 @@ def print_breed_summary(**context):
     # Get the result from the previous task via XCom
     breed_data = ti.xcom_pull(task_ids='fetch_dog_breed', key='return_value')
     
-    if breed_data:
+    if breed_data and breed_data.get('ingest_mode') == INGEST_MODE_FULL_CATALOG:
+        output_lines = [
+            "=" * 70,
+            "BREED SUMMARY - FULL CATALOG INGEST",
+            "=" * 70,
+            f"Breeds Written: {breed_data.get('rows_written', 0)}",
+            f"Observations Recorded: {breed_data.get('observations_recorded', 0)}",
+            f"Breeds Inserted/Updated/Skipped: {breed_data.get('breeds_inserted', 0)}/{breed_data.get('breeds_updated', 0)}/{breed_data.get('breeds_skipped', 0)}",
+            f"Pages Fetched: {breed_data.get('pages_fetched', 0)}",
+            f"Elapsed: {breed_data.get('elapsed_seconds', 0)}s",
+            "=" * 70,
+        ]
+        for line in output_lines:
+            logger.info(f"BREED_SUMMARY: {line}")
+        
+        ti.xcom_push(key='breed_summary', value={
+            'rows_written': breed_data.get('rows_written', 0),
+            'breeds_inserted': breed_data.get('breeds_inserted', 0),
+            'breeds_updated': breed_data.get('breeds_updated', 0),
+            'breeds_skipped': breed_data.get('breeds_skipped', 0),
+            'pages_fetched': breed_data.get('pages_fetched', 0),
+            'elapsed_seconds': breed_data.get('elapsed_seconds', 0),
+            'message': f"Loaded {breed_data.get('rows_written', 0)} breeds from {breed_data.get('pages_fetched', 0)} pages"
+        })
+    elif breed_data:
         breed_name = breed_data.get('breed_name', 'Unknown')
         life_span = breed_data.get('life_expectancy', 'N/A')
         description = breed_data.get('description', 'No description available')
@@ -312,6 +481,7 @@ def print_breed_summary(**context):
             f"Breed Name: {breed_name}",
             f"Life Span: {life_span}",
             f"Description: {description}",
+            f"Breed Inserted/Updated/Skipped: {breed_data.get('breeds_inserted', 0)}/{breed_data.get('breeds_updated', 0)}/{breed_data.get('breeds_skipped', 0)}",
             "=" * 70,
             "Successfully retrieved random dog breed information!",
             "=" * 70,
@@ -348,13 +518,11 @@ dog_breed_asset = Asset(
     extra={
         'description': 'Random dog breed fetched from Dog API and stored in PostgreSQL database',
         'source': 'https://dogapi.dog/api/v2/breeds',
+        # Host/port/connection string are added to each asset event by fetch_dog_breeds
         'database': {
-            'host': DB_CONFIG.get('host', 'dog-breeds-db.dog-breeds.svc.cluster.local'),
-            'port': DB_CONFIG.get('port', '5432'),
-            'database': DB_CONFIG.get('database', 'dog_breeds_db'),
-            'table': 'dog_breeds',
+            'table': 'breed_observations',
+            'catalog_table': 'breeds',
             'schema': 'public',
-            'connection_string': f"postgresql://{DB_CONFIG.get('user', 'airflow')}@{DB_CONFIG.get('host', 'dog-breeds-db.dog-breeds.svc.cluster.local')}:{DB_CONFIG.get('port', '5432')}/{DB_CONFIG.get('database', 'dog_breeds_db')}"
         },
         'metadata': {
             'storage_type': 'postgresql',
@@ -366,9 +534,14 @@ dog_breed_asset = Asset(
 )
 
 # Define tasks
-fetch_task = PythonOperator(
+# Deferrable: the Dog API request runs in the triggerer, so a slow upstream
+# does not hold a worker slot; the task resumes on a worker to transform and load
+fetch_task = DeferrableApiFetchOperator(
     task_id='fetch_dog_breed',
-    python_callable=fetch_random_dog_breed,
+    api_url=BREEDS_API_URL,
+    python_callable=fetch_dog_breeds,
+    should_defer=should_defer_fetch,
+    deferrable=True,
     outlets=[dog_breed_asset],  # This task produces the asset
     dag=dag,
 )
@@ -0,0 +1,113 @@
+"""
+Airflow DAG for columnar exports of the breed history
+Reads the breed history from the external PostgreSQL database and writes it to object storage
+
+export_breed_history writes the dog_breeds rows of the last `history_days`
+days before the end of the data interval to a Parquet file (or an Arrow IPC
+stream) under DOG_BREEDS_EXPORT_PATH, for analytics jobs that would
+otherwise page through the API's JSON
+"""
+
+from datetime import datetime, timedelta, timezone
+from airflow import DAG
+from airflow.providers.standard.operators.python import PythonOperator
+from airflow.sdk import Param
+import logging
+
+# pyarrow and psycopg2 are imported inside the task callable to keep parsing cheap
+
+logger = logging.getLogger(__name__)
+
+# Default arguments for the DAG
+default_args = {
+    'owner': 'airflow',
+    'depends_on_past': False,
+    'email_on_failure': False,
+    'email_on_retry': False,
+    'retries': 1,
+    'retry_delay': timedelta(minutes=5),
+}
+
+# Define the DAG
+dag = DAG(
+    'dog_breed_history_export',
+    default_args=default_args,
+    description='Export the breed history as Parquet or Arrow for analytics',
+    schedule='@daily',
+    start_date=datetime(2024, 1, 1),
+    catchup=False,
+    max_active_runs=1,
+    tags=['dog', 'export', 'analytics'],
+    params={
+        'history_days': Param(
+            365,
+            type='integer',
+            minimum=0,
+            description='Days of history to export, ending with the data interval (0 exports everything)',
+        ),
+        'export_format': Param(
+            'parquet',
+            type='string',
+            enum=['parquet', 'arrow'],
+            description='parquet: compressed file for storage; arrow: Arrow IPC stream for fast loading',
+        ),
+        'dag_id': Param(
+            None,
+            type=['null', 'string'],
+            description='Only export the breeds loaded by this DAG (default: all)',
+        ),
+    },
+)
+
+def export_breed_history(**context):
+    """Write the breed history of the configured window to DOG_BREEDS_EXPORT_PATH"""
+    from airflow.sdk import ObjectStoragePath
+    from dog_breeds.columnar import EXPORT_PATH, FILE_EXTENSIONS, write_breed_history
+    from dog_breeds.db import get_db_connection
+
+    params = context['params']
+    export_format = params['export_format']
+    until = context.get('data_interval_end') or datetime.now(timezone.utc)
+    history_days = int(params['history_days'])
+    since = until - timedelta(days=history_days) if history_days else None
+
+    path = ObjectStoragePath(EXPORT_PATH) / f"{until:%Y-%m-%d}" / f"dog_breeds.{FILE_EXTENSIONS[export_format]}"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    logger.info(f"📦 Exporting breed history {since or 'from the start'} to {until} as {export_format}: {path}")
+
+    conn = get_db_connection()
+    try:
+        with path.open('wb') as sink:
+            rows = write_breed_history(
+                conn,
+                sink,
+                export_format,
+                dag_id=params.get('dag_id'),
+                since=since,
+                until=until,
+            )
+        conn.commit()
+    except Exception as db_error:
+        conn.rollback()
+        logger.error(f"❌ Breed history export failed: {db_error}")
+        raise
+    finally:
+        conn.close()
+
+    size = path.size()
+    logger.info(f"✅ Exported {rows} breed row(s), {size / 1024 / 1024:.1f} MiB")
+    return {
+        'path': str(path),
+        'format': export_format,
+        'rows': rows,
+        'bytes': size,
+        'since': since.isoformat() if since else None,
+        'until': until.isoformat(),
+    }
+
+# Define tasks
+export_task = PythonOperator(
+    task_id='export_breed_history',
+    python_callable=export_breed_history,
+    dag=dag,
+)
@@ -0,0 +1,168 @@
+"""
+Airflow DAG for breed_observations partition and stats maintenance
+
+breed_observations is range partitioned by month on execution_date:
+- create_partitions: creates the partitions for the coming months ahead of time
+- apply_retention: detaches or drops the partitions older than the retention window
+- check_stats_rollup: recounts the stats and compares them with breed_stats_rollup
+"""
+
+from datetime import datetime, timedelta
+from airflow import DAG
+from airflow.providers.standard.operators.python import PythonOperator
+from airflow.sdk import Param
+import logging
+
+# psycopg2 is imported inside the task callables to keep parsing cheap
+from dog_breeds.partitions import PARTITION_MONTHS_AHEAD, RETENTION_MODE, RETENTION_MODES, RETENTION_MONTHS
+
+logger = logging.getLogger(__name__)
+
+# Default arguments for the DAG
+default_args = {
+    'owner': 'airflow',
+    'depends_on_past': False,
+    'email_on_failure': False,
+    'email_on_retry': False,
+    'retries': 1,
+    'retry_delay': timedelta(minutes=5),
+}
+
+# Define the DAG
+dag = DAG(
+    'dog_breed_partition_maintenance',
+    default_args=default_args,
+    description='Create breed_observations partitions ahead of time, apply the retention policy and check the stats rollup',
+    schedule='@daily',
+    start_date=datetime(2024, 1, 1),
+    catchup=False,
+    max_active_runs=1,
+    tags=['dog', 'maintenance', 'partitions'],
+    params={
+        'months_ahead': Param(
+            PARTITION_MONTHS_AHEAD,
+            type='integer',
+            minimum=1,
+            maximum=24,
+            description='Months of partitions to keep created ahead of the current month',
+        ),
+        'retention_months': Param(
+            RETENTION_MONTHS,
+            type='integer',
+            minimum=1,
+            description='Full months of observations kept before the current month',
+        ),
+        'retention_mode': Param(
+            RETENTION_MODE,
+            type='string',
+            enum=list(RETENTION_MODES),
+            description='drop: delete expired partitions; detach: keep them as standalone tables for archiving',
+        ),
+        'repair_stats_rollup': Param(
+            True,
+            type='boolean',
+            description='Rebuild breed_stats_rollup when it disagrees with a recount (otherwise fail the task)',
+        ),
+    },
+)
+
+def create_partitions(**context):
+    """Create the monthly partitions for the current month and the months ahead"""
+    from dog_breeds.db import get_db_connection
+    from dog_breeds import partitions
+
+    conn = get_db_connection()
+    try:
+        created = partitions.create_partitions(conn, months_ahead=int(context['params']['months_ahead']))
+        conn.commit()
+    except Exception as db_error:
+        conn.rollback()
+        logger.error(f"❌ Creating partitions failed, transaction rolled back: {db_error}")
+        raise
+    finally:
+        conn.close()
+
+    if created:
+        logger.info(f"✅ Created {len(created)} partition(s): {', '.join(created)}")
+    return {'partitions_created': created}
+
+def apply_retention(**context):
+    """Detach or drop the partitions older than the retention window"""
+    from dog_breeds.db import get_db_connection
+    from dog_breeds import partitions
+
+    params = context['params']
+    conn = get_db_connection()
+    try:
+        cutoff, removed = partitions.apply_retention(
+            conn,
+            retention_months=int(params['retention_months']),
+            mode=params['retention_mode'],
+        )
+        conn.commit()
+    except Exception as db_error:
+        conn.rollback()
+        logger.error(f"❌ Retention failed, transaction rolled back: {db_error}")
+        raise
+    finally:
+        conn.close()
+
+    if removed:
+        action = 'Detached' if params['retention_mode'] == 'detach' else 'Dropped'
+        logger.info(f"🗑️ {action} {len(removed)} partition(s) before {cutoff:%Y-%m-%d}: {', '.join(removed)}")
+    return {
+        'cutoff': cutoff.isoformat(),
+        'retention_mode': params['retention_mode'],
+        'partitions_removed': removed,
+    }
+
+def check_stats_rollup(**context):
+    """Recount the breed stats and compare them with the incrementally maintained rollup"""
+    from airflow.exceptions import AirflowException
+    from dog_breeds.db import get_db_connection
+    from dog_breeds.stats_rollup import check_stats_rollup as check_rollup
+
+    repair = bool(context['params']['repair_stats_rollup'])
+    conn = get_db_connection()
+    try:
+        drift = check_rollup(conn, repair=repair)
+        conn.commit()
+    except Exception as db_error:
+        conn.rollback()
+        logger.error(f"❌ Stats rollup check failed, transaction rolled back: {db_error}")
+        raise
+    finally:
+        conn.close()
+
+    if drift and not repair:
+        raise AirflowException(f"Stats rollup disagrees with breed_observations for {len(drift)} dag_id(s): {drift}")
+    if drift:
+        logger.info(f"🔧 Repaired stats rollup for {', '.join(row['dag_id'] for row in drift)}")
+    else:
+        logger.info("✅ Stats rollup is consistent")
+    return {
+        'drifted_dag_ids': [row['dag_id'] for row in drift],
+        'repaired': bool(drift) and repair,
+    }
+
+# Define tasks
+create_partitions_task = PythonOperator(
+    task_id='create_partitions',
+    python_callable=create_partitions,
+    dag=dag,
+)
+
+retention_task = PythonOperator(
+    task_id='apply_retention',
+    python_callable=apply_retention,
+    dag=dag,
+)
+
+stats_check_task = PythonOperator(
+    task_id='check_stats_rollup',
+    python_callable=check_stats_rollup,
+    dag=dag,
+)
+
+# Set task dependencies
+create_partitions_task >> retention_task >> stats_check_task
@@ -0,0 +1,184 @@
+"""
+Airflow DAG to ingest the full Dog API breed catalog in parallel shards
+API Documentation: https://dogapi.dog/docs/api-v2
+Stores breed data in external PostgreSQL database
+
+Uses dynamic task mapping:
+- plan_shards: reads the page count and splits the pages into `shard_count` ranges
+- ingest_shard: one mapped task per range that fetches, transforms and loads its pages
+- summarize_shards: reduces the per-shard results into one run summary
+"""
+
+from datetime import datetime, timedelta
+from airflow import DAG
+from airflow.providers.standard.operators.python import PythonOperator
+from airflow.sdk import Param
+import logging
+import time
+
+# httpx/requests/psycopg2 are imported inside the task callables to keep parsing cheap
+from dog_breeds.breeds import BREEDS_API_URL
+
+logger = logging.getLogger(__name__)
+
+# Default arguments for the DAG
+default_args = {
+    'owner': 'airflow',
+    'depends_on_past': False,
+    'email_on_failure': False,
+    'email_on_retry': False,
+    'retries': 1,
+    'retry_delay': timedelta(minutes=5),
+}
+
+# Define the DAG
+dag = DAG(
+    'dog_breed_sharded_fetcher',
+    default_args=default_args,
+    description='Load the full Dog API breed catalog using parallel mapped shards',
+    schedule=None,  # Triggered manually or for backfills
+    start_date=datetime(2024, 1, 1),
+    catchup=False,
+    tags=['dog', 'api', 'sharded'],
+    params={
+        'shard_count': Param(
+            4,
+            type='integer',
+            minimum=1,
+            maximum=64,
+            description='Number of mapped ingest tasks the catalog pages are split across',
+        ),
+        'fetch_concurrency': Param(
+            2,
+            type='integer',
+            minimum=1,
+            maximum=32,
+            description='Concurrent page requests within each shard',
+        ),
+    },
+)
+
+def plan_shards(**context):
+    """
+    Read the catalog page count and split pages 1..N into contiguous ranges
+    Returns one op_kwargs dict per shard for the mapped ingest task
+    """
+    from dog_breeds.async_fetcher import last_page_number
+    from dog_breeds.breeds import MAX_CATALOG_PAGES
+    from dog_breeds.http_cache import HttpCache
+
+    shard_count = int(context['params']['shard_count'])
+
+    http_cache = HttpCache()
+    first_page = http_cache.get_json(BREEDS_API_URL)
+    total_pages = min(last_page_number(first_page) or 1, MAX_CATALOG_PAGES)
+    shard_count = max(1, min(shard_count, total_pages))
+
+    # Spread the remainder over the first shards so sizes differ by at most one page
+    base, remainder = divmod(total_pages, shard_count)
+    shards = []
+    next_page = 1
+    for shard_index in range(shard_count):
+        size = base + (1 if shard_index < remainder else 0)
+        shards.append({
+            'shard_index': shard_index,
+            'first_page': next_page,
+            'last_page': next_page + size - 1,
+        })
+        next_page += size
+
+    logger.info(f"Planned {len(shards)} shards over {total_pages} pages: {shards}")
+    return shards
+
+def ingest_shard(shard_index, first_page, last_page, **context):
+    """Fetch, transform and load one page range of the breed catalog"""
+    from dog_breeds.async_fetcher import ConcurrentPageFetcher
+    from dog_breeds.breeds import build_breed_record, get_run_metadata
+    from dog_breeds.db import get_db_connection
+    from dog_breeds.loader import load_breeds
+
+    start_time = time.monotonic()
+    run_metadata = get_run_metadata(context)
+    fetcher = ConcurrentPageFetcher(
+        BREEDS_API_URL,
+        concurrency=int(context['params']['fetch_concurrency']),
+        first_page=first_page,
+        last_page=last_page,
+    )
+
+    logger.info(f"Shard {shard_index}: ingesting pages {first_page}-{last_page}")
+    conn = get_db_connection()
+    try:
+        records = (build_breed_record(breed, run_metadata) for breed in fetcher.iter_records())
+        load_stats = load_breeds(conn, records)
+        conn.commit()
+    except Exception as db_error:
+        conn.rollback()
+        logger.error(f"❌ Shard {shard_index} failed, transaction rolled back: {db_error}")
+        raise
+    finally:
+        conn.close()
+
+    result = {
+        'shard_index': shard_index,
+        'first_page': first_page,
+        'last_page': last_page,
+        'rows_written': load_stats['rows_merged'],
+        'observations_recorded': load_stats['rows_inserted'],
+        'breeds_inserted': load_stats['breeds_inserted'],
+        'breeds_updated': load_stats['breeds_updated'],
+        'breeds_skipped': load_stats['breeds_skipped'],
+        'load_seconds': load_stats['elapsed_seconds'],
+        'elapsed_seconds': round(time.monotonic() - start_time, 3),
+        **fetcher.stats(),
+    }
+    logger.info(f"✅ Shard {shard_index} done: {result}")
+    return result
+
+def summarize_shards(shard_results, **context):
+    """Combine the mapped shard results into one summary"""
+    shard_results = [result for result in shard_results if result]
+    summary = {
+        'shards': len(shard_results),
+        'pages_fetched': sum(result['pages_fetched'] for result in shard_results),
+        'breeds_fetched': sum(result['records_fetched'] for result in shard_results),
+        'rows_written': sum(result['rows_written'] for result in shard_results),
+        'observations_recorded': sum(result.get('observations_recorded', 0) for result in shard_results),
+        'breeds_inserted': sum(result.get('breeds_inserted', 0) for result in shard_results),
+        'breeds_updated': sum(result.get('breeds_updated', 0) for result in shard_results),
+        'breeds_skipped': sum(result.get('breeds_skipped', 0) for result in shard_results),
+        'slowest_shard_seconds': max((result['elapsed_seconds'] for result in shard_results), default=0),
+        'total_shard_seconds': round(sum(result['elapsed_seconds'] for result in shard_results), 3),
+    }
+
+    logger.info("=" * 70)
+    logger.info("BREED SUMMARY - SHARDED CATALOG INGEST")
+    logger.info("=" * 70)
+    for key, value in summary.items():
+        logger.info(f"{key}: {value}")
+    logger.info("=" * 70)
+    return summary
+
+# Define tasks
+plan_task = PythonOperator(
+    task_id='plan_shards',
+    python_callable=plan_shards,
+    dag=dag,
+)
+
+# One mapped task instance per shard returned by plan_shards
+ingest_tasks = PythonOperator.partial(
+    task_id='ingest_shard',
+    python_callable=ingest_shard,
+    dag=dag,
+).expand(op_kwargs=plan_task.output)
+
+summary_task = PythonOperator(
+    task_id='summarize_shards',
+    python_callable=summarize_shards,
+    op_kwargs={'shard_results': ingest_tasks.output},
+    dag=dag,
+)
+
+# Set task dependencies
+plan_task >> ingest_tasks >> summary_task
@@ -0,0 +1,71 @@
+"""
+Airflow DAG for the cleanup of offloaded XCom payloads
+Deletes the payload files the offloading XCom backend left in object storage
+
+purge_xcom_payloads deletes the payload directory of every run whose newest
+payload is older than the retention period. Airflow only deletes a payload
+when it clears its XCom row (OffloadingXComBackend.purge), which deleting
+runs or cleaning up the metadata DB does not reach
+"""
+
+from datetime import datetime, timedelta
+from airflow import DAG
+from airflow.providers.standard.operators.python import PythonOperator
+from airflow.sdk import Param
+import logging
+import os
+
+# The XCom backend (ObjectStoragePath, fsspec) is imported inside the task
+# callable to keep parsing cheap; its retention default is read here directly
+XCOM_RETENTION_DAYS = int(os.getenv('DOG_BREEDS_XCOM_RETENTION_DAYS', '30'))
+
+logger = logging.getLogger(__name__)
+
+# Default arguments for the DAG
+default_args = {
+    'owner': 'airflow',
+    'depends_on_past': False,
+    'email_on_failure': False,
+    'email_on_retry': False,
+    'retries': 1,
+    'retry_delay': timedelta(minutes=5),
+}
+
+# Define the DAG
+dag = DAG(
+    'dog_breed_xcom_cleanup',
+    default_args=default_args,
+    description='Delete offloaded XCom payloads older than the retention period',
+    schedule='@daily',
+    start_date=datetime(2024, 1, 1),
+    catchup=False,
+    max_active_runs=1,
+    tags=['dog', 'maintenance', 'xcom'],
+    params={
+        'retention_days': Param(
+            XCOM_RETENTION_DAYS,
+            type='integer',
+            minimum=1,
+            description='Days the offloaded XCom payloads of a run are kept after its last write',
+        ),
+    },
+)
+
+def purge_xcom_payloads(**context):
+    """Delete offloaded XCom payloads of runs older than the retention period"""
+    from dog_breeds.xcom_backend import XCOM_PATH, purge_expired_payloads
+
+    retention_days = int(context['params']['retention_days'])
+    purged = purge_expired_payloads(retention_days)
+    if purged:
+        logger.info(f"🗑️ Deleted offloaded XCom payloads of {len(purged)} run(s) older than {retention_days} day(s) from {XCOM_PATH}")
+    else:
+        logger.info(f"✅ No offloaded XCom payloads older than {retention_days} day(s)")
+    return {'xcom_runs_purged': purged}
+
+# Define tasks
+xcom_purge_task = PythonOperator(
+    task_id='purge_xcom_payloads',
+    python_callable=purge_xcom_payloads,
+    dag=dag,
+)
@@ -0,0 +1,5 @@
+"""
+Shared helpers for the dog breed DAGs
+This package lives in the DAGs folder so Airflow puts it on sys.path;
+it is listed in .airflowignore so the DAG processor does not parse it
+"""
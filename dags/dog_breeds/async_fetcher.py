@@ -0,0 +1,156 @@
+"""
+Concurrent page fetcher for the paginated Dog API endpoints
+(/breeds, /facts, /groups)
+Reads page 1 to learn the page count (unless an explicit page range is
+given), then fetches the remaining pages concurrently under a semaphore
+and yields parsed records as pages arrive.
+`iter_records()` exposes the stream as a plain generator so it can be fed
+straight into the bulk loader from a synchronous task callable
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+
+import httpx
+
+from dog_breeds.breeds import MAX_CATALOG_PAGES, extract_breeds
+from dog_breeds.http_client import (
+    BACKOFF_MAX,
+    CONNECT_TIMEOUT,
+    MAX_RETRIES,
+    READ_TIMEOUT,
+    RETRY_STATUSES,
+    LatencyRecorder,
+    backoff_delay,
+)
+
+logger = logging.getLogger(__name__)
+
+API_BASE_URL = "https://dogapi.dog/api/v2"
+FETCH_CONCURRENCY = int(os.getenv('DOG_BREEDS_FETCH_CONCURRENCY', '8'))
+
+PAGE_PARAM = 'page[number]'
+_PAGE_NUMBER_RE = re.compile(r'page(?:%5B|\[)number(?:%5D|\])=(\d+)')
+
+
+def last_page_number(document):
+    """Read the last page number from JSON:API pagination metadata, or None"""
+    if not isinstance(document, dict):
+        return None
+    pagination = document.get('meta', {}).get('pagination', {})
+    if isinstance(pagination.get('last'), int):
+        return pagination['last']
+    last_link = document.get('links', {}).get('last')
+    if isinstance(last_link, str):
+        match = _PAGE_NUMBER_RE.search(last_link)
+        if match:
+            return int(match.group(1))
+    return None
+
+
+class ConcurrentPageFetcher:
+    """
+    Fetch the pages of one endpoint with at most `concurrency` requests in flight
+    By default every page is fetched; pass `first_page`/`last_page` to fetch a fixed range
+    """
+
+    def __init__(self, endpoint_url, concurrency=FETCH_CONCURRENCY, max_pages=MAX_CATALOG_PAGES, first_page=1, last_page=None):
+        self.endpoint_url = endpoint_url
+        self.concurrency = max(1, concurrency)
+        self.max_pages = max_pages
+        self.first_page = first_page
+        self.last_page = last_page
+        self.latency = LatencyRecorder()
+        self.pages_fetched = 0
+        self.records_fetched = 0
+
+    async def _get_page(self, client, semaphore, page):
+        """GET one page with retry/backoff on 429/5xx and transport errors"""
+        async with semaphore:
+            for attempt in range(MAX_RETRIES + 1):
+                start = time.perf_counter()
+                try:
+                    response = await client.get(self.endpoint_url, params={PAGE_PARAM: page})
+                except httpx.TransportError as e:
+                    self.latency.record('GET', f"{self.endpoint_url}#{page}", None, time.perf_counter() - start, attempt)
+                    if attempt >= MAX_RETRIES:
+                        raise
+                    delay = backoff_delay(attempt)
+                    logger.warning(f"Page {page} of {self.endpoint_url} failed ({e}), retrying in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+                    continue
+
+                self.latency.record('GET', f"{self.endpoint_url}#{page}", response.status_code, time.perf_counter() - start, attempt)
+                if response.status_code in RETRY_STATUSES and attempt < MAX_RETRIES:
+                    delay = backoff_delay(attempt, response.headers.get('Retry-After'))
+                    logger.warning(f"Page {page} of {self.endpoint_url} returned {response.status_code}, retrying in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+                    continue
+
+                response.raise_for_status()
+                self.pages_fetched += 1
+                return response.json()
+
+    async def aiter_records(self):
+        """Async generator of records from every page, in completion order"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        timeout = httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT, pool=BACKOFF_MAX)
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+
+        async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+            if self.last_page is None:
+                # Discover the page count from the first page's pagination metadata
+                first_document = await self._get_page(client, semaphore, self.first_page)
+                for record in extract_breeds(first_document):
+                    self.records_fetched += 1
+                    yield record
+                last_page = last_page_number(first_document) or self.first_page
+                last_page = min(last_page, self.first_page + self.max_pages - 1)
+                pages = range(self.first_page + 1, last_page + 1)
+            else:
+                pages = range(self.first_page, self.last_page + 1)
+
+            logger.info(f"Fetching {len(pages)} pages of {self.endpoint_url} with concurrency {self.concurrency}")
+            tasks = [
+                asyncio.ensure_future(self._get_page(client, semaphore, page))
+                for page in pages
+            ]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    document = await next_done
+                    for record in extract_breeds(document):
+                        self.records_fetched += 1
+                        yield record
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def iter_records(self):
+        """
+        Synchronous generator over aiter_records()
+        Drives a private event loop one record at a time, so the consumer
+        (e.g. the COPY stream of the bulk loader) pulls records as pages land
+        """
+        loop = asyncio.new_event_loop()
+        agen = self.aiter_records()
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(agen.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(agen.aclose())
+            loop.close()
+
+    def stats(self):
+        return {
+            'pages_fetched': self.pages_fetched,
+            'records_fetched': self.records_fetched,
+            'concurrency': self.concurrency,
+            'http_requests': self.latency.summary(),
+        }
@@ -0,0 +1,197 @@
+"""
+Dog API breed helpers shared by the breed DAGs
+Parsing of API documents into breed fields and loader records
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+
+from dog_breeds.streaming_json import StreamingJsonArray
+
+logger = logging.getLogger(__name__)
+
+# Dog API configuration
+BREEDS_API_URL = "https://dogapi.dog/api/v2/breeds"
+# Safety limit for full-catalog ingest in case the API keeps returning `next` links
+MAX_CATALOG_PAGES = int(os.getenv('DOG_BREEDS_MAX_CATALOG_PAGES', '100'))
+
+
+def extract_breed_info(breed):
+    """Extract breed name, description and life expectancy from an API breed object"""
+    breed_info = {}
+
+    # Handle different possible response structures
+    if isinstance(breed, dict):
+        if 'attributes' in breed:
+            attrs = breed['attributes']
+            breed_info = {
+                'breed_name': attrs.get('name', 'Unknown'),
+                'description': attrs.get('description', 'No description available'),
+                'life_min': attrs.get('life', {}).get('min', None) if isinstance(attrs.get('life'), dict) else None,
+                'life_max': attrs.get('life', {}).get('max', None) if isinstance(attrs.get('life'), dict) else None,
+            }
+        else:
+            # Direct attributes
+            breed_info = {
+                'breed_name': breed.get('name', breed.get('breed', 'Unknown')),
+                'description': breed.get('description', 'No description available'),
+                'life_min': breed.get('life_min', None),
+                'life_max': breed.get('life_max', None),
+            }
+
+    breed_info.setdefault('breed_name', 'Unknown')
+    breed_info.setdefault('description', 'No description available')
+    breed_info.setdefault('life_min', None)
+    breed_info.setdefault('life_max', None)
+
+    # Format life expectancy string
+    if breed_info['life_min'] and breed_info['life_max']:
+        breed_info['life_expectancy'] = f"{breed_info['life_min']}-{breed_info['life_max']} years"
+    else:
+        breed_info['life_expectancy'] = 'N/A'
+
+    return breed_info
+
+
+def extract_breeds(data):
+    """Return the list of breed objects from an API response document"""
+    # The API returns a structure with 'data' containing breeds
+    if isinstance(data, dict) and 'data' in data:
+        return data['data']
+    elif isinstance(data, list):
+        return data
+    return [data]
+
+
+def compute_content_hash(breed):
+    """
+    SHA-256 of the API breed object in canonical JSON form
+    Every stored breed field is derived from this object, so equal hashes mean
+    an upsert would not change anything
+    """
+    canonical = json.dumps(breed, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def get_execution_date(context):
+    """Resolve the run's execution date from the task context"""
+    dag_run = context['dag_run']
+    # Handle execution_date - use logical_date or current time if None
+    execution_date = context.get('execution_date') or context.get('logical_date') or dag_run.logical_date or datetime.utcnow()
+    if execution_date and isinstance(execution_date, str):
+        execution_date = datetime.fromisoformat(execution_date.replace('Z', '+00:00'))
+    return execution_date
+
+
+def get_run_metadata(context):
+    """Airflow run metadata stored with every breed row of this task run"""
+    dag_run = context['dag_run']
+    ti = context['ti']
+    execution_date = get_execution_date(context)
+    return {
+        'dag_id': ti.dag_id,
+        'dag_run_id': dag_run.run_id,
+        'task_id': ti.task_id,
+        'execution_date': execution_date,
+        'asset_uri': f"dog_breed://{ti.dag_id}/{dag_run.run_id}",
+    }
+
+
+def breed_api_id(breed, breed_name):
+    """Natural key of the breed in the `breeds` table: the API's breed ID, or its name if the object has none"""
+    if isinstance(breed, dict) and breed.get('id'):
+        return str(breed['id'])
+    return f"name:{breed_name}"
+
+
+def build_breed_record(breed, run_metadata):
+    """Build a loader record (see dog_breeds.loader.LOAD_COLUMNS) from an API breed object"""
+    breed_info = extract_breed_info(breed)
+
+    return {
+        'api_id': breed_api_id(breed, breed_info['breed_name']),
+        'breed_name': breed_info['breed_name'],
+        'description': breed_info['description'],
+        'life_expectancy': breed_info['life_expectancy'],
+        'life_min': breed_info['life_min'],
+        'life_max': breed_info['life_max'],
+        # Run metadata lives on the observation row, so only the API object is stored
+        'full_data': breed if isinstance(breed, dict) else {},
+        'content_hash': compute_content_hash(breed),
+        **run_metadata,
+    }
+
+
+def fetch_breed_catalog(http_cache, api_url=BREEDS_API_URL, max_pages=MAX_CATALOG_PAGES):
+    """
+    Fetch every breed by following the API's pagination links
+    Pages are revalidated against `http_cache`, so unchanged pages are not re-downloaded
+    Returns (breeds, pages_fetched)
+    """
+    breeds = []
+    pages_fetched = 0
+    next_url = api_url
+    seen_urls = set()
+
+    while next_url and pages_fetched < max_pages:
+        if next_url in seen_urls:
+            logger.warning(f"Pagination loop detected at {next_url}, stopping")
+            break
+        seen_urls.add(next_url)
+
+        logger.info(f"Fetching breeds page {pages_fetched + 1}: {next_url}")
+        data = http_cache.get_json(next_url)
+        pages_fetched += 1
+
+        breeds.extend(extract_breeds(data))
+
+        # JSON:API style pagination: {"links": {"next": "...?page[number]=2"}}
+        links = data.get('links', {}) if isinstance(data, dict) else {}
+        next_url = links.get('next') if isinstance(links, dict) else None
+
+    if next_url:
+        logger.warning(f"Stopped after {max_pages} pages, catalog may be incomplete")
+
+    return breeds, pages_fetched
+
+
+class StreamingBreedCatalog:
+    """
+    Streaming counterpart of fetch_breed_catalog(): iterating yields breed
+    objects one at a time while each page body is parsed incrementally, so
+    memory stays flat however large the pages or the catalog are
+    """
+
+    def __init__(self, http_cache, api_url=BREEDS_API_URL, max_pages=MAX_CATALOG_PAGES):
+        self.http_cache = http_cache
+        self.api_url = api_url
+        self.max_pages = max_pages
+        self.pages_fetched = 0
+        self.breeds_fetched = 0
+
+    def __iter__(self):
+        next_url = self.api_url
+        seen_urls = set()
+
+        while next_url and self.pages_fetched < self.max_pages:
+            if next_url in seen_urls:
+                logger.warning(f"Pagination loop detected at {next_url}, stopping")
+                return
+            seen_urls.add(next_url)
+
+            logger.info(f"Streaming breeds page {self.pages_fetched + 1}: {next_url}")
+            page = StreamingJsonArray(self.http_cache.iter_chunks(next_url))
+            for breed in page:
+                self.breeds_fetched += 1
+                yield breed
+            self.pages_fetched += 1
+
+            # `links` is parsed after the data array, once the page has been consumed
+            links = page.metadata.get('links', {})
+            next_url = links.get('next') if isinstance(links, dict) else None
+
+        if next_url:
+            logger.warning(f"Stopped after {self.max_pages} pages, catalog may be incomplete")
@@ -0,0 +1,109 @@
+"""
+Columnar exports of breed history: Arrow IPC streams and Parquet files
+Reads dog_breeds through a named (server-side) cursor and writes one typed
+Arrow record batch, and Parquet row group, per fetch, so memory stays at one
+batch however much history is exported. The schema (columnar_schema.py) is
+shared with the API, which serves the same files from /api/breeds/export.
+
+Command line, from the DAGs folder:
+    python -m dog_breeds.columnar --output breeds.parquet --days 365
+"""
+
+import argparse
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dog_breeds.columnar_schema import ARROW_SCHEMA, COLUMNAR_SELECT, record_batch
+
+logger = logging.getLogger(__name__)
+
+# Where the export DAG writes its files (any fsspec URL)
+EXPORT_PATH = os.getenv('DOG_BREEDS_EXPORT_PATH', 'file:///tmp/dog_breeds_exports')
+# Rows per fetch, record batch and Parquet row group
+EXPORT_BATCH_ROWS = int(os.getenv('DOG_BREEDS_EXPORT_BATCH_ROWS', '20000'))
+EXPORT_FORMATS = ('parquet', 'arrow')
+# Arrow IPC streams (as opposed to Arrow files) are .arrows
+FILE_EXTENSIONS = {'parquet': 'parquet', 'arrow': 'arrows'}
+
+
+def iter_record_batches(conn, dag_id=None, since=None, until=None, batch_rows=EXPORT_BATCH_ROWS):
+    """
+    Record batches of the dog_breeds rows matching the filters, oldest first
+    (`since` inclusive, `until` exclusive, on execution_date). The named
+    cursor lives in the caller's transaction
+    """
+    conditions, params = [], []
+    if dag_id:
+        conditions.append("dag_id = %s")
+        params.append(dag_id)
+    if since:
+        conditions.append("execution_date >= %s")
+        params.append(since)
+    if until:
+        conditions.append("execution_date < %s")
+        params.append(until)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    with conn.cursor(name='breed_history_export') as cursor:
+        cursor.execute(
+            f"SELECT {', '.join(COLUMNAR_SELECT)} "
+            f"FROM dog_breeds {where} ORDER BY execution_date",
+            params,
+        )
+        while True:
+            rows = cursor.fetchmany(batch_rows)
+            if not rows:
+                break
+            yield record_batch(rows)
+
+
+def write_breed_history(conn, sink, export_format='parquet', **filters):
+    """
+    Write the matching rows to the binary file object `sink` as Parquet or
+    an Arrow IPC stream; returns the number of rows written
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {export_format!r}, expected one of {EXPORT_FORMATS}")
+    if export_format == 'parquet':
+        writer = pq.ParquetWriter(sink, ARROW_SCHEMA, compression='zstd')
+    else:
+        writer = pa.ipc.new_stream(sink, ARROW_SCHEMA)
+
+    rows = 0
+    with writer:
+        for batch in iter_record_batches(conn, **filters):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    logger.info(f"Exported {rows} breed row(s) as {export_format}")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export dog_breeds history as Parquet or an Arrow IPC stream")
+    parser.add_argument('--output', required=True, help="file to write")
+    parser.add_argument('--format', dest='export_format', choices=EXPORT_FORMATS, help="default: from the --output extension")
+    parser.add_argument('--dag-id')
+    parser.add_argument('--days', type=int, help="only the last DAYS days (default: all history)")
+    args = parser.parse_args()
+
+    from dog_breeds.db import get_db_connection
+
+    export_format = args.export_format or ('arrow' if args.output.endswith(('.arrow', '.arrows')) else 'parquet')
+    since = datetime.now(timezone.utc) - timedelta(days=args.days) if args.days else None
+    conn = get_db_connection()
+    try:
+        with open(args.output, 'wb') as sink:
+            rows = write_breed_history(conn, sink, export_format, dag_id=args.dag_id, since=since)
+        conn.commit()
+    finally:
+        conn.close()
+    print(f"Wrote {rows} row(s) to {args.output}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,42 @@
+"""
+Arrow schema of the columnar breed history exports
+The single definition behind both the API's /api/breeds/export Arrow and
+Parquet formats (api/columnar.py) and the export DAG and CLI
+(dog_breeds/columnar.py). It only needs pyarrow, and is copied next to the
+API modules when the API image is built (see api/Dockerfile)
+"""
+
+import pyarrow as pa
+
+# (column, SELECT expression, Arrow type); ids and JSONB are read as text so
+# they go straight into string columns without a Python round trip
+TIMESTAMP = pa.timestamp('us', tz='UTC')
+COLUMNAR_FIELDS = (
+    ('id', 'id::text', pa.string()),
+    ('breed_name', 'breed_name', pa.string()),
+    ('description', 'description', pa.string()),
+    ('life_expectancy', 'life_expectancy', pa.string()),
+    ('life_min', 'life_min', pa.int32()),
+    ('life_max', 'life_max', pa.int32()),
+    ('dag_id', 'dag_id', pa.string()),
+    ('dag_run_id', 'dag_run_id', pa.string()),
+    ('task_id', 'task_id', pa.string()),
+    ('execution_date', 'execution_date', TIMESTAMP),
+    ('asset_uri', 'asset_uri', pa.string()),
+    ('api_id', 'api_id', pa.string()),
+    ('content_hash', 'content_hash', pa.string()),
+    ('created_at', 'created_at', TIMESTAMP),
+    ('updated_at', 'updated_at', TIMESTAMP),
+    ('full_data', 'full_data::text', pa.string()),
+)
+COLUMNAR_SELECT = [expression for _, expression, _ in COLUMNAR_FIELDS]
+ARROW_SCHEMA = pa.schema([(name, arrow_type) for name, _, arrow_type in COLUMNAR_FIELDS])
+
+
+def record_batch(rows):
+    """Arrow record batch of tuple rows selected with COLUMNAR_SELECT"""
+    columns = list(zip(*rows)) if rows else [[] for _ in COLUMNAR_FIELDS]
+    return pa.RecordBatch.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(columns, ARROW_SCHEMA)],
+        schema=ARROW_SCHEMA,
+    )
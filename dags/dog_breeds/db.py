@@ -0,0 +1,31 @@
+"""
+Connection helpers for the dog breeds PostgreSQL database
+"""
+
+import logging
+import os
+
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+# Database connection configuration
+# In Kubernetes, this will connect to the dog-breeds-db service
+DB_CONFIG = {
+    'host': os.getenv('DOG_BREEDS_DB_HOST', 'dog-breeds-db.dog-breeds.svc.cluster.local'),
+    'port': os.getenv('DOG_BREEDS_DB_PORT', '5432'),
+    'database': os.getenv('DOG_BREEDS_DB_NAME', 'dog_breeds_db'),
+    'user': os.getenv('DOG_BREEDS_DB_USER', 'airflow'),
+    'password': os.getenv('DOG_BREEDS_DB_PASSWORD', 'airflow'),
+}
+
+
+def get_db_connection():
+    """Create and return a database connection"""
+    try:
+        conn = psycopg2.connect(**DB_CONFIG)
+        logger.info(f"✅ Connected to database: {DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}")
+        return conn
+    except Exception as e:
+        logger.error(f"❌ Failed to connect to database: {e}")
+        raise
@@ -0,0 +1,221 @@
+"""
+On-disk HTTP cache with conditional request support
+Stores each response body next to its ETag/Last-Modified validators and
+revalidates with If-None-Match/If-Modified-Since; a 304 reuses the cached body
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from dog_breeds.http_client import get_session
+from dog_breeds.streaming_json import READ_CHUNK_BYTES, iter_file_chunks
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv(
+    'DOG_BREEDS_HTTP_CACHE_DIR',
+    os.path.join(tempfile.gettempdir(), 'dog_breeds_http_cache'),
+)
+
+
+class CacheStats:
+    """Hit/miss counters for one task run"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.bytes_downloaded = 0
+
+    def as_dict(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'bytes_saved': self.bytes_saved,
+            'bytes_downloaded': self.bytes_downloaded,
+        }
+
+
+class HttpCache:
+    """Conditional GET cache keyed by URL, persisted under `cache_dir`"""
+
+    def __init__(self, cache_dir=CACHE_DIR, session=None):
+        self.cache_dir = Path(cache_dir)
+        self.session = session or get_session()
+        self.stats = CacheStats()
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.body", self.cache_dir / f"{key}.meta.json"
+
+    def conditional_headers(self, url):
+        """Validator headers for the cached copy of `url` (empty if nothing is cached)"""
+        body_path, meta_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if not body_path.exists():
+            return {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    @staticmethod
+    def _validators(response):
+        return {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+
+    def _write_meta(self, url, validators):
+        _, meta_path = self._paths(url)
+        meta = {'url': url, 'stored_at': time.time(), **validators}
+        tmp_path = meta_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(meta))
+        os.replace(tmp_path, meta_path)
+
+    def _store(self, url, response):
+        self.store(url, response.content, self._validators(response))
+
+    def store(self, url, body, validators):
+        """
+        Cache a body fetched outside this cache (e.g. by a trigger) with its
+        ETag/Last-Modified validators; returns whether it was written
+        """
+        if not any(validators.values()):
+            # Nothing to revalidate with next time
+            return False
+        body_path, _ = self._paths(url)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to temp files and rename so concurrent readers never see partial files
+            tmp_path = body_path.with_suffix('.body.tmp')
+            tmp_path.write_bytes(body)
+            os.replace(tmp_path, body_path)
+            self._write_meta(url, validators)
+        except OSError as e:
+            logger.warning(f"Could not write HTTP cache entry for {url}: {e}")
+            return False
+        return True
+
+    def stored_body(self, url, validators):
+        """Body stored for `url` with exactly these validators (e.g. by a trigger), or None if it is not there"""
+        body_path, meta_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text())
+            if any(meta.get(name) != value for name, value in validators.items()):
+                return None
+            return body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+
+    def cached_body(self, url):
+        """Body of the cached copy of `url` after a 304 received elsewhere, or None if it is gone"""
+        body_path, _ = self._paths(url)
+        try:
+            body = body_path.read_bytes()
+        except OSError:
+            return None
+        self.stats.hits += 1
+        self.stats.bytes_saved += len(body)
+        return body
+
+    def get(self, url, **kwargs):
+        """
+        GET `url`, revalidating a cached copy if there is one
+        Extra keyword arguments (e.g. `timeout`) are passed to the session
+        Returns the response body as bytes
+        """
+        headers = self.conditional_headers(url)
+        response = self.session.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and headers:
+            cached_body = self.cached_body(url)
+            if cached_body is not None:
+                logger.info(f"HTTP cache hit (304 Not Modified): {url}")
+                return cached_body
+            # Evicted or replaced since conditional_headers() looked
+            logger.warning(f"Cached body for {url} is gone after a 304, fetching it again without validators")
+            response = self.session.get(url, **kwargs)
+
+        response.raise_for_status()
+        self.stats.misses += 1
+        self.stats.bytes_downloaded += len(response.content)
+        logger.info(f"HTTP cache miss ({response.status_code}, {len(response.content)} bytes): {url}")
+        self._store(url, response)
+        return response.content
+
+    def get_json(self, url, **kwargs):
+        """GET `url` through the cache and decode the JSON body"""
+        return json.loads(self.get(url, **kwargs))
+
+    def iter_chunks(self, url, chunk_size=READ_CHUNK_BYTES, **kwargs):
+        """
+        Streaming variant of get(): yields the body in chunks without holding it in memory
+        A 304 streams the cached file; a fresh body is written to the cache while it streams
+        """
+        headers = self.conditional_headers(url)
+        body_path, _ = self._paths(url)
+
+        with self.session.get(url, headers=headers, stream=True, **kwargs) as response:
+            if response.status_code != 304 or not headers:
+                yield from self._stream_response(url, response, chunk_size)
+                return
+            # Opened before streaming: a concurrent store() or eviction can
+            # replace or delete the file, but not the copy already open
+            try:
+                cached_file = open(body_path, 'rb')
+            except OSError:
+                cached_file = None
+
+        if cached_file is None:
+            logger.warning(f"Cached body for {url} is gone after a 304, fetching it again without validators")
+            with self.session.get(url, stream=True, **kwargs) as response:
+                yield from self._stream_response(url, response, chunk_size)
+            return
+
+        self.stats.hits += 1
+        self.stats.bytes_saved += os.fstat(cached_file.fileno()).st_size
+        logger.info(f"HTTP cache hit (304 Not Modified), streaming cached body: {url}")
+        yield from iter_file_chunks(cached_file, chunk_size)
+
+    def _stream_response(self, url, response, chunk_size):
+        """Yield a fresh response body in chunks, writing it to the cache as it streams"""
+        body_path, _ = self._paths(url)
+        response.raise_for_status()
+        self.stats.misses += 1
+        validators = self._validators(response)
+        cache_file = None
+        if any(validators.values()):
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                cache_file = open(body_path.with_suffix('.body.tmp'), 'wb')
+            except OSError as e:
+                logger.warning(f"Could not write HTTP cache entry for {url}: {e}")
+
+        try:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                self.stats.bytes_downloaded += len(chunk)
+                if cache_file:
+                    cache_file.write(chunk)
+                yield chunk
+        except BaseException:
+            if cache_file:
+                cache_file.close()
+                os.unlink(cache_file.name)
+            raise
+
+        if cache_file:
+            cache_file.close()
+            os.replace(cache_file.name, body_path)
+            self._write_meta(url, validators)
+        logger.info(f"HTTP cache miss ({response.status_code}), streamed body: {url}")
@@ -0,0 +1,136 @@
+"""
+Shared HTTP client for the Dog API
+One keep-alive session per worker process with a connection pool,
+separate connect/read timeouts, jittered exponential backoff on
+429/5xx responses and connection errors, and per-request latency records
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = float(os.getenv('DOG_BREEDS_HTTP_CONNECT_TIMEOUT', '3.05'))
+READ_TIMEOUT = float(os.getenv('DOG_BREEDS_HTTP_READ_TIMEOUT', '10'))
+MAX_RETRIES = int(os.getenv('DOG_BREEDS_HTTP_MAX_RETRIES', '4'))
+BACKOFF_BASE = float(os.getenv('DOG_BREEDS_HTTP_BACKOFF_BASE', '0.5'))
+BACKOFF_MAX = float(os.getenv('DOG_BREEDS_HTTP_BACKOFF_MAX', '30'))
+POOL_MAXSIZE = int(os.getenv('DOG_BREEDS_HTTP_POOL_MAXSIZE', '10'))
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class LatencyRecorder:
+    """Thread-safe list of per-request latencies"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records = []
+
+    def record(self, method, url, status, seconds, attempt):
+        with self._lock:
+            self._records.append({
+                'method': method,
+                'url': url,
+                'status': status,
+                'seconds': seconds,
+                'attempt': attempt,
+            })
+
+    def reset(self):
+        with self._lock:
+            self._records = []
+
+    def summary(self):
+        """Count, retries and latency percentiles (in seconds) of the recorded requests"""
+        with self._lock:
+            latencies = sorted(r['seconds'] for r in self._records)
+            retries = sum(1 for r in self._records if r['attempt'] > 0)
+        if not latencies:
+            return {'requests': 0, 'retries': 0}
+
+        def percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 4)
+
+        return {
+            'requests': len(latencies),
+            'retries': retries,
+            'total_seconds': round(sum(latencies), 4),
+            'p50_seconds': percentile(0.50),
+            'p95_seconds': percentile(0.95),
+            'max_seconds': round(latencies[-1], 4),
+        }
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Full-jitter exponential backoff, honoring a numeric Retry-After header"""
+    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+    if retry_after:
+        try:
+            delay = max(delay, float(retry_after))
+        except ValueError:
+            # HTTP-date form of Retry-After; fall back to the jittered delay
+            pass
+    return min(delay, BACKOFF_MAX)
+
+
+class RetryingSession(requests.Session):
+    """requests.Session with pooling, default timeouts and retry/backoff"""
+
+    def __init__(self, max_retries=MAX_RETRIES, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), pool_maxsize=POOL_MAXSIZE):
+        super().__init__()
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.latency = LatencyRecorder()
+        # Retries are handled in request() so that every attempt is timed and logged
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=0)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                response = super().request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.latency.record(method, url, None, time.perf_counter() - start, attempt)
+                if attempt >= self.max_retries:
+                    raise
+                delay = backoff_delay(attempt)
+                logger.warning(f"{method} {url} failed ({e}), retrying in {delay:.2f}s ({attempt + 1}/{self.max_retries})")
+                time.sleep(delay)
+                continue
+
+            self.latency.record(method, url, response.status_code, time.perf_counter() - start, attempt)
+            if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                return response
+
+            delay = backoff_delay(attempt, response.headers.get('Retry-After'))
+            logger.warning(
+                f"{method} {url} returned {response.status_code}, "
+                f"retrying in {delay:.2f}s ({attempt + 1}/{self.max_retries})"
+            )
+            # Release the connection back to the pool before sleeping
+            response.close()
+            time.sleep(delay)
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the process-wide shared session, creating it on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = RetryingSession()
+        return _session
@@ -0,0 +1,241 @@
+"""
+Bulk loader for the normalized breed tables
+Streams a batch of breed records into a temporary staging table with
+COPY FROM STDIN, then merges it with set-based statements: breed content
+is upserted into `breeds` (rows whose content_hash is unchanged are
+skipped instead of rewritten), each DAG run is recorded once in
+`ingest_runs`, and one narrow row per (run, breed) is added to
+`breed_observations`
+"""
+
+import io
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Columns of a loader record, in COPY order
+LOAD_COLUMNS = (
+    'api_id',
+    'breed_name',
+    'description',
+    'life_expectancy',
+    'life_min',
+    'life_max',
+    'dag_id',
+    'dag_run_id',
+    'task_id',
+    'execution_date',
+    'asset_uri',
+    'full_data',
+    'content_hash',
+)
+
+BREED_COLUMNS = ('api_id', 'breed_name', 'description', 'life_expectancy', 'life_min', 'life_max', 'full_data', 'content_hash')
+RUN_COLUMNS = ('dag_id', 'dag_run_id', 'task_id', 'execution_date', 'asset_uri')
+
+STAGING_TABLE = 'dog_breeds_staging'
+
+# Staging has no defaults, constraints or triggers; the temp table is
+# dropped at commit, so each transaction gets a fresh one
+CREATE_STAGING_SQL = f"""
+    DROP TABLE IF EXISTS pg_temp.{STAGING_TABLE};
+    CREATE TEMP TABLE {STAGING_TABLE} (
+        api_id VARCHAR(255),
+        breed_name VARCHAR(255),
+        description TEXT,
+        life_expectancy VARCHAR(100),
+        life_min INTEGER,
+        life_max INTEGER,
+        dag_id VARCHAR(255),
+        dag_run_id VARCHAR(255),
+        task_id VARCHAR(255),
+        execution_date TIMESTAMP WITH TIME ZONE,
+        asset_uri VARCHAR(500),
+        full_data JSONB,
+        content_hash VARCHAR(64)
+    ) ON COMMIT DROP;
+"""
+
+COPY_SQL = f"COPY {STAGING_TABLE} ({', '.join(LOAD_COLUMNS)}) FROM STDIN"
+
+# Autovacuum never analyzes temp tables; without row counts the planner
+# nested-loops the staged rows against breeds in the merges below
+ANALYZE_STAGING_SQL = f"ANALYZE {STAGING_TABLE}"
+
+# DISTINCT ON keeps one row per conflict key (ON CONFLICT cannot touch the
+# same row twice in one statement); ctid DESC makes the last copied row win.
+# The WHERE clause on DO UPDATE skips breeds whose content hash is unchanged,
+# so no dead tuple, WAL record or updated_at trigger call is produced for them;
+# xmax = 0 identifies freshly inserted rows in RETURNING
+MERGE_BREEDS_SQL = f"""
+    WITH merged AS (
+        INSERT INTO breeds ({', '.join(BREED_COLUMNS)})
+        SELECT DISTINCT ON (api_id) {', '.join(BREED_COLUMNS)}
+        FROM {STAGING_TABLE}
+        ORDER BY api_id, ctid DESC
+        ON CONFLICT (api_id)
+        DO UPDATE SET
+            breed_name = EXCLUDED.breed_name,
+            description = EXCLUDED.description,
+            life_expectancy = EXCLUDED.life_expectancy,
+            life_min = EXCLUDED.life_min,
+            life_max = EXCLUDED.life_max,
+            full_data = EXCLUDED.full_data,
+            content_hash = EXCLUDED.content_hash,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE breeds.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+        RETURNING (xmax = 0) AS inserted
+    )
+    SELECT
+        (SELECT COUNT(DISTINCT api_id) FROM {STAGING_TABLE}) AS breeds_staged,
+        COUNT(*) FILTER (WHERE inserted) AS breeds_inserted,
+        COUNT(*) FILTER (WHERE NOT inserted) AS breeds_updated
+    FROM merged
+"""
+
+# Run metadata is immutable, so a run that is already recorded is left as is
+MERGE_RUNS_SQL = f"""
+    INSERT INTO ingest_runs ({', '.join(RUN_COLUMNS)})
+    SELECT DISTINCT ON (dag_run_id) {', '.join(RUN_COLUMNS)}
+    FROM {STAGING_TABLE}
+    ORDER BY dag_run_id, ctid DESC
+    ON CONFLICT (dag_run_id) DO NOTHING
+"""
+
+# Observations are immutable too, so a re-run of the same batch inserts
+# nothing. execution_date is in the conflict key only because the table is
+# partitioned on it; it is fixed per run, so the key is still run + breed.
+# A row counts as updated when its observation already existed but its breed
+# was rewritten in this transaction (updated_at is the transaction start
+# time, CURRENT_TIMESTAMP, for exactly those breeds)
+MERGE_OBSERVATIONS_SQL = f"""
+    WITH batch AS (
+        SELECT DISTINCT ON (runs.id, breeds.id)
+            runs.id AS ingest_run_id,
+            breeds.id AS breed_id,
+            runs.execution_date,
+            breeds.updated_at = CURRENT_TIMESTAMP AS breed_changed
+        FROM {STAGING_TABLE} staged
+        JOIN ingest_runs runs ON runs.dag_run_id = staged.dag_run_id
+        JOIN breeds ON breeds.api_id = staged.api_id
+        ORDER BY runs.id, breeds.id
+    ),
+    inserted AS (
+        INSERT INTO breed_observations (ingest_run_id, breed_id, execution_date)
+        SELECT ingest_run_id, breed_id, execution_date FROM batch
+        ON CONFLICT (ingest_run_id, breed_id, execution_date) DO NOTHING
+        RETURNING ingest_run_id, breed_id
+    )
+    SELECT
+        COUNT(*) AS rows_unique,
+        COUNT(inserted.breed_id) AS rows_inserted,
+        COUNT(*) FILTER (WHERE inserted.breed_id IS NULL AND batch.breed_changed) AS rows_updated
+    FROM batch
+    LEFT JOIN inserted ON inserted.ingest_run_id = batch.ingest_run_id AND inserted.breed_id = batch.breed_id
+"""
+
+
+def _copy_value(value):
+    """Format a Python value for Postgres COPY text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    elif hasattr(value, 'isoformat'):
+        value = value.isoformat()
+    else:
+        value = str(value)
+    return (
+        value.replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+class RecordStream(io.TextIOBase):
+    """
+    File-like object that renders breed records as COPY text lines on demand,
+    so copy_expert can stream a batch without building it in memory first
+    """
+
+    def __init__(self, records):
+        self._records = iter(records)
+        self._buffer = ''
+        self.rows = 0
+
+    def readable(self):
+        return True
+
+    def _next_line(self):
+        record = next(self._records)
+        self.rows += 1
+        return '\t'.join(_copy_value(record.get(column)) for column in LOAD_COLUMNS) + '\n'
+
+    def read(self, size=-1):
+        try:
+            while size < 0 or len(self._buffer) < size:
+                self._buffer += self._next_line()
+        except StopIteration:
+            pass
+        if size < 0:
+            chunk, self._buffer = self._buffer, ''
+        else:
+            chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+    def readline(self, size=-1):
+        return self.read(size)
+
+
+def load_breeds(conn, records):
+    """
+    Load a batch of breed records into breeds, ingest_runs and breed_observations
+
+    `records` is an iterable of dicts keyed by LOAD_COLUMNS. The caller owns
+    the transaction: nothing is committed here, so the batch can be written
+    atomically together with other statements
+    Returns a dict with staged/inserted/updated/skipped observation (rows_*)
+    and breed (breeds_*, content-hash skips) counts and timings
+    """
+    start_time = time.monotonic()
+    stream = RecordStream(records)
+
+    with conn.cursor() as cursor:
+        cursor.execute(CREATE_STAGING_SQL)
+        cursor.copy_expert(COPY_SQL, stream)
+        copy_seconds = time.monotonic() - start_time
+        cursor.execute(ANALYZE_STAGING_SQL)
+
+        cursor.execute(MERGE_BREEDS_SQL)
+        breeds_staged, breeds_inserted, breeds_updated = cursor.fetchone()
+
+        cursor.execute(MERGE_RUNS_SQL)
+
+        cursor.execute(MERGE_OBSERVATIONS_SQL)
+        rows_unique, rows_inserted, rows_updated = cursor.fetchone()
+
+    rows_skipped = rows_unique - rows_inserted - rows_updated
+    # Breeds whose content hash was unchanged, so the merge left them alone
+    breeds_skipped = breeds_staged - breeds_inserted - breeds_updated
+    elapsed_seconds = time.monotonic() - start_time
+    logger.info(
+        f"Bulk loaded {stream.rows} staged rows: {rows_inserted} observations inserted, "
+        f"{rows_updated} updated, {rows_skipped} unchanged; breeds {breeds_inserted} new, "
+        f"{breeds_updated} changed, {breeds_skipped} unchanged in {elapsed_seconds:.2f}s (COPY {copy_seconds:.2f}s)"
+    )
+
+    return {
+        'rows_staged': stream.rows,
+        'rows_merged': rows_inserted + rows_updated,
+        'rows_inserted': rows_inserted,
+        'rows_updated': rows_updated,
+        'rows_skipped': rows_skipped,
+        'breeds_inserted': breeds_inserted,
+        'breeds_updated': breeds_updated,
+        'breeds_skipped': breeds_skipped,
+        'copy_seconds': round(copy_seconds, 3),
+        'elapsed_seconds': round(elapsed_seconds, 3),
+    }
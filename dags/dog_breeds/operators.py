@@ -0,0 +1,99 @@
+"""
+Operators for the dog breed DAGs
+Imported by DAG files at parse time, so the HTTP stack (requests/httpx) is
+only imported when a task actually runs
+"""
+
+import json
+
+from airflow.configuration import conf
+from airflow.exceptions import AirflowException
+from airflow.sdk import BaseOperator
+
+
+class DeferrableApiFetchOperator(BaseOperator):
+    """
+    Fetch one Dog API document in the triggerer, then process it on a worker
+
+    While deferred the task holds no worker slot; it resumes only to run
+    `python_callable(document=..., fetch_stats=..., **context)`, which does the
+    transform and load. The worker's HTTP cache still applies: the trigger
+    sends the cached validators and a 304 resumes with the cached body. A
+    fresh body is passed through the same cache, so the triggerer and the
+    workers should share DOG_BREEDS_HTTP_CACHE_DIR; otherwise the worker
+    fetches it again.
+
+    `should_defer(context)` can opt a run out of deferral (e.g. modes that
+    fetch many pages themselves); the callable is then invoked with the
+    context only and does its own fetching, like a PythonOperator
+    """
+
+    ui_color = '#e8d5f5'
+
+    def __init__(
+        self,
+        *,
+        api_url,
+        python_callable,
+        should_defer=None,
+        deferrable=conf.getboolean('operators', 'default_deferrable', fallback=False),
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.api_url = api_url
+        self.python_callable = python_callable
+        self.should_defer = should_defer
+        self.deferrable = deferrable
+
+    def execute(self, context):
+        if not self.deferrable or (self.should_defer and not self.should_defer(context)):
+            self.log.info(f"Fetching {self.api_url} on the worker (not deferred)")
+            return self.python_callable(**context)
+
+        from dog_breeds.http_cache import HttpCache
+        from dog_breeds.triggers import DogApiFetchTrigger
+
+        headers = HttpCache().conditional_headers(self.api_url)
+        self.log.info(f"Deferring GET {self.api_url} to the triggerer (conditional: {bool(headers)})")
+        self.defer(
+            trigger=DogApiFetchTrigger(self.api_url, headers=headers),
+            method_name='execute_complete',
+        )
+
+    def execute_complete(self, context, event):
+        if event.get('status') != 'success':
+            raise AirflowException(f"Deferred fetch of {event.get('url')} failed: {event.get('message')}")
+
+        from dog_breeds.http_cache import HttpCache
+
+        http_cache = HttpCache()
+        body = None
+        if event['status_code'] == 304:
+            body = http_cache.cached_body(self.api_url)
+            if body is None:
+                # The cached copy disappeared while the task was deferred
+                self.log.warning(f"Cached body for {self.api_url} is gone, fetching it again on the worker")
+        elif event.get('cached'):
+            # Stored by the trigger; the validators tell it apart from an older copy
+            body = http_cache.stored_body(self.api_url, {'etag': event.get('etag'), 'last_modified': event.get('last_modified')})
+            if body is None:
+                self.log.warning(
+                    f"Body of {self.api_url} stored by the triggerer is not in this worker's HTTP cache "
+                    f"(DOG_BREEDS_HTTP_CACHE_DIR not shared?), fetching it again on the worker"
+                )
+            else:
+                http_cache.stats.misses += 1
+                http_cache.stats.bytes_downloaded += len(body)
+        if body is None:
+            body = http_cache.get(self.api_url)
+
+        fetch_stats = {
+            'deferred': True,
+            'http_cache': http_cache.stats.as_dict(),
+            'http_requests': {
+                'requests': event['attempts'],
+                'retries': event['attempts'] - 1,
+                'total_seconds': event['elapsed_seconds'],
+            },
+        }
+        return self.python_callable(document=json.loads(body), fetch_stats=fetch_stats, **context)
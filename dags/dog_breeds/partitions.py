@@ -0,0 +1,65 @@
+"""
+Monthly partition maintenance for breed_observations
+Thin wrappers around the create_breed_observation_partitions and
+drop_breed_observation_partitions functions in database/schema.sql, which
+do the DDL; this module works out the month boundaries (UTC) from the
+configured horizon and retention
+"""
+
+import logging
+import os
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+# Months of partitions to keep created ahead of the current one
+PARTITION_MONTHS_AHEAD = int(os.getenv('DOG_BREEDS_PARTITION_MONTHS_AHEAD', '3'))
+# Full months kept before the current one; older partitions are removed
+RETENTION_MONTHS = int(os.getenv('DOG_BREEDS_RETENTION_MONTHS', '12'))
+# 'drop' deletes expired partitions, 'detach' leaves them as standalone tables
+RETENTION_MODE = os.getenv('DOG_BREEDS_RETENTION_MODE', 'drop')
+RETENTION_MODES = ('drop', 'detach')
+
+
+def add_months(moment, months):
+    """First instant (UTC) of the month `months` away from `moment`'s month"""
+    index = moment.year * 12 + moment.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def create_partitions(conn, months_ahead=PARTITION_MONTHS_AHEAD, now=None):
+    """
+    Make sure partitions exist from the current month through `months_ahead`
+    months ahead; returns the names of the partitions created
+    """
+    now = now or datetime.now(timezone.utc)
+    first_month, last_month = add_months(now, 0), add_months(now, months_ahead)
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT create_breed_observation_partitions(%s, %s)",
+            (first_month, last_month),
+        )
+        created = [row[0] for row in cursor.fetchall()]
+    logger.info(f"Partitions {first_month:%Y-%m} to {last_month:%Y-%m} in place, created {created or 'none'}")
+    return created
+
+
+def apply_retention(conn, retention_months=RETENTION_MONTHS, mode=RETENTION_MODE, now=None):
+    """
+    Remove the partitions of months older than `retention_months` full months
+    before the current one; returns (cutoff, names of the partitions removed)
+    """
+    if mode not in RETENTION_MODES:
+        raise ValueError(f"Unknown retention mode {mode!r}, expected one of {RETENTION_MODES}")
+    if retention_months < 1:
+        raise ValueError("retention_months must be at least 1")
+
+    cutoff = add_months(now or datetime.now(timezone.utc), -retention_months)
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT drop_breed_observation_partitions(%s, %s)",
+            (cutoff, mode == 'detach'),
+        )
+        removed = [row[0] for row in cursor.fetchall()]
+    logger.info(f"Retention before {cutoff:%Y-%m-%d} ({mode}): {removed or 'nothing to remove'}")
+    return cutoff, removed
@@ -0,0 +1,240 @@
+"""
+Write-behind spool for breed records that could not be written to PostgreSQL
+Failed records are journaled in a local SQLite database keyed by
+(dag_run_id, breed_name), so spooling the same record twice keeps one copy.
+The next run flushes the spool through the bulk loader before its own
+writes, and entries are only removed once PostgreSQL has committed them.
+A record the database keeps rejecting is retried on its own and moved to
+a quarantine table after SPOOL_MAX_ATTEMPTS, so it never blocks the rest
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import closing
+
+import psycopg2
+
+from dog_breeds.breeds import breed_api_id
+from dog_breeds.loader import load_breeds
+
+logger = logging.getLogger(__name__)
+
+SPOOL_PATH = os.getenv(
+    'DOG_BREEDS_SPOOL_PATH',
+    os.path.join(tempfile.gettempdir(), 'dog_breeds_spool.sqlite3'),
+)
+# Seconds to wait for the SQLite lock when several tasks spool at once
+SPOOL_LOCK_TIMEOUT = float(os.getenv('DOG_BREEDS_SPOOL_LOCK_TIMEOUT', '30'))
+# Failed write attempts (spooling included) before a record is quarantined
+SPOOL_MAX_ATTEMPTS = int(os.getenv('DOG_BREEDS_SPOOL_MAX_ATTEMPTS', '5'))
+
+CREATE_SPOOL_SQL = """
+    CREATE TABLE IF NOT EXISTS spooled_records (
+        dag_run_id TEXT NOT NULL,
+        breed_name TEXT NOT NULL,
+        record TEXT NOT NULL,
+        spooled_at REAL NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 1,
+        last_error TEXT,
+        PRIMARY KEY (dag_run_id, breed_name)
+    )
+"""
+
+# Records given up on, kept for inspection instead of being retried
+CREATE_QUARANTINE_SQL = """
+    CREATE TABLE IF NOT EXISTS quarantined_records (
+        dag_run_id TEXT NOT NULL,
+        breed_name TEXT NOT NULL,
+        record TEXT NOT NULL,
+        spooled_at REAL NOT NULL,
+        attempts INTEGER NOT NULL,
+        last_error TEXT,
+        quarantined_at REAL NOT NULL,
+        PRIMARY KEY (dag_run_id, breed_name)
+    )
+"""
+
+# Re-spooling a key replaces the record, so the latest version wins
+SPOOL_SQL = """
+    INSERT INTO spooled_records (dag_run_id, breed_name, record, spooled_at, last_error)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (dag_run_id, breed_name) DO UPDATE SET
+        record = excluded.record,
+        spooled_at = excluded.spooled_at,
+        attempts = spooled_records.attempts + 1,
+        last_error = excluded.last_error
+"""
+
+
+def _spooled_record(payload):
+    """Decode a spooled record; records spooled before the normalized schema lack api_id"""
+    record = json.loads(payload)
+    if not record.get('api_id'):
+        full_data = record.get('full_data') or {}
+        record['full_data'] = {key: value for key, value in full_data.items() if key not in ('asset_uri', 'airflow_metadata')}
+        record['api_id'] = breed_api_id(record['full_data'], record['breed_name'])
+    return record
+
+
+class WriteBehindSpool:
+    """Durable local journal of breed records waiting to be written to PostgreSQL"""
+
+    def __init__(self, path=SPOOL_PATH):
+        self.path = path
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=SPOOL_LOCK_TIMEOUT)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(CREATE_SPOOL_SQL)
+        conn.execute(CREATE_QUARANTINE_SQL)
+        return conn
+
+    def append(self, records, error=None):
+        """Journal loader records; returns the number of records spooled"""
+        rows = [
+            (
+                record['dag_run_id'],
+                record['breed_name'],
+                json.dumps(record, default=lambda value: value.isoformat()),
+                time.time(),
+                str(error) if error else None,
+            )
+            for record in records
+        ]
+        with closing(self._connect()) as spool, spool:
+            spool.executemany(SPOOL_SQL, rows)
+        logger.warning(f"📥 Spooled {len(rows)} breed record(s) to {self.path} for the next run")
+        return len(rows)
+
+    def pending(self):
+        """Number of records waiting in the spool"""
+        if not os.path.exists(self.path):
+            return 0
+        with closing(self._connect()) as spool:
+            return spool.execute('SELECT COUNT(*) FROM spooled_records').fetchone()[0]
+
+    def quarantined(self):
+        """Number of records given up on"""
+        if not os.path.exists(self.path):
+            return 0
+        with closing(self._connect()) as spool:
+            return spool.execute('SELECT COUNT(*) FROM quarantined_records').fetchone()[0]
+
+    def _load(self, conn, entries, savepoint):
+        """load_breeds inside a savepoint; a rejected batch is rolled back to it and re-raised"""
+        with conn.cursor() as cursor:
+            cursor.execute(f"SAVEPOINT {savepoint}")
+            try:
+                load_stats = load_breeds(conn, (_spooled_record(entry[2]) for entry in entries))
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                # The connection is gone: nothing to roll back to
+                raise
+            except Exception:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+                raise
+            cursor.execute(f"RELEASE SAVEPOINT {savepoint}")
+        return load_stats
+
+    def flush(self, conn):
+        """
+        Write every spooled record to PostgreSQL in one bulk load and commit
+        If the database rejects the batch, each record is loaded on its own
+        and the ones it still rejects stay spooled with attempts + 1, or are
+        quarantined once they reach SPOOL_MAX_ATTEMPTS. Connection errors
+        are raised. Entries are deleted only after the commit, and only if
+        they were not re-spooled meanwhile; a crash in between just replays
+        an idempotent merge
+        Returns the loader stats plus rows_failed/rows_quarantined, or None
+        if the spool was empty
+        """
+        if not os.path.exists(self.path):
+            return None
+        with closing(self._connect()) as spool:
+            entries = spool.execute(
+                'SELECT dag_run_id, breed_name, record, spooled_at FROM spooled_records ORDER BY spooled_at'
+            ).fetchall()
+            if not entries:
+                return None
+
+            logger.info(f"Flushing {len(entries)} spooled breed record(s) from {self.path}")
+            failed = []
+            try:
+                load_stats = self._load(conn, entries, 'spool_flush')
+                loaded = entries
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                raise
+            except Exception as batch_error:
+                logger.warning(f"⚠️ Spooled batch was rejected ({batch_error}), retrying record by record")
+                load_stats, loaded = None, []
+                for entry in entries:
+                    try:
+                        entry_stats = self._load(conn, [entry], 'spool_flush_record')
+                    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                        raise
+                    except Exception as record_error:
+                        logger.error(f"❌ Spooled record {entry[1]} ({entry[0]}) was rejected: {record_error}")
+                        failed.append((entry, str(record_error)))
+                        continue
+                    loaded.append(entry)
+                    load_stats = entry_stats if load_stats is None else {
+                        key: load_stats[key] + value for key, value in entry_stats.items()
+                    }
+            conn.commit()
+
+            now = time.time()
+            with spool:
+                spool.executemany(
+                    'DELETE FROM spooled_records WHERE dag_run_id = ? AND breed_name = ? AND spooled_at = ?',
+                    [(dag_run_id, breed_name, spooled_at) for dag_run_id, breed_name, _, spooled_at in loaded],
+                )
+                spool.executemany(
+                    'UPDATE spooled_records SET attempts = attempts + 1, last_error = ? '
+                    'WHERE dag_run_id = ? AND breed_name = ? AND spooled_at = ?',
+                    [(error, dag_run_id, breed_name, spooled_at) for (dag_run_id, breed_name, _, spooled_at), error in failed],
+                )
+                spool.execute(
+                    'INSERT OR REPLACE INTO quarantined_records '
+                    'SELECT dag_run_id, breed_name, record, spooled_at, attempts, last_error, ? '
+                    'FROM spooled_records WHERE attempts >= ?',
+                    (now, SPOOL_MAX_ATTEMPTS),
+                )
+                quarantined = spool.execute(
+                    'DELETE FROM spooled_records WHERE attempts >= ?', (SPOOL_MAX_ATTEMPTS,)
+                ).rowcount
+
+        load_stats = dict(load_stats or {'rows_staged': 0, 'rows_merged': 0, 'rows_skipped': 0})
+        load_stats['rows_failed'] = len(failed)
+        load_stats['rows_quarantined'] = quarantined
+        if quarantined:
+            logger.error(
+                f"🚫 Quarantined {quarantined} spooled record(s) after {SPOOL_MAX_ATTEMPTS} failed attempts "
+                f"(table quarantined_records in {self.path})"
+            )
+        logger.info(
+            f"✅ Flushed spool: {load_stats['rows_merged']} written, {load_stats['rows_skipped']} unchanged, "
+            f"{len(failed)} rejected"
+        )
+        return load_stats
+
+
+def flush_spool(conn, spool=None):
+    """
+    Flush the spool before a run's own writes without letting it fail the run
+    Errors are logged and rolled back, and the run carries on; returns the
+    flush stats, or None if the spool was empty or could not be flushed
+    """
+    spool = spool or WriteBehindSpool()
+    try:
+        return spool.flush(conn)
+    except Exception as flush_error:
+        logger.error(f"❌ Flushing the spool failed, continuing with this run's writes: {flush_error}")
+        try:
+            conn.rollback()
+        except psycopg2.Error as rollback_error:
+            logger.warning(f"Rollback after the failed flush failed too: {rollback_error}")
+        return None
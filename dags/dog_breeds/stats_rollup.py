@@ -0,0 +1,51 @@
+"""
+Consistency check for the breed_stats_rollup table
+The rollup is maintained by a trigger on breed_observations and by
+partition retention (see database/schema.sql); this recounts the stats from
+breed_observations, compares them with the rollup and rebuilds it on drift
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+DRIFT_COLUMNS = (
+    'dag_id',
+    'rollup_total',
+    'actual_total',
+    'rollup_unique',
+    'actual_unique',
+    'rollup_latest',
+    'actual_latest',
+)
+
+
+def find_drift(conn):
+    """
+    Recount the stats and return the rollup rows that disagree, as dicts
+    Holds a SHARE lock on the rollup so in-flight loads commit first and new
+    ones wait; the caller's transaction ends the lock
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("LOCK TABLE breed_stats_rollup IN SHARE MODE")
+        cursor.execute(f"SELECT {', '.join(DRIFT_COLUMNS)} FROM breed_stats_rollup_drift() ORDER BY dag_id")
+        return [dict(zip(DRIFT_COLUMNS, row)) for row in cursor.fetchall()]
+
+
+def check_stats_rollup(conn, repair=True):
+    """
+    Compare the rollup with a full recount; rebuild it if they differ and
+    `repair` is set. Returns the drifted rows found before any repair
+    """
+    drift = find_drift(conn)
+    if not drift:
+        logger.info("Stats rollup matches breed_observations")
+        return drift
+
+    for row in drift:
+        logger.warning(f"Stats rollup drift: {row}")
+    if repair:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT refresh_breed_stats_rollup()")
+        logger.info(f"Rebuilt the stats rollup ({len(drift)} row(s) had drifted)")
+    return drift
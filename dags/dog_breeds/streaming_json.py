@@ -0,0 +1,143 @@
+"""
+Incremental JSON parsing for large API documents
+Yields the elements of one top-level array (by default `data`) one at a time
+while the body is still being read, so only the current element and a small
+read buffer are held in memory regardless of the payload size. Built on the
+standard library's JSONDecoder.raw_decode, so no extra dependency is needed
+"""
+
+import codecs
+import json
+
+WHITESPACE = ' \t\n\r'
+READ_CHUNK_BYTES = 64 * 1024
+
+
+class StreamingJsonArray:
+    """
+    Iterate the elements of `array_key` in a JSON object read from `chunks`
+    (an iterable of bytes, e.g. response.iter_content()). A top-level JSON
+    array is streamed as-is. The other top-level keys of the object (such as
+    `links` and `meta`) are collected in `.metadata` and are complete once
+    iteration has finished
+    """
+
+    def __init__(self, chunks, array_key='data'):
+        self._chunks = iter(chunks)
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self.array_key = array_key
+        self.metadata = {}
+        self.items_parsed = 0
+
+    # Buffer management
+
+    def _fill(self):
+        """Read the next chunk into the buffer; returns False at end of input"""
+        if self._eof:
+            return False
+        # Drop consumed text so the buffer does not grow with the document
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        for chunk in self._chunks:
+            if chunk:
+                self._buffer += self._utf8.decode(chunk)
+                return True
+        self._buffer += self._utf8.decode(b'', final=True)
+        self._eof = True
+        return False
+
+    def _peek(self):
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document")
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self._pos}, found {self._buffer[self._pos]!r}")
+        self._pos += 1
+
+    def _decode_value(self):
+        """Decode one complete JSON value, reading more input until it fits in the buffer"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and not self._eof and self._buffer[end - 1] not in '}]"':
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    # Parsing
+
+    def _iter_array(self):
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self._decode_value()
+            self.items_parsed += 1
+            separator = self._peek()
+            self._pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or ']' in array, found {separator!r}")
+
+    def _finish(self):
+        """Consume the rest of the input so chunk producers (e.g. a cache writer) run to completion"""
+        while self._fill():
+            if self._buffer[self._pos:].strip(WHITESPACE):
+                raise ValueError("Unexpected data after the end of the JSON document")
+
+    def __iter__(self):
+        yield from self._iter_document()
+        self._finish()
+
+    def _iter_document(self):
+        if self._peek() == '[':
+            yield from self._iter_array()
+            return
+
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self._decode_value()
+            self._expect(':')
+            if key == self.array_key and self._peek() == '[':
+                yield from self._iter_array()
+            else:
+                self.metadata[key] = self._decode_value()
+            separator = self._peek()
+            self._pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or '}}' in object, found {separator!r}")
+
+
+def iter_file_chunks(path, chunk_size=READ_CHUNK_BYTES):
+    """Read a file (a path, or a binary file object that is read from and closed) as an iterable of byte chunks"""
+    with (path if hasattr(path, 'read') else open(path, 'rb')) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
@@ -0,0 +1,100 @@
+"""
+Async triggers for the Dog API
+Run in the Airflow triggerer, so a deferred task does not hold a worker
+slot while it waits on the API. The trigger performs one conditional GET
+(with the same retry/backoff policy as the shared HTTP client), stores a
+fresh body in the HTTP cache and hands only the status and validators back
+to the task in its TriggerEvent
+"""
+
+import asyncio
+import time
+
+import httpx
+from airflow.triggers.base import BaseTrigger, TriggerEvent
+
+from dog_breeds.http_client import (
+    BACKOFF_MAX,
+    CONNECT_TIMEOUT,
+    MAX_RETRIES,
+    READ_TIMEOUT,
+    RETRY_STATUSES,
+    backoff_delay,
+)
+from dog_breeds.http_cache import HttpCache
+
+
+class DogApiFetchTrigger(BaseTrigger):
+    """
+    GET one Dog API document and fire an event with the response
+
+    `headers` are sent as-is, typically the If-None-Match/If-Modified-Since
+    validators of the worker's cached copy. A fresh body is written to the
+    HttpCache (DOG_BREEDS_HTTP_CACHE_DIR) instead of the event, which the
+    Airflow metadata DB keeps until the task resumes; the event only carries
+    the status and validators, and `cached` says whether the body was stored
+    """
+
+    def __init__(self, url, headers=None):
+        super().__init__()
+        self.url = url
+        self.headers = headers or {}
+
+    def serialize(self):
+        return (
+            'dog_breeds.triggers.DogApiFetchTrigger',
+            {'url': self.url, 'headers': self.headers},
+        )
+
+    async def run(self):
+        start = time.monotonic()
+        timeout = httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT, pool=BACKOFF_MAX)
+
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            for attempt in range(MAX_RETRIES + 1):
+                try:
+                    response = await client.get(self.url, headers=self.headers)
+                except httpx.TransportError as e:
+                    if attempt >= MAX_RETRIES:
+                        yield TriggerEvent({'status': 'error', 'url': self.url, 'message': str(e)})
+                        return
+                    delay = backoff_delay(attempt)
+                    self.log.warning(f"GET {self.url} failed ({e}), retrying in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+                    continue
+
+                if response.status_code in RETRY_STATUSES and attempt < MAX_RETRIES:
+                    delay = backoff_delay(attempt, response.headers.get('Retry-After'))
+                    self.log.warning(f"GET {self.url} returned {response.status_code}, retrying in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+                    continue
+                break
+
+        elapsed_seconds = round(time.monotonic() - start, 4)
+        if response.status_code != 304 and response.is_error:
+            yield TriggerEvent({
+                'status': 'error',
+                'url': self.url,
+                'message': f"HTTP {response.status_code}: {response.text[:500]}",
+            })
+            return
+
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+        cached = False
+        if response.status_code != 304:
+            # File I/O off the triggerer's event loop
+            cached = await asyncio.to_thread(HttpCache().store, self.url, response.content, validators)
+
+        self.log.info(f"GET {self.url} returned {response.status_code} after {attempt + 1} attempt(s) in {elapsed_seconds}s")
+        yield TriggerEvent({
+            'status': 'success',
+            'url': self.url,
+            'status_code': response.status_code,
+            'cached': cached,
+            **validators,
+            'attempts': attempt + 1,
+            'elapsed_seconds': elapsed_seconds,
+        })
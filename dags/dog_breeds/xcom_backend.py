@@ -0,0 +1,193 @@
+"""
+XCom backend that keeps large values out of the Airflow metadata DB
+
+Values whose serialized size exceeds a threshold are written (optionally
+gzip-compressed) to a filesystem/object-store path and only a short
+reference string is stored as the XCom row. Reads are lazy: the payload is
+fetched the first time the value is accessed (dict values; other types
+are read when the XCom is pulled).
+
+Enable with:
+    AIRFLOW__CORE__XCOM_BACKEND=dog_breeds.xcom_backend.OffloadingXComBackend
+
+Configuration (environment):
+    DOG_BREEDS_XCOM_PATH         base path, any fsspec URL (default file:///tmp/dog_breeds_xcom)
+    DOG_BREEDS_XCOM_THRESHOLD    size in bytes above which values are offloaded (default 4096)
+    DOG_BREEDS_XCOM_COMPRESSION  gzip or none (default gzip)
+    DOG_BREEDS_XCOM_RETENTION_DAYS  days an offloaded run's payloads are kept (default 30)
+
+Payloads are deleted by purge() when Airflow clears the XCom row, but not
+when runs are deleted or the metadata DB is cleaned up, so the
+dog_breed_xcom_cleanup DAG deletes run directories older than the retention
+period (purge_expired_payloads).
+"""
+
+import gzip
+import json
+import logging
+import os
+import time
+import uuid
+from collections.abc import Mapping
+
+from airflow.sdk import ObjectStoragePath
+from airflow.utils.json import XComDecoder, XComEncoder
+
+try:
+    from airflow.sdk.bases.xcom import BaseXCom
+    # What BaseXCom.serialize_value stores for a JSON document: the text itself
+    def _stored_json(text):
+        return text
+except ImportError:  # Airflow < 3.0
+    from airflow.models.xcom import BaseXCom
+    # Airflow 2 stores the UTF-8 bytes
+    def _stored_json(text):
+        return text.encode('utf-8')
+
+logger = logging.getLogger(__name__)
+
+XCOM_PATH = os.getenv('DOG_BREEDS_XCOM_PATH', 'file:///tmp/dog_breeds_xcom')
+XCOM_THRESHOLD = int(os.getenv('DOG_BREEDS_XCOM_THRESHOLD', '4096'))
+XCOM_COMPRESSION = os.getenv('DOG_BREEDS_XCOM_COMPRESSION', 'gzip')
+XCOM_RETENTION_DAYS = int(os.getenv('DOG_BREEDS_XCOM_RETENTION_DAYS', '30'))
+
+# Prefix that marks a stored XCom value as a reference to an offloaded payload.
+# References look like dog-breeds-xcom://<kind>/<storage url>, where kind is
+# `mapping` for dicts (read lazily) or `value` for everything else (read eagerly)
+REFERENCE_PREFIX = 'dog-breeds-xcom://'
+KIND_MAPPING = 'mapping'
+KIND_VALUE = 'value'
+
+
+def _parse_reference(reference):
+    """Split a reference string into (kind, ObjectStoragePath)"""
+    kind, url = reference[len(REFERENCE_PREFIX):].split('/', 1)
+    return kind, ObjectStoragePath(url)
+
+
+def _read_payload(path):
+    with path.open('rb') as f:
+        data = f.read()
+    if path.name.endswith('.gz'):
+        data = gzip.decompress(data)
+    return json.loads(data, cls=XComDecoder)
+
+
+class LazyXComValue(Mapping):
+    """
+    Read-only view of an offloaded dict XCom value; the payload is loaded on first access
+    Behaves like the original dict for .get(), [] and iteration
+    """
+
+    def __init__(self, reference):
+        self.reference = reference
+        self._value = None
+        self._loaded = False
+
+    def load(self):
+        if not self._loaded:
+            _, path = _parse_reference(self.reference)
+            logger.info(f"Loading offloaded XCom value from {path}")
+            self._value = _read_payload(path)
+            self._loaded = True
+        return self._value
+
+    def __getitem__(self, key):
+        return self.load()[key]
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __len__(self):
+        return len(self.load())
+
+    def __repr__(self):
+        if self._loaded:
+            return repr(self._value)
+        return f"LazyXComValue({self.reference!r})"
+
+
+class OffloadingXComBackend(BaseXCom):
+    """Store large XCom values outside the metadata DB, keeping a reference row"""
+
+    @staticmethod
+    def serialize_value(value, *, key=None, task_id=None, dag_id=None, run_id=None, map_index=None):
+        if isinstance(value, LazyXComValue):
+            value = value.load()
+        # Encoded once: small values are stored as they are, like BaseXCom
+        # would, instead of being encoded again by BaseXCom.serialize_value.
+        # XComEncoder escapes non-ASCII, so the length is the size in bytes
+        text = json.dumps(value, cls=XComEncoder)
+        if len(text) <= XCOM_THRESHOLD or not (dag_id and run_id and task_id):
+            return _stored_json(text)
+
+        serialized = text.encode('utf-8')
+        suffix = '.json'
+        if XCOM_COMPRESSION == 'gzip':
+            serialized = gzip.compress(serialized)
+            suffix += '.gz'
+
+        map_part = f"_{map_index}" if map_index is not None and map_index >= 0 else ''
+        path = ObjectStoragePath(XCOM_PATH) / dag_id / run_id / f"{task_id}{map_part}" / f"{key}_{uuid.uuid4().hex}{suffix}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open('wb') as f:
+            f.write(serialized)
+
+        logger.info(f"Offloaded XCom {dag_id}.{task_id}.{key} ({len(serialized)} bytes) to {path}")
+        kind = KIND_MAPPING if isinstance(value, dict) else KIND_VALUE
+        return BaseXCom.serialize_value(f"{REFERENCE_PREFIX}{kind}/{path}")
+
+    @staticmethod
+    def deserialize_value(result):
+        value = BaseXCom.deserialize_value(result)
+        if isinstance(value, str) and value.startswith(REFERENCE_PREFIX):
+            kind, path = _parse_reference(value)
+            if kind == KIND_MAPPING:
+                return LazyXComValue(value)
+            return _read_payload(path)
+        return value
+
+    @staticmethod
+    def purge(xcom, *args, **kwargs):
+        """Delete the offloaded payload when Airflow clears the XCom row"""
+        value = getattr(xcom, 'value', None)
+        try:
+            value = json.loads(value) if isinstance(value, (str, bytes)) else value
+        except ValueError:
+            return
+        if isinstance(value, str) and value.startswith(REFERENCE_PREFIX):
+            _, path = _parse_reference(value)
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"Could not delete offloaded XCom payload {path}: {e}")
+
+
+def purge_expired_payloads(retention_days=XCOM_RETENTION_DAYS):
+    """
+    Delete the payload directories of runs (XCOM_PATH/<dag_id>/<run_id>) whose
+    newest payload is older than `retention_days`; returns the deleted directories
+    """
+    base = ObjectStoragePath(XCOM_PATH)
+    if not base.exists():
+        return []
+    cutoff = time.time() - retention_days * 86400
+    expired = []
+    for dag_dir in base.iterdir():
+        if not dag_dir.is_dir():
+            continue
+        for run_dir in dag_dir.iterdir():
+            if not run_dir.is_dir():
+                continue
+            files = [path for path in run_dir.rglob('*') if path.is_file()]
+            try:
+                newest = max((path.stat().st_mtime for path in files), default=None)
+            except (OSError, AttributeError, KeyError) as e:
+                # Stores that report no modification time are left alone
+                logger.warning(f"Could not read the age of offloaded XCom payloads in {run_dir}: {e}")
+                continue
+            if newest is not None and newest >= cutoff:
+                continue
+            run_dir.fs.rm(run_dir.path, recursive=True)
+            expired.append(str(run_dir))
+    return expired
@@ -1,14 +1,29 @@
 // Use Dog Breeds API (FastAPI backend connected to PostgreSQL)
 const DOG_BREEDS_API_URL = import.meta.env.VITE_DOG_BREEDS_API_URL || 'http://localhost:30800';
 
+// Last response per URL with its ETag; GETs revalidate it with If-None-Match
+// and a 304 (data unchanged since) is answered from here
+interface CachedResponse {
+  etag: string;
+  body: string;
+  headers: Headers;
+}
+const MAX_CACHED_RESPONSES = 100;
+const responseCache = new Map<string, CachedResponse>();
+
 // Helper function to make API fetch requests
 async function apiFetch(endpoint: string, options: RequestInit = {}): Promise<Response> {
   const url = `${DOG_BREEDS_API_URL}${endpoint}`;
+  const isGet = !options.method || options.method.toUpperCase() === 'GET';
+  const cached = isGet ? responseCache.get(url) : undefined;
   
   // Set headers
   const headers = new Headers(options.headers);
   headers.set('Content-Type', 'application/json');
   headers.set('Accept', 'application/json');
+  if (cached) {
+    headers.set('If-None-Match', cached.etag);
+  }
   
   // Debug: log request in development
   if (import.meta.env.DEV) {
@@ -21,6 +36,21 @@ async function apiFetch(endpoint: string, options: RequestInit = {}): Promise<Re
       headers,
     });
 
+    if (response.status === 304 && cached) {
+      return new Response(cached.body, { status: 200, headers: cached.headers });
+    }
+
+    const etag = response.headers.get('ETag');
+    if (isGet && response.ok && etag) {
+      const body = await response.text();
+      responseCache.delete(url);
+      responseCache.set(url, { etag, body, headers: response.headers });
+      if (responseCache.size > MAX_CACHED_RESPONSES) {
+        responseCache.delete(responseCache.keys().next().value as string);
+      }
+      return new Response(body, { status: response.status, headers: response.headers });
+    }
+
     if (!response.ok) {
       // Try to get error details from response
       let errorData = null;
@@ -111,6 +141,36 @@ export async function getRecentBreeds(dagId: string = 'dog_breed_fetcher', limit
   }
 }
 
+export interface BreedPage {
+  breeds: DogBreed[];
+  nextCursor: string | null;
+}
+
+/**
+ * Get one page of breeds with keyset pagination
+ * Pass the previous page's nextCursor to get the next page; null means there are no more
+ */
+export async function getBreedsPage(limit: number = 20, cursor?: string | null, dagId?: string): Promise<BreedPage> {
+  try {
+    const params = new URLSearchParams({ limit: String(limit) });
+    if (cursor) {
+      params.set('cursor', cursor);
+    }
+    if (dagId) {
+      params.set('dag_id', dagId);
+    }
+    const response = await apiFetch(`/api/breeds?${params.toString()}`);
+    const data = await response.json();
+    return {
+      breeds: Array.isArray(data) ? data : [],
+      nextCursor: response.headers.get('X-Next-Cursor'),
+    };
+  } catch (error) {
+    console.error('Error fetching breeds page:', error);
+    throw error;
+  }
+}
+
 /**
  * Get breed statistics from the database
  */
@@ -168,3 +228,37 @@ export async function checkHealth(): Promise<any> {
   }
 }
 
+export interface BreedStreamHandlers {
+  onBreed: (breed: DogBreed) => void;
+  onOpen?: () => void;
+  onError?: () => void;
+}
+
+/**
+ * Subscribe to new breed records as the DAG commits them (Server-Sent Events)
+ * Returns a function that closes the stream, or null if the browser has no
+ * EventSource (fall back to polling). The browser reconnects on its own after
+ * errors; onError/onOpen report the connection going down and up again
+ */
+export function subscribeToBreeds(dagId: string | undefined, handlers: BreedStreamHandlers): (() => void) | null {
+  if (typeof EventSource === 'undefined') {
+    return null;
+  }
+  const params = dagId ? `?dag_id=${encodeURIComponent(dagId)}` : '';
+  const source = new EventSource(`${DOG_BREEDS_API_URL}/api/breeds/stream${params}`);
+
+  source.addEventListener('breed', (event) => {
+    try {
+      handlers.onBreed(JSON.parse((event as MessageEvent).data));
+    } catch (error) {
+      console.error('Error parsing breed event:', error);
+    }
+  });
+  source.onopen = () => handlers.onOpen?.();
+  source.onerror = () => {
+    console.warn('Breed stream disconnected, the browser will reconnect');
+    handlers.onError?.();
+  };
+
+  return () => source.close();
+}
@@ -1,10 +1,10 @@
 import { useState, useEffect } from 'react';
-import { getRecentBreeds, getBreedSummary, checkHealth } from '../api';
+import { getRecentBreeds, getBreedSummary, checkHealth, subscribeToBreeds } from '../api';
 import { BreedCard } from './BreedCard';
 import type { DogBreed } from '../types';
 
 export function BreedDashboard() {
-  const [breeds, setBreeds] = useState<(DogBreed & { run_id?: string; start_date?: string; state?: string })[]>([]);
+  const [breeds, setBreeds] = useState<(DogBreed & { id?: string; run_id?: string; start_date?: string; state?: string })[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [refreshing, setRefreshing] = useState(false);
@@ -49,13 +49,51 @@ export function BreedDashboard() {
     checkApiHealth();
     fetchBreeds();
     
-    // Refresh every 30 seconds
-    const interval = setInterval(() => {
-      setRefreshing(true);
-      fetchBreeds();
-    }, 30000);
+    // Poll every 30 seconds only while the live stream is unavailable
+    let interval: ReturnType<typeof setInterval> | null = null;
+    const startPolling = () => {
+      if (!interval) {
+        interval = setInterval(() => {
+          setRefreshing(true);
+          fetchBreeds();
+        }, 30000);
+      }
+    };
+    const stopPolling = () => {
+      if (interval) {
+        clearInterval(interval);
+        interval = null;
+      }
+    };
 
-    return () => clearInterval(interval);
+    // New breeds are pushed by the API as soon as the DAG commits them
+    let streamOpened = false;
+    const closeStream = subscribeToBreeds('dog_breed_fetcher', {
+      onBreed: (breed) => {
+        setBreeds((current) => [breed, ...current.filter((b) => b.id !== breed.id)].slice(0, 20));
+      },
+      onOpen: () => {
+        setIsConnected(true);
+        stopPolling();
+        // Catch up on anything committed while the stream was down
+        if (streamOpened) {
+          fetchBreeds();
+        }
+        streamOpened = true;
+      },
+      onError: () => {
+        setIsConnected(false);
+        startPolling();
+      },
+    });
+    if (!closeStream) {
+      startPolling();
+    }
+
+    return () => {
+      closeStream?.();
+      stopPolling();
+    };
   }, []);
 
   const handleRefresh = () => {
@@ -159,7 +197,7 @@ export function BreedDashboard() {
         ) : (
           <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
             {breeds.map((breed, index) => (
-              <BreedCard key={breed.run_id || index} breed={breed} />
+              <BreedCard key={breed.id || breed.run_id || index} breed={breed} />
             ))}
           </div>
         )}
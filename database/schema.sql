@@ -10,16 +10,49 @@
 -- Create extension for UUID support
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
--- Dog breeds table
-CREATE TABLE IF NOT EXISTS dog_breeds (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+-- Trigram matching for substring and typo-tolerant breed name search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Breed catalog: one row per Dog API breed, keyed by the API's breed ID
+-- (api_id; records without an API ID use 'name:<breed_name>'). Written only
+-- when the breed's content_hash changes, so descriptions and API payloads are
+-- not duplicated for every DAG run
+CREATE TABLE IF NOT EXISTS breeds (
+    id INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    api_id VARCHAR(255) NOT NULL,
     breed_name VARCHAR(255) NOT NULL,
     description TEXT,
     life_expectancy VARCHAR(100),
     life_min INTEGER,
     life_max INTEGER,
     
-    -- Airflow metadata
+    -- API breed object as returned by the Dog API
+    full_data JSONB,
+    
+    -- SHA-256 of the API breed object; unchanged breeds are skipped on upsert
+    content_hash VARCHAR(64),
+    
+    -- Full-text document for search: name (weight A) and description (weight B)
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', COALESCE(breed_name, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(description, '')), 'B')
+    ) STORED,
+    
+    -- Timestamps
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    
+    CONSTRAINT unique_breed_api_id UNIQUE(api_id)
+);
+
+ALTER TABLE breeds ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', COALESCE(breed_name, '')), 'A') ||
+    setweight(to_tsvector('english', COALESCE(description, '')), 'B')
+) STORED;
+
+-- Airflow metadata, stored once per DAG run that wrote observations
+CREATE TABLE IF NOT EXISTS ingest_runs (
+    id INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
     dag_id VARCHAR(255) NOT NULL,
     dag_run_id VARCHAR(255) NOT NULL,
     task_id VARCHAR(255) NOT NULL,
@@ -28,23 +61,502 @@ CREATE TABLE IF NOT EXISTS dog_breeds (
     -- Asset metadata (linked to Airflow asset)
     asset_uri VARCHAR(500),
     
-    -- API response metadata (includes full_data and asset_uri in JSONB)
-    full_data JSONB,
-    
-    -- Timestamps
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     
-    -- Add index for common queries
-    CONSTRAINT unique_dag_run_breed UNIQUE(dag_run_id, breed_name)
+    CONSTRAINT unique_ingest_run UNIQUE(dag_run_id)
 );
 
+-- A breed_observations table created before partitioning is moved aside
+-- (with its index names freed) and copied into the partitioned table below;
+-- the views on it are recreated further down
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = current_schema() AND c.relname = 'breed_observations' AND c.relkind = 'r'
+    ) THEN
+        DROP VIEW IF EXISTS recent_breeds, dog_breeds;
+        ALTER TABLE breed_observations RENAME TO breed_observations_unpartitioned;
+        ALTER TABLE breed_observations_unpartitioned RENAME CONSTRAINT breed_observations_pkey TO breed_observations_unpartitioned_pkey;
+        ALTER TABLE breed_observations_unpartitioned RENAME CONSTRAINT unique_run_breed TO unique_run_breed_unpartitioned;
+        ALTER INDEX IF EXISTS idx_breed_observations_execution_date RENAME TO idx_breed_observations_unpartitioned_execution_date;
+        ALTER INDEX IF EXISTS idx_breed_observations_breed_id RENAME TO idx_breed_observations_unpartitioned_breed_id;
+    END IF;
+END $$;
+
+-- Breed observations: one narrow row per breed seen by a DAG run. The UUID
+-- id is the record id exposed by the API; execution_date is copied from the
+-- run so recent-first queries need no join to order.
+-- Range partitioned by month on execution_date: recent-first queries only
+-- scan the newest partitions, and retention drops whole partitions instead
+-- of deleting rows. The partition key has to be part of every unique
+-- constraint; execution_date is fixed per run, so unique_run_breed still
+-- means one row per breed per run
+CREATE TABLE IF NOT EXISTS breed_observations (
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
+    ingest_run_id INTEGER NOT NULL REFERENCES ingest_runs(id),
+    breed_id INTEGER NOT NULL REFERENCES breeds(id),
+    execution_date TIMESTAMP WITH TIME ZONE NOT NULL,
+    
+    CONSTRAINT breed_observations_pkey PRIMARY KEY (id, execution_date),
+    CONSTRAINT unique_run_breed UNIQUE(ingest_run_id, breed_id, execution_date)
+) PARTITION BY RANGE (execution_date);
+
+-- Catch-all for rows outside the monthly partitions (e.g. old backfills);
+-- create_breed_observation_partitions moves them out when their month is created
+CREATE TABLE IF NOT EXISTS breed_observations_default PARTITION OF breed_observations DEFAULT;
+
 -- Create indexes for better query performance
-CREATE INDEX IF NOT EXISTS idx_dog_breeds_dag_id ON dog_breeds(dag_id);
-CREATE INDEX IF NOT EXISTS idx_dog_breeds_execution_date ON dog_breeds(execution_date DESC);
-CREATE INDEX IF NOT EXISTS idx_dog_breeds_breed_name ON dog_breeds(breed_name);
-CREATE INDEX IF NOT EXISTS idx_dog_breeds_created_at ON dog_breeds(created_at DESC);
-CREATE INDEX IF NOT EXISTS idx_dog_breeds_asset_uri ON dog_breeds(asset_uri) WHERE asset_uri IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_breeds_breed_name ON breeds(breed_name);
+-- Serves breed_name ILIKE '%...%' and the fuzzy (word similarity) search mode
+CREATE INDEX IF NOT EXISTS idx_breeds_breed_name_trgm ON breeds USING GIN (breed_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_breeds_search_vector ON breeds USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_ingest_runs_dag_id ON ingest_runs(dag_id, execution_date DESC);
+CREATE INDEX IF NOT EXISTS idx_ingest_runs_asset_uri ON ingest_runs(asset_uri) WHERE asset_uri IS NOT NULL;
+-- Matches the /api/breeds page order, so keyset pages seek to their cursor;
+-- it also serves plain execution_date ordering, replacing the single-column index
+CREATE INDEX IF NOT EXISTS idx_breed_observations_keyset ON breed_observations(execution_date DESC, ingest_run_id DESC, id DESC);
+DROP INDEX IF EXISTS idx_breed_observations_execution_date;
+-- Latest observation of a breed (ranked search results), and FK lookups
+CREATE INDEX IF NOT EXISTS idx_breed_observations_breed_latest ON breed_observations(breed_id, execution_date DESC);
+DROP INDEX IF EXISTS idx_breed_observations_breed_id;
+
+-- Partition maintenance, run by the dog_breed_partition_maintenance DAG.
+-- Creates the monthly partitions (breed_observations_yYYYYmMM, UTC months)
+-- covering p_from..p_to and skips months that already have one. Each month
+-- is built as a plain table and then attached, after moving that month's
+-- rows out of the default partition, so the parent only takes a SHARE UPDATE
+-- EXCLUSIVE lock and loads keep running. Returns the partitions created
+CREATE OR REPLACE FUNCTION create_breed_observation_partitions(
+    p_from TIMESTAMP WITH TIME ZONE,
+    p_to TIMESTAMP WITH TIME ZONE
+)
+RETURNS SETOF TEXT AS $$
+DECLARE
+    v_month TIMESTAMP;
+    v_start TIMESTAMP WITH TIME ZONE;
+    v_end TIMESTAMP WITH TIME ZONE;
+    v_partition TEXT;
+BEGIN
+    v_month := date_trunc('month', p_from AT TIME ZONE 'UTC');
+    WHILE v_month <= p_to AT TIME ZONE 'UTC' LOOP
+        v_start := v_month AT TIME ZONE 'UTC';
+        v_end := (v_month + INTERVAL '1 month') AT TIME ZONE 'UTC';
+        v_partition := 'breed_observations_' || to_char(v_month, '"y"YYYY"m"MM');
+        
+        IF to_regclass(v_partition) IS NULL THEN
+            EXECUTE format('CREATE TABLE %I (LIKE breed_observations INCLUDING DEFAULTS)', v_partition);
+            EXECUTE format(
+                'WITH moved AS ('
+                '    DELETE FROM breed_observations_default WHERE execution_date >= %L AND execution_date < %L RETURNING *'
+                ') INSERT INTO %I SELECT * FROM moved',
+                v_start, v_end, v_partition
+            );
+            EXECUTE format(
+                'ALTER TABLE breed_observations ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                v_partition, v_start, v_end
+            );
+            RETURN NEXT v_partition;
+        END IF;
+        
+        v_month := v_month + INTERVAL '1 month';
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Retention: detaches every monthly partition that ends on or before
+-- p_older_than and drops it, unless p_detach_only (detached partitions are
+-- left as plain tables, e.g. to archive with pg_dump before dropping them).
+-- When dropping, older rows in the default partition and ingest runs left
+-- without observations are deleted too. The removed rows are subtracted from
+-- the stats rollup first. Returns the partitions removed
+CREATE OR REPLACE FUNCTION drop_breed_observation_partitions(
+    p_older_than TIMESTAMP WITH TIME ZONE,
+    p_detach_only BOOLEAN DEFAULT FALSE
+)
+RETURNS SETOF TEXT AS $$
+DECLARE
+    v_partition RECORD;
+BEGIN
+    FOR v_partition IN
+        SELECT
+            c.relname,
+            substring(pg_get_expr(c.relpartbound, c.oid) FROM 'TO \(''([^'']+)''\)')::TIMESTAMP WITH TIME ZONE AS range_end
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'breed_observations'::regclass
+          AND pg_get_expr(c.relpartbound, c.oid) <> 'DEFAULT'
+        ORDER BY range_end
+    LOOP
+        CONTINUE WHEN v_partition.range_end > p_older_than;
+        
+        PERFORM subtract_breed_stats(quote_ident(v_partition.relname));
+        EXECUTE format('ALTER TABLE breed_observations DETACH PARTITION %I', v_partition.relname);
+        IF NOT p_detach_only THEN
+            EXECUTE format('DROP TABLE %I', v_partition.relname);
+        END IF;
+        RETURN NEXT v_partition.relname;
+    END LOOP;
+    
+    IF NOT p_detach_only THEN
+        PERFORM subtract_breed_stats(format(
+            '(SELECT * FROM breed_observations_default WHERE execution_date < %L)', p_older_than
+        ));
+        DELETE FROM breed_observations_default WHERE execution_date < p_older_than;
+        DELETE FROM ingest_runs r
+        WHERE r.execution_date < p_older_than
+          AND NOT EXISTS (
+              SELECT 1 FROM breed_observations o
+              WHERE o.ingest_run_id = r.id AND o.execution_date = r.execution_date
+          );
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Stats rollup for /api/breeds/stats: one row per dag_id, plus dag_id '*'
+-- (not a valid Airflow dag_id) for the totals over all DAGs. Kept up to date
+-- at write time by the breed_observations insert trigger below, so reading
+-- the stats is a primary key lookup however large the table grows.
+-- breed_stats_breeds counts observations per (dag_id, breed) so unique_breeds
+-- stays an exact distinct count: it only changes when a pair appears or
+-- disappears
+CREATE TABLE IF NOT EXISTS breed_stats_rollup (
+    dag_id VARCHAR(255) PRIMARY KEY,
+    total_breeds BIGINT NOT NULL DEFAULT 0,
+    unique_breeds INTEGER NOT NULL DEFAULT 0,
+    latest_execution TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS breed_stats_breeds (
+    dag_id VARCHAR(255) NOT NULL,
+    breed_id INTEGER NOT NULL REFERENCES breeds(id),
+    observations BIGINT NOT NULL,
+    
+    PRIMARY KEY (dag_id, breed_id)
+);
+
+-- Stats computed from scratch, in the shape of breed_stats_rollup; used to
+-- check and rebuild the rollup
+CREATE OR REPLACE VIEW breed_stats_actual AS
+SELECT
+    scope.dag_id,
+    COUNT(*) AS total_breeds,
+    COUNT(DISTINCT o.breed_id) AS unique_breeds,
+    MAX(o.execution_date) AS latest_execution
+FROM breed_observations o
+JOIN ingest_runs r ON r.id = o.ingest_run_id
+CROSS JOIN LATERAL (VALUES (r.dag_id), ('*')) AS scope(dag_id)
+GROUP BY scope.dag_id;
+
+-- Adds the rows inserted by one statement to the rollup, set-based (the
+-- loader inserts a whole batch in one statement). Rows are upserted in key
+-- order so concurrent loads lock them in the same order
+CREATE OR REPLACE FUNCTION add_breed_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    WITH delta AS (
+        SELECT scope.dag_id, n.breed_id, COUNT(*) AS observations, MAX(n.execution_date) AS latest_execution
+        FROM new_observations n
+        JOIN ingest_runs r ON r.id = n.ingest_run_id
+        CROSS JOIN LATERAL (VALUES (r.dag_id), ('*')) AS scope(dag_id)
+        GROUP BY scope.dag_id, n.breed_id
+    ),
+    pairs AS (
+        INSERT INTO breed_stats_breeds AS s (dag_id, breed_id, observations)
+        SELECT dag_id, breed_id, observations FROM delta
+        ORDER BY dag_id, breed_id
+        ON CONFLICT (dag_id, breed_id) DO UPDATE SET observations = s.observations + EXCLUDED.observations
+        RETURNING s.dag_id, (xmax = 0) AS is_new
+    )
+    INSERT INTO breed_stats_rollup AS s (dag_id, total_breeds, unique_breeds, latest_execution)
+    SELECT d.dag_id, d.observations, COALESCE(p.new_breeds, 0), d.latest_execution
+    FROM (
+        SELECT dag_id, SUM(observations) AS observations, MAX(latest_execution) AS latest_execution
+        FROM delta
+        GROUP BY dag_id
+    ) d
+    LEFT JOIN (
+        SELECT dag_id, COUNT(*) FILTER (WHERE is_new) AS new_breeds
+        FROM pairs
+        GROUP BY dag_id
+    ) p ON p.dag_id = d.dag_id
+    ORDER BY d.dag_id
+    ON CONFLICT (dag_id) DO UPDATE SET
+        total_breeds = s.total_breeds + EXCLUDED.total_breeds,
+        unique_breeds = s.unique_breeds + EXCLUDED.unique_breeds,
+        latest_execution = GREATEST(s.latest_execution, EXCLUDED.latest_execution),
+        updated_at = CURRENT_TIMESTAMP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER add_breed_stats_on_insert
+    AFTER INSERT ON breed_observations
+    REFERENCING NEW TABLE AS new_observations
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION add_breed_stats();
+
+-- Removes the observations of p_observations (a table name or parenthesized
+-- subquery over breed_observations rows) from the rollup before retention
+-- drops or detaches them; partition DDL fires no row triggers. Removing the
+-- oldest rows never changes latest_execution, and a dag_id with no rows left
+-- loses its rollup row
+CREATE OR REPLACE FUNCTION subtract_breed_stats(p_observations TEXT)
+RETURNS VOID AS $$
+BEGIN
+    EXECUTE format($sql$
+        WITH delta AS (
+            SELECT scope.dag_id, o.breed_id, COUNT(*) AS observations
+            FROM %s o
+            JOIN ingest_runs r ON r.id = o.ingest_run_id
+            CROSS JOIN LATERAL (VALUES (r.dag_id), ('*')) AS scope(dag_id)
+            GROUP BY scope.dag_id, o.breed_id
+        ),
+        pairs AS (
+            UPDATE breed_stats_breeds s
+            SET observations = s.observations - delta.observations
+            FROM delta
+            WHERE s.dag_id = delta.dag_id AND s.breed_id = delta.breed_id
+            RETURNING s.dag_id, s.observations, delta.observations AS removed
+        )
+        UPDATE breed_stats_rollup s
+        SET total_breeds = s.total_breeds - p.removed,
+            unique_breeds = s.unique_breeds - p.breeds_gone,
+            updated_at = CURRENT_TIMESTAMP
+        FROM (
+            SELECT dag_id, SUM(removed) AS removed, COUNT(*) FILTER (WHERE observations <= 0) AS breeds_gone
+            FROM pairs
+            GROUP BY dag_id
+        ) p
+        WHERE s.dag_id = p.dag_id
+    $sql$, p_observations);
+    
+    DELETE FROM breed_stats_breeds WHERE observations <= 0;
+    DELETE FROM breed_stats_rollup WHERE total_breeds <= 0;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Rows where the rollup disagrees with a full recount (empty when consistent)
+CREATE OR REPLACE FUNCTION breed_stats_rollup_drift()
+RETURNS TABLE (
+    dag_id VARCHAR,
+    rollup_total BIGINT,
+    actual_total BIGINT,
+    rollup_unique INTEGER,
+    actual_unique BIGINT,
+    rollup_latest TIMESTAMP WITH TIME ZONE,
+    actual_latest TIMESTAMP WITH TIME ZONE
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        COALESCE(s.dag_id, a.dag_id),
+        s.total_breeds,
+        a.total_breeds,
+        s.unique_breeds,
+        a.unique_breeds,
+        s.latest_execution,
+        a.latest_execution
+    FROM breed_stats_rollup s
+    FULL JOIN breed_stats_actual a ON a.dag_id = s.dag_id
+    WHERE s.total_breeds IS DISTINCT FROM a.total_breeds
+       OR s.unique_breeds IS DISTINCT FROM a.unique_breeds::INTEGER
+       OR s.latest_execution IS DISTINCT FROM a.latest_execution;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Rebuilds the rollup from scratch. Waits for in-flight loads to commit and
+-- blocks new ones until done, so the recount and the rollup agree
+CREATE OR REPLACE FUNCTION refresh_breed_stats_rollup()
+RETURNS VOID AS $$
+BEGIN
+    LOCK TABLE breed_stats_rollup, breed_stats_breeds IN SHARE ROW EXCLUSIVE MODE;
+    
+    DELETE FROM breed_stats_breeds;
+    INSERT INTO breed_stats_breeds (dag_id, breed_id, observations)
+    SELECT scope.dag_id, o.breed_id, COUNT(*)
+    FROM breed_observations o
+    JOIN ingest_runs r ON r.id = o.ingest_run_id
+    CROSS JOIN LATERAL (VALUES (r.dag_id), ('*')) AS scope(dag_id)
+    GROUP BY scope.dag_id, o.breed_id;
+    
+    DELETE FROM breed_stats_rollup;
+    INSERT INTO breed_stats_rollup (dag_id, total_breeds, unique_breeds, latest_execution)
+    SELECT dag_id, total_breeds, unique_breeds, latest_execution FROM breed_stats_actual;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Version of the data the API serves, a counter bumped by every statement
+-- that changes it; the API derives its ETags from it. A single row: loads
+-- already serialize on the breed_stats_rollup '*' row, so it adds no waiting
+CREATE TABLE IF NOT EXISTS breed_data_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO breed_data_version (id) VALUES (TRUE) ON CONFLICT (id) DO NOTHING;
+
+-- Change notifications for the API result cache: every statement that writes
+-- data the API serves bumps breed_data_version and sends NOTIFY
+-- breed_data_changed (payload: table name), and API processes LISTENing on it
+-- drop their cached results. Postgres delivers notifications on commit, once
+-- per distinct payload per transaction, so a DAG run's load sends a handful.
+-- Retention writes breed_stats_rollup, so dropped partitions are announced too
+CREATE OR REPLACE FUNCTION notify_breed_data_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE breed_data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+    PERFORM pg_notify('breed_data_changed', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER notify_breed_data_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON breeds
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_breed_data_changed();
+
+CREATE OR REPLACE TRIGGER notify_breed_data_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON ingest_runs
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_breed_data_changed();
+
+CREATE OR REPLACE TRIGGER notify_breed_data_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON breed_observations
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_breed_data_changed();
+
+CREATE OR REPLACE TRIGGER notify_breed_data_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON breed_stats_rollup
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_breed_data_changed();
+
+-- New records for the API's /api/breeds/stream: NOTIFY breed_observations_added
+-- with the comma-separated ids of the ingest runs a statement inserted, so
+-- each API process fetches the committed rows once and pushes them to its
+-- subscribers
+CREATE OR REPLACE FUNCTION notify_breed_observations_added()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('breed_observations_added', runs.ids)
+    FROM (SELECT string_agg(DISTINCT ingest_run_id::TEXT, ',') AS ids FROM new_observations) runs
+    WHERE runs.ids IS NOT NULL;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER notify_breed_observations_added
+    AFTER INSERT ON breed_observations
+    REFERENCING NEW TABLE AS new_observations
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_breed_observations_added();
+
+-- Migration from the original denormalized dog_breeds table (one full copy of
+-- the breed per DAG run). Existing rows are split into breeds (latest version
+-- of each breed), ingest_runs and breed_observations (same ids, so existing
+-- API links keep working); the old table is kept as dog_breeds_legacy until
+-- dropped manually
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = current_schema() AND c.relname = 'dog_breeds' AND c.relkind = 'r'
+    ) THEN
+        ALTER TABLE dog_breeds ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+        
+        CREATE TEMP TABLE legacy_breeds ON COMMIT DROP AS
+        SELECT *, COALESCE(full_data->>'id', 'name:' || breed_name) AS api_id FROM dog_breeds;
+        
+        INSERT INTO breeds (api_id, breed_name, description, life_expectancy, life_min, life_max, full_data, content_hash, created_at, updated_at)
+        SELECT DISTINCT ON (api_id)
+            api_id, breed_name, description, life_expectancy, life_min, life_max,
+            full_data - 'asset_uri' - 'airflow_metadata', content_hash, created_at, updated_at
+        FROM legacy_breeds
+        ORDER BY api_id, execution_date DESC, created_at DESC
+        ON CONFLICT (api_id) DO NOTHING;
+        
+        INSERT INTO ingest_runs (dag_id, dag_run_id, task_id, execution_date, asset_uri, created_at)
+        SELECT DISTINCT ON (dag_run_id) dag_id, dag_run_id, task_id, execution_date, asset_uri, created_at
+        FROM legacy_breeds
+        ORDER BY dag_run_id, created_at
+        ON CONFLICT (dag_run_id) DO NOTHING;
+        
+        PERFORM create_breed_observation_partitions(MIN(execution_date), MAX(execution_date)) FROM legacy_breeds;
+        INSERT INTO breed_observations (id, ingest_run_id, breed_id, execution_date)
+        SELECT l.id, r.id, b.id, r.execution_date
+        FROM legacy_breeds l
+        JOIN ingest_runs r ON r.dag_run_id = l.dag_run_id
+        JOIN breeds b ON b.api_id = l.api_id
+        ON CONFLICT DO NOTHING;
+        
+        ALTER TABLE dog_breeds RENAME TO dog_breeds_legacy;
+        RAISE NOTICE 'Migrated dog_breeds into breeds/ingest_runs/breed_observations; drop dog_breeds_legacy once verified';
+    END IF;
+END $$;
+
+-- Copy observations from a breed_observations table created before
+-- partitioning, creating the partitions for their months first
+DO $$
+BEGIN
+    IF to_regclass('breed_observations_unpartitioned') IS NOT NULL THEN
+        PERFORM create_breed_observation_partitions(MIN(execution_date), MAX(execution_date))
+        FROM breed_observations_unpartitioned;
+        
+        INSERT INTO breed_observations (id, ingest_run_id, breed_id, execution_date)
+        SELECT id, ingest_run_id, breed_id, execution_date FROM breed_observations_unpartitioned
+        ON CONFLICT DO NOTHING;
+        
+        DROP TABLE breed_observations_unpartitioned;
+        RAISE NOTICE 'Moved breed_observations into monthly partitions';
+    END IF;
+END $$;
+
+-- Partitions for the current month and the next three; the maintenance DAG
+-- keeps creating them ahead from here on
+SELECT create_breed_observation_partitions(CURRENT_TIMESTAMP, CURRENT_TIMESTAMP + INTERVAL '3 months');
+
+-- Backfill the stats rollup on databases that had observations before it
+-- existed; from then on the insert trigger keeps it current
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM breed_stats_rollup) THEN
+        PERFORM refresh_breed_stats_rollup();
+    END IF;
+END $$;
+
+-- Denormalized view with the columns of the original dog_breeds table, for
+-- ad-hoc queries and existing tooling
+CREATE OR REPLACE VIEW dog_breeds AS
+SELECT
+    o.id,
+    b.breed_name,
+    b.description,
+    b.life_expectancy,
+    b.life_min,
+    b.life_max,
+    r.dag_id,
+    r.dag_run_id,
+    r.task_id,
+    o.execution_date,
+    r.asset_uri,
+    b.full_data || jsonb_build_object(
+        'asset_uri', r.asset_uri,
+        'airflow_metadata', jsonb_build_object(
+            'dag_id', r.dag_id,
+            'dag_run_id', r.dag_run_id,
+            'task_id', r.task_id,
+            'execution_date', o.execution_date
+        )
+    ) AS full_data,
+    b.content_hash,
+    r.created_at,
+    GREATEST(r.created_at, b.updated_at) AS updated_at,
+    b.api_id
+FROM breed_observations o
+JOIN ingest_runs r ON r.id = o.ingest_run_id
+JOIN breeds b ON b.id = o.breed_id;
 
 -- Create a view for easy querying
 CREATE OR REPLACE VIEW recent_breeds AS
@@ -70,8 +582,8 @@ END;
 $$ LANGUAGE plpgsql;
 
 -- Trigger to automatically update updated_at
-CREATE TRIGGER update_dog_breeds_updated_at
-    BEFORE UPDATE ON dog_breeds
+CREATE OR REPLACE TRIGGER update_breeds_updated_at
+    BEFORE UPDATE ON breeds
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
@@ -263,12 +263,11 @@ echo "Step 3: Deploying FastAPI Backend"
 echo "==================================================${NC}"
 echo ""
 
-API_DIR="$PROJECT_DIR/api"
 MANIFESTS_DIR="$PROJECT_DIR/manifests/dog-breeds-api"
 
 echo "Building Docker image..."
-cd "$API_DIR"
-docker build -t dog-breeds-api:latest .
+cd "$PROJECT_DIR"
+docker build -f api/Dockerfile -t dog-breeds-api:latest .
 
 echo ""
 echo "Loading image into kind cluster..."
@@ -61,6 +61,35 @@ class AirflowChart(HelmChart):
                     "role": "Admin",
                 },
             },
+            # Tasks run in the scheduler pod with LocalExecutor. The XCom backend lives
+            # in the DAGs folder, so it is only configured where DAGs are mounted: the
+            # api-server cannot import it, shows offloaded values as their reference
+            # strings and does not delete payloads when XComs are cleared from the UI
+            # (dog_breed_xcom_cleanup expires them; see README, XCom Backend)
+            "scheduler": {
+                "env": [
+                    {
+                        "name": "AIRFLOW__CORE__XCOM_BACKEND",
+                        "value": "dog_breeds.xcom_backend.OffloadingXComBackend",
+                    },
+                    {
+                        "name": "DOG_BREEDS_XCOM_PATH",
+                        "value": "file:///tmp/dog_breeds_xcom",
+                    },
+                    {
+                        "name": "DOG_BREEDS_XCOM_THRESHOLD",
+                        "value": "4096",
+                    },
+                    {
+                        "name": "DOG_BREEDS_XCOM_RETENTION_DAYS",
+                        "value": "30",
+                    },
+                    {
+                        "name": "DOG_BREEDS_EXPORT_PATH",
+                        "value": "file:///tmp/dog_breeds_exports",
+                    },
+                ],
+            },
             "resources": {
                 "webserver": {
                     "requests": {
@@ -31,6 +31,11 @@ class DogBreedsApiChart(KubernetesResource):
                 "DOG_BREEDS_DB_PORT": "5432",
                 "DOG_BREEDS_DB_NAME": "dog_breeds_db",
                 "DOG_BREEDS_DB_USER": "airflow",
+                # Connections per API pod (replicas x max size must fit max_connections)
+                "DOG_BREEDS_DB_POOL_MIN_SIZE": "2",
+                "DOG_BREEDS_DB_POOL_MAX_SIZE": "10",
+                # Result cache, invalidated by NOTIFY breed_data_changed
+                "DOG_BREEDS_API_CACHE_TTL": "300",
                 "API_HOST": "0.0.0.0",
                 "API_PORT": "8000",
                 "ALLOWED_ORIGINS": "*",
@@ -143,6 +148,33 @@ class DogBreedsApiChart(KubernetesResource):
                                 },
                             },
                         },
+                        {
+                            "name": "DOG_BREEDS_DB_POOL_MIN_SIZE",
+                            "valueFrom": {
+                                "configMapKeyRef": {
+                                    "name": "dog-breeds-api-config",
+                                    "key": "DOG_BREEDS_DB_POOL_MIN_SIZE",
+                                },
+                            },
+                        },
+                        {
+                            "name": "DOG_BREEDS_DB_POOL_MAX_SIZE",
+                            "valueFrom": {
+                                "configMapKeyRef": {
+                                    "name": "dog-breeds-api-config",
+                                    "key": "DOG_BREEDS_DB_POOL_MAX_SIZE",
+                                },
+                            },
+                        },
+                        {
+                            "name": "DOG_BREEDS_API_CACHE_TTL",
+                            "valueFrom": {
+                                "configMapKeyRef": {
+                                    "name": "dog-breeds-api-config",
+                                    "key": "DOG_BREEDS_API_CACHE_TTL",
+                                },
+                            },
+                        },
                         {
                             "name": "API_HOST",
                             "valueFrom": {
@@ -181,25 +213,29 @@ class DogBreedsApiChart(KubernetesResource):
                             "cpu": "500m",
                         },
                     },
+                    # Neither probe queries the database: /livez only needs the
+                    # process to answer, /readyz reports the API's background
+                    # database check, so a slow database takes the pod out of
+                    # the Service instead of getting it restarted
                     "livenessProbe": {
                         "httpGet": {
-                            "path": "/health",
+                            "path": "/livez",
                             "port": 8000,
                         },
-                        "initialDelaySeconds": 15,
+                        "initialDelaySeconds": 10,
                         "periodSeconds": 20,
-                        "timeoutSeconds": 5,
+                        "timeoutSeconds": 3,
                         "failureThreshold": 3,
                     },
                     "readinessProbe": {
                         "httpGet": {
-                            "path": "/health",
+                            "path": "/readyz",
                             "port": 8000,
                         },
-                        "initialDelaySeconds": 10,
-                        "periodSeconds": 10,
-                        "timeoutSeconds": 3,
-                        "failureThreshold": 3,
+                        "initialDelaySeconds": 5,
+                        "periodSeconds": 5,
+                        "timeoutSeconds": 2,
+                        "failureThreshold": 2,
                     },
                 },
             ],